@@ -0,0 +1,426 @@
+"""
+SNKRDUNK 오프라인 벤치마크
+=====================================
+bench/server.py의 로컬 fixture 서버를 대상으로 파이프라인을 측정. 실제 사이트에 요청하지 않음.
+
+시나리오:
+  parse:search / parse:listings / match  : HTTP 엔진 파서 + _match_candidates (CPU만)
+  http:lookup@N                          : get_cheapest_psa10(engine='http'), 동시 N건
+  selenium:driver_start                  : Chrome 기동 시간
+  selenium:search / match / see_more / extract
+                                         : _search_cards, _find_card_link, _click_see_more,
+                                           _extract_cheapest_psa10 단계별 측정
+  selenium:lookup@N                      : get_cheapest_psa10(engine='selenium'), DriverPool N개
+
+지표: p50/p95 지연(ms), 처리량(건/초), 조회당 WebDriver 명령 수, 결과 오류 수.
+cards.json의 expected_price와 결과가 다르면 오류로 집계.
+
+회귀 검사:
+  python bench/run_bench.py --save-baseline             # bench/baseline.json 갱신 (기본 --rounds로)
+  python bench/run_bench.py --check                     # 기준보다 느려지면 exit 1
+
+  python bench/run_bench.py --check --strict-timing     # p50/처리량 악화도 실패로 취급
+
+  기본 검사는 오류 수와 WebDriver 명령 수만 비교. 시간 지표는 실행마다 편차가 커서
+  참고용(ℹ️)으로 출력하며, --strict-timing에서도 n이 기준과 같을 때만 비교.
+  python bench/run_bench.py --engines http --jobs 1,8 --rounds 20 --latency-ms 30
+
+경량 프로필 비교 (fixture 서버의 종류별 전송량이 함께 출력됨):
+  python bench/run_bench.py --engines selenium --jobs 1
+  python bench/run_bench.py --engines selenium --jobs 1 --lean
+
+Chrome을 띄울 수 없는 환경에서는 selenium 시나리오를 건너뜀.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from server import FIXTURES_DIR, FixtureServer  # noqa: E402
+
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_CARDS = os.path.join(BENCH_DIR, 'cards.json')
+
+# 기준 대비 허용 범위
+TIME_TOLERANCE = 0.5        # p50/p95 +50%, 처리량 -50%를 넘으면 표시 (--strict-timing일 때만 실패)
+COMMAND_TOLERANCE = 0.5     # 조회당 WebDriver 명령 수 +0.5까지 허용
+
+
+def percentile(values: list[float], q: float) -> float:
+    """nearest-rank 분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), int(round(q * len(ordered) + 0.5))))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: list[float], wall: float | None = None, **extra) -> dict:
+    result = {
+        'n':      len(latencies),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+    }
+    if wall:
+        result['throughput_per_s'] = round(len(latencies) / wall, 3)
+    result.update(extra)
+    return result
+
+
+class CommandCounter:
+    """driver.execute를 감싸 WebDriver 명령 수를 셈 (명령 이름별)"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def attach(self, driver):
+        original = driver.execute
+
+        def execute(command, params=None):
+            with self._lock:
+                self.counts[command] += 1
+            return original(command, params)
+
+        driver.execute = execute
+        return driver
+
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.counts.values())
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+
+@contextlib.contextmanager
+def quiet():
+    """스크래퍼의 print 출력 숨김"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _check_result(card: dict, result) -> bool:
+    return bool(result) and 'error' not in result and result.get('price') == card['expected_price']
+
+
+# ──────────────────────────────────────────────────────────────
+# 시나리오
+# ──────────────────────────────────────────────────────────────
+
+def bench_parsers(cards: list[dict], iterations: int) -> dict:
+    from snkrdunk_http_engine import parse_listings, parse_search_candidates
+    from snkrdunk_psa10_scraper import _match_candidates, extract_pokemon_name
+
+    pages = {}
+    for card in cards:
+        pokemon = extract_pokemon_name(card['card_name'])
+        with open(os.path.join(FIXTURES_DIR, 'search', f'{pokemon.lower()}.html'), encoding='utf-8') as f:
+            pages[card['card_name']] = f.read()
+    used_pages = []
+    for name in sorted(os.listdir(os.path.join(FIXTURES_DIR, 'used'))):
+        with open(os.path.join(FIXTURES_DIR, 'used', name), encoding='utf-8') as f:
+            used_pages.append(f.read())
+
+    results = {}
+    timings = []
+    for _ in range(iterations):
+        for page in pages.values():
+            start = time.perf_counter()
+            parse_search_candidates(page)
+            timings.append(time.perf_counter() - start)
+    results['parse:search'] = summarize(timings)
+
+    timings = []
+    for _ in range(iterations):
+        for page in used_pages:
+            start = time.perf_counter()
+            parse_listings(page)
+            timings.append(time.perf_counter() - start)
+    results['parse:listings'] = summarize(timings)
+
+    candidates = {name: parse_search_candidates(page) for name, page in pages.items()}
+    timings = []
+    with quiet():
+        for _ in range(iterations):
+            for card in cards:
+                start = time.perf_counter()
+                _match_candidates(candidates[card['card_name']], card['card_name'], card['set_name'],
+                                  card['card_number'], extract_pokemon_name(card['card_name']))
+                timings.append(time.perf_counter() - start)
+    results['match'] = summarize(timings)
+    return results
+
+
+def _run_lookups(cards: list[dict], rounds: int, jobs: int, lookup) -> tuple[list[float], float, int]:
+    """cards × rounds건을 jobs개 스레드로 실행 → (지연 목록, 전체 시간, 오류 수)"""
+    work = [card for _ in range(rounds) for card in cards]
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def run(card):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            ok = _check_result(card, lookup(card))
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    with quiet(), ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(run, work))
+    return latencies, time.perf_counter() - wall_start, errors
+
+
+def bench_http(cards: list[dict], rounds: int, jobs_list: list[int]) -> dict:
+    from snkrdunk_psa10_scraper import get_cheapest_psa10
+
+    def lookup(card):
+        return get_cheapest_psa10(card['card_name'], card['set_name'], card['card_number'],
+                                  engine='http', use_cache=False)
+
+    results = {}
+    for jobs in jobs_list:
+        latencies, wall, errors = _run_lookups(cards, rounds, jobs, lookup)
+        results[f'http:lookup@{jobs}'] = summarize(latencies, wall, errors=errors)
+    return results
+
+
+def bench_selenium(cards: list[dict], rounds: int, jobs_list: list[int], lean: bool = False) -> dict:
+    from snkrdunk_driver_pool import DriverPool
+    from snkrdunk_psa10_scraper import (
+        _build_driver,
+        _click_see_more,
+        _extract_cheapest_psa10,
+        _find_card_link,
+        _search_cards,
+        extract_pokemon_name,
+        get_cheapest_psa10,
+    )
+
+    counter = CommandCounter()
+
+    def factory():
+        return counter.attach(_build_driver(headless=True, lean=lean))
+
+    results = {}
+
+    # 드라이버 기동
+    starts = []
+    drivers = []
+    try:
+        with quiet():
+            for _ in range(max(1, min(rounds, 3))):
+                start = time.perf_counter()
+                drivers.append(factory())
+                starts.append(time.perf_counter() - start)
+    except Exception as e:
+        for driver in drivers:
+            driver.quit()
+        print(f"⚠️ Chrome을 띄울 수 없어 selenium 시나리오 건너뜀: {e}", file=sys.stderr)
+        return {}
+    results['selenium:driver_start'] = summarize(starts)
+
+    # 단계별
+    driver = drivers[0]
+    for extra in drivers[1:]:
+        extra.quit()
+    steps = {'search': [], 'match': [], 'see_more': [], 'extract': []}
+    commands = {step: 0 for step in steps}
+    errors = 0
+
+    def timed(step, fn, *args, **kwargs):
+        counter.reset()
+        start = time.perf_counter()
+        value = fn(*args, **kwargs)
+        steps[step].append(time.perf_counter() - start)
+        commands[step] += counter.total()
+        return value
+
+    try:
+        with quiet():
+            for _ in range(rounds):
+                for card in cards:
+                    pokemon = extract_pokemon_name(card['card_name'])
+                    timed('search', _search_cards, driver, pokemon)
+                    card_url = timed('match', _find_card_link, driver, card['card_name'],
+                                     card['set_name'], card['card_number'], pokemon)
+                    if not card_url:
+                        errors += 1
+                        continue
+                    timed('see_more', _click_see_more, driver, card_url)
+                    result = timed('extract', _extract_cheapest_psa10, driver)
+                    if not result or result['price'] != card['expected_price']:
+                        errors += 1
+    finally:
+        driver.quit()
+
+    for step, latencies in steps.items():
+        results[f'selenium:{step}'] = summarize(
+            latencies,
+            webdriver_commands=round(commands[step] / max(1, len(latencies)), 2),
+            errors=errors if step == 'extract' else 0,
+        )
+
+    # 전체 조회 (풀 크기 = 동시 작업 수, 기동 시간은 제외)
+    for jobs in jobs_list:
+        pool = DriverPool(size=jobs, factory=factory)
+        try:
+            with quiet():
+                warm = [pool.checkout() for _ in range(jobs)]
+                for d in warm:
+                    pool.checkin(d)
+
+            def lookup(card):
+                return get_cheapest_psa10(card['card_name'], card['set_name'], card['card_number'],
+                                          engine='selenium', pool=pool, use_cache=False)
+
+            counter.reset()
+            latencies, wall, errors = _run_lookups(cards, rounds, jobs, lookup)
+            results[f'selenium:lookup@{jobs}'] = summarize(
+                latencies, wall,
+                webdriver_commands=round(counter.total() / max(1, len(latencies)), 2),
+                errors=errors,
+            )
+        finally:
+            pool.close()
+
+    return results
+
+
+# ──────────────────────────────────────────────────────────────
+# 기준 비교
+# ──────────────────────────────────────────────────────────────
+
+def compare(results: dict, baseline: dict, notes: list | None = None,
+            strict_timing: bool = False) -> list[str]:
+    """기준보다 나빠진 항목 설명 목록 (비어 있으면 통과)
+
+    오류 수와 조회당 WebDriver 명령 수만 기본 검사 대상. 시간 지표(p50/p95/처리량)는
+    실행마다 편차가 커서 notes에 참고용으로 기록하고, strict_timing이면서 표본 수(n)가
+    기준과 같을 때만 p50/처리량을 회귀로 취급.
+    """
+    regressions = []
+    notes = notes if notes is not None else []
+    for name, current in results.items():
+        if current.get('errors'):
+            regressions.append(f"{name}: {current['errors']} wrong/failed results")
+        base = baseline.get(name)
+        if not base:
+            continue
+        if 'webdriver_commands' in base and \
+                current.get('webdriver_commands', 0) > base['webdriver_commands'] + COMMAND_TOLERANCE:
+            regressions.append(f"{name}: {current['webdriver_commands']} WebDriver commands "
+                               f"> baseline {base['webdriver_commands']}")
+        if current['n'] != base.get('n'):
+            notes.append(f"{name}: n={current['n']} != baseline n={base.get('n')}, timing not compared")
+            continue
+        timing = []
+        if current['p50_ms'] > base['p50_ms'] * (1 + TIME_TOLERANCE):
+            timing.append(f"{name}: p50 {current['p50_ms']}ms > baseline {base['p50_ms']}ms")
+        if 'throughput_per_s' in base and \
+                current.get('throughput_per_s', 0) < base['throughput_per_s'] * (1 - TIME_TOLERANCE):
+            timing.append(f"{name}: throughput {current.get('throughput_per_s')}/s "
+                          f"< baseline {base['throughput_per_s']}/s")
+        (regressions if strict_timing else notes).extend(timing)
+        if current['p95_ms'] > base['p95_ms'] * (1 + TIME_TOLERANCE):
+            notes.append(f"{name}: p95 {current['p95_ms']}ms > baseline {base['p95_ms']}ms")
+    return regressions
+
+
+def print_table(results: dict, out=sys.stderr):
+    print(f"{'scenario':<24}{'n':>6}{'p50 ms':>11}{'p95 ms':>11}{'ops/s':>10}{'cmds':>8}{'err':>5}",
+          file=out)
+    for name, r in results.items():
+        print(f"{name:<24}{r['n']:>6}{r['p50_ms']:>11.3f}{r['p95_ms']:>11.3f}"
+              f"{r.get('throughput_per_s', ''):>10}{r.get('webdriver_commands', ''):>8}"
+              f"{r.get('errors', ''):>5}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline SNKRDUNK pipeline benchmark')
+    parser.add_argument('--engines', default='http,selenium', help="Comma list of 'http', 'selenium'")
+    parser.add_argument('--jobs', default='1,2,4', help='Concurrency levels, e.g. 1,2,4')
+    parser.add_argument('--rounds', type=int, default=5, help='Passes over cards.json per level')
+    parser.add_argument('--parse-iterations', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated network latency')
+    parser.add_argument('--cards', default=DEFAULT_CARDS)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--check', action='store_true', help='Exit 1 on regression against baseline')
+    parser.add_argument('--strict-timing', action='store_true',
+                        help='With --check, also fail on p50/throughput regressions')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--json', help='Also write results to this path')
+    parser.add_argument('--lean', action='store_true',
+                        help='Selenium with the lean browser profile (blocked images/fonts/analytics)')
+    args = parser.parse_args()
+
+    with open(args.cards, encoding='utf-8') as f:
+        cards = json.load(f)
+    engines = {e.strip() for e in args.engines.split(',') if e.strip()}
+    jobs_list = [int(j) for j in args.jobs.split(',') if j.strip()]
+
+    with FixtureServer(latency_ms=args.latency_ms) as server:
+        # 스크래퍼 import 전에 설정해야 SNKRDUNK_BASE_URL에 반영됨
+        os.environ['SNKRDUNK_BASE_URL'] = server.base_url
+        os.environ['SNKRDUNK_DB'] = os.path.join(tempfile.mkdtemp(prefix='snkrdunk-bench-'), 'bench.db')
+
+        results = bench_parsers(cards, args.parse_iterations)
+        if 'http' in engines:
+            results.update(bench_http(cards, args.rounds, jobs_list))
+        if 'selenium' in engines:
+            server.reset_stats()
+            results.update(bench_selenium(cards, args.rounds, jobs_list, lean=args.lean))
+            traffic = server.stats()
+            if traffic['requests']:
+                print(f"📦 selenium 시나리오 전송량: {traffic}", file=sys.stderr)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"💾 기준 저장: {args.baseline}", file=sys.stderr)
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"⚠️ 기준 파일 없음: {args.baseline}", file=sys.stderr)
+            sys.exit(2)
+        with open(args.baseline, encoding='utf-8') as f:
+            notes = []
+            regressions = compare(results, json.load(f), notes, args.strict_timing)
+        for line in notes:
+            print(f"ℹ️ {line}", file=sys.stderr)
+        if regressions:
+            print("❌ 성능 회귀:", file=sys.stderr)
+            for line in regressions:
+                print(f"   - {line}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ 기준 대비 회귀 없음", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
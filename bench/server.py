@@ -0,0 +1,171 @@
+"""
+SNKRDUNK 벤치마크용 로컬 fixture 서버
+=====================================
+bench/fixtures의 HTML을 SNKRDUNK와 같은 URL 구조로 제공.
+
+  /en/search/result?keyword=Gengar          → fixtures/search/gengar.html
+  /en/trading-cards/{id}                    → fixtures/detail/{id}.html
+  /en/trading-cards/{id}/used?slide=right   → fixtures/used/{id}.html
+  /img/..., /static/...                     → 더미 바이트 (이미지/폰트/스크립트 전송량 재현)
+
+latency_ms로 응답마다 고정 지연을 넣어 네트워크 왕복을 흉내낼 수 있음.
+요청 수/전송 바이트는 종류별(html, image, font, script, other)로 집계.
+
+단독 실행:
+  python bench/server.py --port 8765
+  SNKRDUNK_BASE_URL=http://127.0.0.1:8765 python snkrdunk_psa10_scraper.py
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# 정적 리소스 더미 크기(바이트) — 실제 SNKRDUNK 썸네일/폰트/스크립트 크기 수준
+_ASSET_SIZES = {
+    'image':  24 * 1024,
+    'font':   48 * 1024,
+    'script': 96 * 1024,
+    'style':  32 * 1024,
+}
+
+_ROUTES = [
+    (re.compile(r'^/en/search/result$'), 'search'),
+    (re.compile(r'^/en/trading-cards/(\d+)/used$'), 'used'),
+    (re.compile(r'^/en/trading-cards/(\d+)/?$'), 'detail'),
+]
+
+
+def _asset_kind(path: str) -> str | None:
+    if path.startswith('/img/'):
+        return 'image'
+    if path.endswith(('.woff', '.woff2', '.ttf')):
+        return 'font'
+    if path.endswith('.js'):
+        return 'script'
+    if path.endswith('.css'):
+        return 'style'
+    return None
+
+
+class FixtureServer:
+    """백그라운드 스레드에서 도는 fixture HTTP 서버 (with 문 지원)"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0.0,
+                 fixtures_dir: str = FIXTURES_DIR):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency_ms / 1000.0
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests = {}
+            self.bytes_sent = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'requests': dict(self.requests), 'bytes': dict(self.bytes_sent)}
+
+    def _record(self, kind: str, size: int):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+            self.bytes_sent[kind] = self.bytes_sent.get(kind, 0) + size
+
+    def _resolve(self, raw_path: str) -> tuple[int, str, bytes]:
+        """(status, content-type, body)"""
+        url = urlparse(raw_path)
+        kind = _asset_kind(url.path)
+        if kind:
+            return 200, 'application/octet-stream', b'\0' * _ASSET_SIZES[kind]
+
+        for pattern, page in _ROUTES:
+            match = pattern.match(url.path)
+            if not match:
+                continue
+            if page == 'search':
+                keyword = (parse_qs(url.query).get('keyword') or [''])[0]
+                name = re.sub(r'[^a-z0-9]+', '-', keyword.lower()).strip('-')
+            else:
+                name = match.group(1)
+            path = os.path.join(self.fixtures_dir, page, f'{name}.html')
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return 200, 'text/html; charset=utf-8', f.read()
+            break
+
+        return 404, 'text/html; charset=utf-8', b'<html><head><title>404 Not Found</title></head></html>'
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # keep-alive에서 헤더/본문 분리 전송 시 Nagle + delayed ACK로 40ms씩 밀리는 것 방지
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                status, content_type, body = server._resolve(self.path)
+                server._record(_asset_kind(urlparse(self.path).path) or 'html', len(body))
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve SNKRDUNK-like fixture pages')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, latency_ms=args.latency_ms).start()
+    print(f"🧪 Fixture server: {server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
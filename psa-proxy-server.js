@@ -112,11 +112,20 @@ app.get('/api/pricecharting/csv', async (req, res) => {
     }
 });
 
-const { execFile } = require('child_process');
+const SnkrdunkWorkerSupervisor = require('./snkrdunk-worker-supervisor');
 
-// SNKRDUNK endpoint - Search via Python Bridge (DB Query)
-app.get('/api/snkrdunk/search', (req, res) => {
-    const { name, set, number } = req.query;
+// Long-running Python worker (keeps imports, SQLite and Chrome warm)
+const snkrdunkWorker = new SnkrdunkWorkerSupervisor();
+snkrdunkWorker.start();
+
+process.on('SIGTERM', () => {
+    snkrdunkWorker.stop();
+    process.exit(0);
+});
+
+// SNKRDUNK endpoint - Search via Python worker (DB Query)
+app.get('/api/snkrdunk/search', async (req, res) => {
+    const { name, set, number, grade } = req.query;
 
     if (!name) {
         return res.status(400).json({ success: false, error: 'Missing name parameter' });
@@ -129,51 +138,92 @@ app.get('/api/snkrdunk/search', (req, res) => {
     console.log(`[SNKRDUNK Search] Original name: ${name}`);
     console.log(`[SNKRDUNK Search] Cleaned name: ${cleanName}`);
 
-    // Execute Python script - using execFile to prevent shell injection
     // Pass Name, Set, Number to help scraper accuracy
-    const args = [
-        'query_snkrdunk_db.py',
-        cleanName,
-        set || '',
-        number || ''
-    ];
-
-    execFile('python', args, (error, stdout, stderr) => {
-        if (error) {
-            console.error(`[SNKRDUNK Search] Exec error: ${error.message}`);
-            return res.status(500).json({ success: false, error: 'Internal server error' });
-        }
+    let result;
+    try {
+        result = await snkrdunkWorker.request({
+            op: 'search',
+            name: cleanName,
+            set: set || '',
+            number: number || '',
+            grade: grade || 'PSA 10'
+        });
+    } catch (error) {
+        console.error(`[SNKRDUNK Search] Worker error: ${error.message}`);
+        return res.status(500).json({ success: false, error: 'Internal server error' });
+    }
 
-        try {
-            const rawOutput = stdout.trim();
-            // Find the last line which should be the JSON
-            const jsonOutput = rawOutput.split('\n').pop();
+    console.log(`[SNKRDUNK Search] Result:`, result);
+    console.log(`========================================\n`);
 
-            const result = JSON.parse(jsonOutput);
-            console.log(`[SNKRDUNK Search] Result:`, result);
-            console.log(`========================================\n`);
+    // Check if scraper returned an error structure
+    if (result.error) {
+        return res.status(500).json({
+            success: false,
+            error: result.error,
+            debug_info: result.debug_info
+        });
+    }
 
-            // Check if scraper returned an error structure
-            if (result.error) {
-                return res.status(500).json({
-                    success: false,
-                    error: result.error,
-                    debug_info: result.debug_info
-                });
-            }
+    res.json(result);
+});
 
-            res.json(result);
-        } catch (e) {
-            console.error(`[SNKRDUNK Search] Parse error: ${e.message}`);
-            res.status(500).json({ success: false, error: 'Failed to parse python output' });
-        }
-    });
+// SNKRDUNK endpoint - Daily price history per grade, PSA 10 by default (min / p25 / median / p75 per day)
+app.get('/api/snkrdunk/history', async (req, res) => {
+    const { name, set, number, days, grade } = req.query;
+
+    if (!name) {
+        return res.status(400).json({ success: false, error: 'Missing name parameter' });
+    }
+
+    try {
+        const result = await snkrdunkWorker.request({
+            op: 'history',
+            name: name.split(':')[0].trim(),
+            set: set || '',
+            number: number || '',
+            days: parseInt(days, 10) || 90,
+            grade: grade || 'PSA 10'
+        });
+        res.json(result);
+    } catch (error) {
+        console.error(`[SNKRDUNK History] Worker error: ${error.message}`);
+        res.status(500).json({ success: false, error: 'Internal server error' });
+    }
+});
+
+// Prometheus metrics from the SNKRDUNK worker (step timings, cache hit rates, WebDriver commands)
+app.get('/metrics', async (req, res) => {
+    try {
+        const result = await snkrdunkWorker.request({ op: 'metrics' });
+        res.type('text/plain; version=0.0.4').send(result.text);
+    } catch (error) {
+        res.status(503).type('text/plain').send(`# SNKRDUNK worker unavailable: ${error.message}\n`);
+    }
+});
+
+// Recent per-lookup JSON traces
+app.get('/api/snkrdunk/traces', async (req, res) => {
+    try {
+        const result = await snkrdunkWorker.request({
+            op: 'metrics',
+            traces: parseInt(req.query.limit, 10) || 50
+        });
+        res.json({ success: true, traces: result.traces });
+    } catch (error) {
+        res.status(503).json({ success: false, error: error.message });
+    }
 });
 
 // Health check endpoint
 app.get('/health', (req, res) => {
     console.log('[Health Check] Request received');
-    res.json({ status: 'ok', message: 'PSA Proxy Server is running', timestamp: new Date().toISOString() });
+    res.json({
+        status: 'ok',
+        message: 'PSA Proxy Server is running',
+        snkrdunkWorker: snkrdunkWorker.stats(),
+        timestamp: new Date().toISOString()
+    });
 });
 
 const PORT = process.env.PORT || 3000;
@@ -182,6 +232,7 @@ app.listen(PORT, '0.0.0.0', () => {
     console.log(`📡 PSA endpoint: http://localhost:${PORT}/api/psa/cert/{certNumber}`);
     console.log(`🎴 SNKRDUNK ID endpoint: http://localhost:${PORT}/api/snkrdunk/id/{cardId} (NO Puppeteer!)`);
     console.log(`🔍 SNKRDUNK Search endpoint: http://localhost:${PORT}/api/snkrdunk/search?name=Gengar`);
+    console.log(`📈 SNKRDUNK History endpoint: http://localhost:${PORT}/api/snkrdunk/history?name=Gengar&days=90`);
     console.log(`📊 CSV endpoint: http://localhost:${PORT}/api/pricecharting/csv`);
     console.log(`❤️  Health check: http://localhost:${PORT}/health`);
     console.log(`⏰ Started at: ${new Date().toISOString()}\n`);
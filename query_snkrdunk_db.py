@@ -1,88 +1,305 @@
-import sqlite3
+import os
 import sys
 import json
 import io
 import contextlib
 import argparse
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 # Import the new Selenium-based scraper function
-from snkrdunk_psa10_scraper import run_scraper_and_save, init_db
+from snkrdunk_psa10_scraper import run_scraper_and_save
+from snkrdunk_db import PSA10_GRADE, get_storage, grade_label, resolution_key
+from snkrdunk_metrics import cache_result
 
-DB_NAME = 'snkrdunk.db'
+# Cache freshness tiers (seconds), overridable per card via Storage.set_ttl
+#   age < FRESH_TTL               -> fresh: return immediately
+#   FRESH_TTL <= age < MAX_STALE  -> stale: return immediately, refresh in background
+#   age >= MAX_STALE              -> expired: scrape before returning (old row if that fails)
+#   no row                        -> miss:  scrape before returning
+FRESH_TTL = int(os.environ.get('SNKRDUNK_FRESH_TTL', str(6 * 3600)))
+MAX_STALE = int(os.environ.get('SNKRDUNK_MAX_STALE', str(30 * 24 * 3600)))
+# Request counts used by the refresh scheduler decay with this half-life (seconds)
+DEMAND_HALF_LIFE = int(os.environ.get('SNKRDUNK_DEMAND_HALF_LIFE', str(7 * 24 * 3600)))
+# Hand scrapes to the snkrdunk_jobs worker fleet instead of running Chrome in this process.
+# Only enable when `python snkrdunk_jobs.py fleet` (or `work`) is running against the same DB.
+USE_JOB_QUEUE = os.environ.get('SNKRDUNK_JOB_QUEUE', '0') not in ('', '0')
+# How long a lookup waits for its queued scrape (seconds)
+JOB_WAIT_TIMEOUT = float(os.environ.get('SNKRDUNK_JOB_WAIT_TIMEOUT', '120'))
+
+
+def _age_seconds(scraped_at):
+    """Age of a scraped_at value (SQLite CURRENT_TIMESTAMP is UTC)"""
+    try:
+        ts = datetime.fromisoformat(str(scraped_at))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return max(0, int((datetime.now(timezone.utc) - ts).total_seconds()))
+
+
+def _ttls(db, keyword_name, set_name, card_number):
+    override = db.get_ttl(keyword_name, set_name, card_number)
+    if override:
+        fresh_ttl, max_stale = override
+        return fresh_ttl, (max_stale if max_stale is not None else MAX_STALE)
+    return FRESH_TTL, MAX_STALE
+
+
+class BackgroundRefresher:
+    """
+    In-process refresh queue for the long-running worker.
+    Each card is refreshed at most once at a time; duplicates are dropped.
+    """
+
+    def __init__(self, pool=None, max_workers=2):
+        self.pool = pool
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='snkrdunk-refresh')
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, keyword_name, set_name, card_number, grade=PSA10_GRADE):
+        key = resolution_key(keyword_name, set_name, card_number)
+        with self._lock:
+            if key in self._inflight:
+                return False
+            self._inflight.add(key)
+
+        def run():
+            try:
+                run_scraper_and_save(keyword_name, set_name, card_number, pool=self.pool,
+                                     ignore_miss_reasons=_ignored_misses(grade))
+            except Exception as e:
+                print(f"⚠️ Background refresh failed for {keyword_name}: {e}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(key)
+
+        self.executor.submit(run)
+        return True
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _ignored_misses(grade):
+    """
+    Negative-cache reasons a scrape for this grade must not stop at: "no PSA 10
+    listings" says nothing about the other grades on the same listing page.
+    """
+    return () if grade == PSA10_GRADE else ('no_psa10',)
+
+
+def enqueue_refresh(keyword_name, set_name, card_number, grade=PSA10_GRADE):
+    """Refresh via the job queue (low priority; duplicates share the pending job)"""
+    from snkrdunk_jobs import PRIORITY_REFRESH, JobQueue
+    JobQueue().submit(keyword_name, set_name, card_number, priority=PRIORITY_REFRESH,
+                      ignore_miss_reasons=_ignored_misses(grade))
+    return True
+
+
+def _scrape(keyword_name, set_name, card_number, pool, grade=PSA10_GRADE):
+    """Scrape and save one card: inline, or through the job queue when it is enabled"""
+    ignore_miss_reasons = _ignored_misses(grade)
+    if USE_JOB_QUEUE:
+        from snkrdunk_jobs import PRIORITY_INTERACTIVE, JobQueue
+        JobQueue().run(keyword_name, set_name, card_number, priority=PRIORITY_INTERACTIVE,
+                       timeout=JOB_WAIT_TIMEOUT, ignore_miss_reasons=ignore_miss_reasons)
+    else:
+        run_scraper_and_save(keyword_name, set_name, card_number, pool=pool,
+                             ignore_miss_reasons=ignore_miss_reasons)
+
+
+def spawn_refresh_process(keyword_name, set_name, card_number, grade=PSA10_GRADE):
+    """
+    Refresh for one-shot CLI calls: a detached `query_snkrdunk_db.py --refresh`
+    process that outlives this one.
+    """
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--refresh',
+         keyword_name, set_name or '', card_number or '', grade],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+
+_MISS_ERRORS = {
+    "not_found": "Card not found on SNKRDUNK.",
+    "no_psa10": "No PSA 10 listings on SNKRDUNK.",
+}
+
+
+def _miss_response(miss, cache_status):
+    return {
+        "success": False,
+        "error": _MISS_ERRORS.get(miss['reason'], "Card not found on SNKRDUNK."),
+        "reason": miss['reason'],
+        "candidates": miss['candidates'],
+        "url": miss['url'],
+        "cacheStatus": cache_status,
+        "retryAfterSeconds": miss['expires_in']
+    }
+
+
+def _latest(db, grade, keyword_name, set_name, card_number):
+    """Cached row for a grade: the card_prices row for PSA 10, the grade summaries otherwise"""
+    if grade == PSA10_GRADE:
+        return db.latest_price(keyword_name, set_name, card_number)
+    return db.latest_grades(keyword_name, set_name, card_number)
+
+
+def _get_miss(db, grade, keyword_name, set_name, card_number):
+    """Negative cache entry; "no PSA 10 listings" only answers PSA 10 lookups"""
+    miss = db.get_miss(keyword_name, set_name, card_number)
+    if miss and grade != PSA10_GRADE and miss['reason'] == 'no_psa10':
+        return None
+    return miss
+
+
+def _grade_response(row, grade, cache_status, age, refresh_queued):
+    summary = row['grades'].get(grade)
+    if summary is None:
+        return {
+            "success": False,
+            "error": f"No {grade} listings on SNKRDUNK.",
+            "reason": "no_grade",
+            "grade": grade,
+            "availableGrades": sorted(row['grades']),
+            "url": row['url'],
+            "cacheStatus": cache_status,
+            "cacheAgeSeconds": age
+        }
+    return {
+        "success": True,
+        "grade": grade,
+        "cardTitle": row['card_name'],
+        "latestPrice": summary['price'],
+        "listings": summary['count'],
+        "allPrices": summary['all_prices'],
+        "scrapedAt": row['scraped_at'],
+        "url": row['url'],
+        "cacheStatus": cache_status,
+        "cacheAgeSeconds": age,
+        "refreshQueued": refresh_queued
+    }
+
+
+def lookup_price(keyword_name, set_name="", card_number="", pool=None, quiet=True,
+                 refresher=None, grade=PSA10_GRADE):
+    """
+    Look up the latest price for a grade (PSA 10 by default) with stale-while-revalidate caching.
+    Returns the JSON-serialisable result dict.
+    Every scrape stores all grades on the listing page, so any grade is served from
+    the same cached visit.
+
+    pool      : optional DriverPool so the scrape reuses a warm browser
+    quiet     : swallow scraper print output (the CLI needs a clean stdout)
+    refresher : callable(name, set, number, grade=...) that queues a background refresh
+                (default: job queue if enabled, else a detached refresh process)
+    grade     : 'PSA 10', 'PSA 9', 'BGS 10', 'A', 'Raw', ... (spacing/case-insensitive)
+    """
+    grade = grade_label(grade) or PSA10_GRADE
+    refresher = refresher or (enqueue_refresh if USE_JOB_QUEUE else spawn_refresh_process)
 
-def query_price(keyword_name, set_name="", card_number=""):
-    # Ensure DB exists
-    init_db()
-    
     try:
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        
-        # Check DB first
-        # We search by name mainly
-        search_term = f"%{keyword_name}%"
-        
-        cursor.execute('''
-        SELECT card_name, psa10_latest_price, scraped_at, url, item_count
-        FROM card_prices 
-        WHERE card_name LIKE ? 
-        ORDER BY scraped_at DESC 
-        LIMIT 1
-        ''', (search_term,))
-        
-        row = cursor.fetchone()
-        conn.close()
-        
-        # If not found, run scraper
-        if not row:
-            # Capturing stdout to prevent pollution of JSON output
-            f = io.StringIO()
-            with contextlib.redirect_stdout(f):
-                run_scraper_and_save(keyword_name, set_name, card_number)
-            
+        # Check DB first (exact name/set/number, then fuzzy name search)
+        # Long-lived connection; schema is migrated on first use
+        db = get_storage()
+        # Demand signal for snkrdunk_scheduler (hot cards get refreshed ahead of time)
+        db.record_request(keyword_name, set_name, card_number, half_life=DEMAND_HALF_LIFE)
+        row = _latest(db, grade, keyword_name, set_name, card_number)
+
+        fresh_ttl, max_stale = _ttls(db, keyword_name, set_name, card_number)
+        age = _age_seconds(row['scraped_at']) if row else None
+        refresh_queued = False
+
+        if row and age is not None and age < fresh_ttl:
+            cache_status = "fresh"
+        elif row and age is not None and age < max_stale:
+            cache_status = "stale"
+            refresh_queued = bool(refresher(keyword_name, set_name, card_number, grade=grade))
+        elif (miss := _get_miss(db, grade, keyword_name, set_name, card_number)):
+            # Recently confirmed missing on SNKRDUNK: don't scrape again until it expires
+            if not row:
+                cache_result("price", "negative")
+                return _miss_response(miss, "negative")
+            cache_status = "expired"
+        else:
+            # Hard miss (or too old to serve): run scraper
+            cache_status = "expired" if row else "miss"
+            try:
+                if quiet:
+                    # Capturing stdout to prevent pollution of JSON output
+                    f = io.StringIO()
+                    with contextlib.redirect_stdout(f):
+                        _scrape(keyword_name, set_name, card_number, pool, grade)
+                else:
+                    _scrape(keyword_name, set_name, card_number, pool, grade)
+            except Exception:
+                # An expired price is still better than an error
+                if not row:
+                    raise
+
             # Query again after scraping
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            cursor.execute('''
-            SELECT card_name, psa10_latest_price, scraped_at, url, item_count
-            FROM card_prices 
-            WHERE card_name LIKE ? 
-            ORDER BY scraped_at DESC 
-            LIMIT 1
-            ''', (search_term,))
-            row = cursor.fetchone()
-            conn.close()
-            
+            row = _latest(db, grade, keyword_name, set_name, card_number) or row
+            age = _age_seconds(row['scraped_at']) if row else None
+
+        cache_result("price", cache_status)
+        if row and grade != PSA10_GRADE:
+            return _grade_response(row, grade, cache_status, age, refresh_queued)
         if row:
-            result = {
+            return {
                 "success": True,
-                "cardTitle": row[0],
-                "latestPrice": row[1],
-                "scrapedAt": row[2],
-                "url": row[3],
-                "psa10Listings": row[4]
+                "cardTitle": row['card_name'],
+                "latestPrice": row['psa10_latest_price'],
+                "scrapedAt": row['scraped_at'],
+                "url": row['url'],
+                "psa10Listings": row['item_count'],
+                "cacheStatus": cache_status,
+                "cacheAgeSeconds": age,
+                "refreshQueued": refresh_queued
             }
-        else:
-            result = {
-                "success": False,
-                "error": "Card not found on SNKRDUNK."
-            }
-            
-        print(json.dumps(result))
-        
+        miss = _get_miss(db, grade, keyword_name, set_name, card_number)
+        if miss:
+            return _miss_response(miss, cache_status)
+        return {
+            "success": False,
+            "error": "Card not found on SNKRDUNK."
+        }
+
     except Exception as e:
         # In case of any error, return JSON error
-        print(json.dumps({"success": False, "error": str(e)}))
+        return {"success": False, "error": str(e)}
+
+
+def query_price(keyword_name, set_name="", card_number="", grade=PSA10_GRADE):
+    print(json.dumps(lookup_price(keyword_name, set_name, card_number, grade=grade)))
 
 if __name__ == "__main__":
-    # Expect: python query_snkrdunk_db.py "Name" "Set" "Number"
+    # Expect: python query_snkrdunk_db.py "Name" "Set" "Number" ["Grade"]
     # Or just "Name"
+    # Background refresh: python query_snkrdunk_db.py --refresh "Name" "Set" "Number" ["Grade"]
     if len(sys.argv) < 2:
         print(json.dumps({"success": False, "error": "No keyword provided"}))
         sys.exit(1)
-        
+
+    if sys.argv[1] == '--refresh':
+        args = (sys.argv[2:] + ['', '', ''])[:3]
+        refresh_grade = (grade_label(sys.argv[5]) if len(sys.argv) > 5 else '') or PSA10_GRADE
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_scraper_and_save(*args, ignore_miss_reasons=_ignored_misses(refresh_grade))
+        sys.exit(0)
+
     keyword = sys.argv[1]
     set_name = sys.argv[2] if len(sys.argv) > 2 else "Unknown"
     number = sys.argv[3] if len(sys.argv) > 3 else ""
-    
-    query_price(keyword, set_name, number)
+    grade = sys.argv[4] if len(sys.argv) > 4 else PSA10_GRADE
+
+    query_price(keyword, set_name, number, grade)
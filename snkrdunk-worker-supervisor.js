@@ -0,0 +1,144 @@
+// SNKRDUNK Python worker supervisor
+// Keeps one long-running `python snkrdunk_worker.py` process alive and
+// multiplexes HTTP requests over its JSON-lines stdin/stdout protocol.
+// Restarts the worker with backoff if it crashes.
+
+const { spawn } = require('child_process');
+const readline = require('readline');
+
+const PYTHON_BIN = process.env.PYTHON_BIN || 'python';
+const REQUEST_TIMEOUT_MS = parseInt(process.env.SNKRDUNK_WORKER_TIMEOUT_MS || '180000', 10);
+const MIN_BACKOFF_MS = 1000;
+const MAX_BACKOFF_MS = 30000;
+const STABLE_AFTER_MS = 60000;
+
+class SnkrdunkWorkerSupervisor {
+    constructor(options = {}) {
+        this.script = options.script || 'snkrdunk_worker.py';
+        this.args = options.args || [];
+        this.child = null;
+        this.pending = new Map();
+        this.nextId = 1;
+        this.backoff = MIN_BACKOFF_MS;
+        this.startedAt = 0;
+        this.restarts = 0;
+        this.stopped = false;
+    }
+
+    start() {
+        this.stopped = false;
+        this.startedAt = Date.now();
+
+        const child = spawn(PYTHON_BIN, [this.script, ...this.args], {
+            stdio: ['pipe', 'pipe', 'pipe']
+        });
+        this.child = child;
+        console.log(`[SNKRDUNK Worker] Started pid ${child.pid}`);
+
+        readline.createInterface({ input: child.stdout }).on('line', (line) => this._onLine(line));
+        readline.createInterface({ input: child.stderr }).on('line', (line) => {
+            console.log(`[SNKRDUNK Worker] ${line}`);
+        });
+
+        child.on('error', (err) => {
+            console.error(`[SNKRDUNK Worker] Spawn error: ${err.message}`);
+        });
+
+        child.on('exit', (code, signal) => {
+            if (this.child === child) {
+                this.child = null;
+            }
+            console.error(`[SNKRDUNK Worker] Exited (code=${code}, signal=${signal})`);
+            this._rejectAll(new Error('SNKRDUNK worker exited'));
+
+            if (this.stopped) {
+                return;
+            }
+            // Reset backoff once the worker has stayed up for a while
+            if (Date.now() - this.startedAt > STABLE_AFTER_MS) {
+                this.backoff = MIN_BACKOFF_MS;
+            }
+            const delay = this.backoff;
+            this.backoff = Math.min(this.backoff * 2, MAX_BACKOFF_MS);
+            this.restarts += 1;
+            console.log(`[SNKRDUNK Worker] Restarting in ${delay}ms`);
+            setTimeout(() => {
+                if (!this.stopped) {
+                    this.start();
+                }
+            }, delay);
+        });
+    }
+
+    stop() {
+        this.stopped = true;
+        if (this.child) {
+            this.child.stdin.end();
+            this.child.kill();
+        }
+    }
+
+    request(payload, timeoutMs = REQUEST_TIMEOUT_MS) {
+        return new Promise((resolve, reject) => {
+            if (!this.child) {
+                return reject(new Error('SNKRDUNK worker is not running'));
+            }
+
+            const id = this.nextId++;
+            const timer = setTimeout(() => {
+                this.pending.delete(id);
+                reject(new Error('SNKRDUNK worker request timed out'));
+            }, timeoutMs);
+
+            this.pending.set(id, { resolve, reject, timer });
+            this.child.stdin.write(JSON.stringify({ id, ...payload }) + '\n');
+        });
+    }
+
+    stats() {
+        return {
+            running: Boolean(this.child),
+            pid: this.child ? this.child.pid : null,
+            pending: this.pending.size,
+            restarts: this.restarts
+        };
+    }
+
+    _onLine(line) {
+        let message;
+        try {
+            message = JSON.parse(line);
+        } catch (e) {
+            console.error(`[SNKRDUNK Worker] Bad line: ${line.substring(0, 200)}`);
+            return;
+        }
+
+        if (message.event === 'ready') {
+            console.log(`[SNKRDUNK Worker] Ready (pid ${message.pid})`);
+            return;
+        }
+
+        const entry = this.pending.get(message.id);
+        if (!entry) {
+            return;
+        }
+        this.pending.delete(message.id);
+        clearTimeout(entry.timer);
+
+        if (message.error) {
+            entry.reject(new Error(message.error));
+        } else {
+            entry.resolve(message.result);
+        }
+    }
+
+    _rejectAll(err) {
+        for (const [id, entry] of this.pending) {
+            clearTimeout(entry.timer);
+            entry.reject(err);
+        }
+        this.pending.clear();
+    }
+}
+
+module.exports = SnkrdunkWorkerSupervisor;
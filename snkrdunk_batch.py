@@ -0,0 +1,180 @@
+"""
+SNKRDUNK PSA 10 배치 조회 CLI
+=====================================
+카드 목록 파일을 읽어 get_cheapest_psa10_many로 조회하고,
+끝나는 순서대로 한 줄씩 JSON을 출력.
+
+입력 형식:
+  - CSV  : card_name,set_name,card_number 헤더 (PriceCharting 내보내기의
+           'product-name', 'console-name' 열도 인식)
+  - JSONL: 한 줄에 {"card_name": ..., "set_name": ..., "card_number": ...}
+
+실행:
+  python snkrdunk_batch.py cards.csv
+  python snkrdunk_batch.py cards.jsonl --engine http --save
+  python snkrdunk_batch.py cards.csv --engine cdp --workers 8   # Chrome 하나, 탭 8개 (snkrdunk_cdp)
+  cat cards.csv | python snkrdunk_batch.py -
+  python snkrdunk_batch.py cards.csv --queue   # snkrdunk_jobs fleet에 맡기고 결과만 기다림
+
+스크래퍼 로그는 stderr, 결과 JSON은 stdout.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from snkrdunk_db import get_storage
+from snkrdunk_jobs import POLL_INTERVAL, PRIORITY_BATCH, JobQueue
+from snkrdunk_psa10_scraper import DEFAULT_ENGINE, get_cheapest_psa10_many
+
+# --save 시 한 번에 모아서 저장할 행 수 (executemany)
+SAVE_BATCH_SIZE = 25
+
+
+_COLUMN_ALIASES = {
+    'card_name':   ('card_name', 'name', 'product-name', 'Card Name'),
+    'set_name':    ('set_name', 'set', 'console-name', 'Set'),
+    'card_number': ('card_number', 'number', 'Card Number'),
+}
+
+
+def _pick(row: dict, field: str) -> str:
+    for column in _COLUMN_ALIASES[field]:
+        if row.get(column):
+            return str(row[column]).strip()
+    return ''
+
+
+def read_cards(stream) -> list[dict]:
+    text = stream.read()
+    stripped = text.lstrip()
+    if stripped.startswith('{'):
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        rows = list(csv.DictReader(text.splitlines()))
+
+    cards = []
+    for row in rows:
+        card = {field: _pick(row, field) for field in _COLUMN_ALIASES}
+        if card['card_name']:
+            cards.append(card)
+    return cards
+
+
+def run_queued(cards: list[dict], out, priority: int, timeout: float | None) -> int:
+    """
+    카드를 모두 작업 큐에 넣고 끝나는 순서대로 출력 (스크래핑/저장은 fleet 워커가 수행).
+    result는 저장된 최신 가격 행 ({'card_name', 'price', 'url', 'count'}), 못 찾으면 None.
+    """
+    queue = JobQueue()
+    db = queue.storage
+    pending = {}
+    for card in cards:
+        job_id = queue.submit(card['card_name'], card['set_name'], card['card_number'],
+                              priority=priority)
+        pending.setdefault(job_id, []).append(card)
+    print(f"📥 작업 {len(pending)}건 대기열 추가 ({len(cards)}장)")
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    found = 0
+    while pending:
+        for job_id in list(pending):
+            job = db.get_job(job_id)
+            timed_out = deadline is not None and time.monotonic() >= deadline
+            if job and job['status'] not in ('done', 'dead') and not timed_out:
+                continue
+            for card in pending.pop(job_id):
+                item = dict(card, job_id=job_id, status=job['status'] if job else None,
+                            result=None)
+                if job and job['status'] == 'done' and (job['result'] or {}).get('found'):
+                    row = db.latest_price(card['card_name'], card['set_name'], card['card_number'])
+                    if row:
+                        found += 1
+                        item['result'] = {'card_name': row['card_name'],
+                                          'price': row['psa10_latest_price'],
+                                          'url': row['url'], 'count': row['item_count']}
+                elif job and job['status'] == 'dead':
+                    item['error'] = job['error']
+                elif timed_out:
+                    item['error'] = 'timeout'
+                out.write(json.dumps(item, ensure_ascii=False) + '\n')
+                out.flush()
+        if pending:
+            time.sleep(POLL_INTERVAL)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch SNKRDUNK PSA 10 lookup')
+    parser.add_argument('path', help="CSV/JSONL file with cards ('-' for stdin)")
+    parser.add_argument('--engine', choices=('auto', 'http', 'selenium', 'cdp'), default=DEFAULT_ENGINE)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parallel listing-page visits (tabs with --engine cdp)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached card URLs')
+    parser.add_argument('--save', action='store_true', help='Save prices to snkrdunk.db')
+    parser.add_argument('--queue', action='store_true',
+                        help='Enqueue for the snkrdunk_jobs worker fleet and wait (always saves)')
+    parser.add_argument('--priority', type=int, default=PRIORITY_BATCH, help='Job priority with --queue')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='Stop waiting for queued jobs after this many seconds')
+    args = parser.parse_args()
+
+    if args.path == '-':
+        cards = read_cards(sys.stdin)
+    else:
+        with open(args.path, 'r', encoding='utf-8') as f:
+            cards = read_cards(f)
+
+    out = sys.stdout
+    # 결과 JSON만 stdout으로 나가도록 스크래퍼 print는 stderr로
+    sys.stdout = sys.stderr
+
+    if args.queue:
+        found = run_queued(cards, out, args.priority, args.timeout)
+        print(f"✅ {found}/{len(cards)} 장 가격 조회 완료")
+        return
+
+    found = 0
+    pending = []
+    if args.engine == 'cdp':
+        from snkrdunk_cdp import iter_cheapest_psa10
+        items = iter_cheapest_psa10(cards, max_tabs=args.workers, use_cache=not args.no_cache)
+    else:
+        items = get_cheapest_psa10_many(cards,
+                                        engine=args.engine,
+                                        use_cache=not args.no_cache,
+                                        max_workers=args.workers)
+    for item in items:
+        result = item['result']
+        row = None
+        if result and 'error' not in result:
+            found += 1
+            row = {
+                'card_name':   result['card_name'],
+                'price':       result['price'],
+                'url':         result['url'],
+                'item_count':  result['count'],
+                'all_prices':  result['all_prices'],
+            }
+        elif result is None and item.get('grades'):
+            # PSA 10은 없지만 다른 등급 리스팅은 있음 → 등급별 요약만 저장 (PSA 10 가격은 NULL)
+            row = {'card_name': item['card_name'], 'price': None, 'url': None, 'item_count': 0}
+        if args.save and row:
+            pending.append(dict(row, set_name=item['set_name'], card_number=item['card_number'],
+                                grades=item.get('grades')))
+            if len(pending) >= SAVE_BATCH_SIZE:
+                get_storage().save_prices(pending)
+                pending = []
+        out.write(json.dumps(item, ensure_ascii=False) + '\n')
+        out.flush()
+
+    if pending:
+        get_storage().save_prices(pending)
+
+    print(f"✅ {found}/{len(cards)} 장 가격 조회 완료")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,668 @@
+"""
+SNKRDUNK CDP 엔진 (asyncio, 브라우저 하나 + 탭 여러 개)
+=====================================
+chromedriver를 거치지 않고 Chrome DevTools Protocol에 websocket으로 직접 연결.
+Selenium 경로는 명령마다 chromedriver HTTP 왕복이 있고 브라우저당 페이지가 하나뿐이지만,
+여기서는 Chrome 하나에 탭(target)을 여러 개 열어 카드마다 검색/매칭/추출을 동시에 진행.
+
+  - 연결 1개 (browser websocket) + flat session (Target.attachToTarget flatten=True)
+    → 모든 탭의 명령/이벤트가 한 연결에서 sessionId로 구분됨
+  - 브라우저당 동시 탭 수 상한: max_tabs (SNKRDUNK_CDP_TABS, 기본 8) — asyncio.Semaphore
+  - 끝난 탭은 닫지 않고 재사용 (MAX_TAB_PAGES 페이지마다 새 탭으로 교체)
+  - 페이지 안 스크립트는 Selenium 경로와 같은 것(_JS_HARVEST_CANDIDATES, _JS_EXTRACT_LISTINGS,
+    snkrdunk_waits의 대기/스크롤)을 Runtime.evaluate로 실행 → 같은 후보/리스팅, 같은 결과 dict
+  - 카드 URL 캐시 / 음성 캐시 / 트레이스도 동기 경로와 동일 (engine='cdp')
+  - SNKRDUNK_LEAN_BROWSER=1이면 탭마다 Network.setBlockedURLs로 이미지/폰트/분석 차단
+  - SNKRDUNK_SNAPSHOTS=1이면 검색/리스팅 DOM(outerHTML)을 snkrdunk_snapshots에 보관
+
+사용 예시:
+  import asyncio
+  from snkrdunk_cdp import CDPBrowser, get_cheapest_psa10_async
+
+  async def main():
+      async with CDPBrowser(max_tabs=8) as browser:
+          results = await asyncio.gather(*(
+              get_cheapest_psa10_async(name, set_name, number, browser=browser)
+              for name, set_name, number in cards))
+
+  python snkrdunk_batch.py cards.csv --engine cdp --workers 8   # 탭 8개
+"""
+
+import asyncio
+import json
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import quote
+
+import websockets
+
+import snkrdunk_metrics as metrics
+import snkrdunk_snapshots as snapshots
+from snkrdunk_db import resolution_key
+from snkrdunk_names import extract_pokemon_name
+from snkrdunk_psa10_scraper import (
+    LEAN_BLOCKED_URLS,
+    LEAN_BROWSER,
+    LEAN_STEP_ALLOW,
+    SNKRDUNK_BASE_URL,
+    StaleResolution,
+    _CHROME_BINARIES,
+    _JS_EXTRACT_LISTINGS,
+    _JS_HARVEST_CANDIDATES,
+    _LEAN_CHROME_ARGS,
+    _Lookup,
+    _apply_cached_resolution,
+    _as_card,
+    _drop_stale_resolution,
+    _finish_trace,
+    _listing_page_matches,
+    _match_candidates,
+    _normalize,
+    _record_outcome,
+    _summarize_listings,
+    _used_listings_url,
+    get_card_miss,
+)
+from snkrdunk_waits import (
+    QUIET_MS,
+    STEP_TIMEOUTS,
+    _JS_SCROLL_UNTIL_STABLE,
+    _JS_STABLE_COUNT,
+)
+
+
+DEFAULT_MAX_TABS = int(os.environ.get('SNKRDUNK_CDP_TABS', '8'))
+# 탭 하나가 로드할 수 있는 최대 페이지 수 (초과 시 닫고 새 탭)
+MAX_TAB_PAGES = int(os.environ.get('SNKRDUNK_CDP_TAB_PAGES', '50'))
+# Chrome 기동 후 DevToolsActivePort 파일이 생길 때까지 대기(초)
+LAUNCH_TIMEOUT = 20.0
+# CDP 명령 1개 / 페이지 이동 1회의 상한(초)
+COMMAND_TIMEOUT = 30.0
+NAVIGATE_TIMEOUT = 30.0
+
+_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+               'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+_JS_OUTER_HTML = 'return document.documentElement.outerHTML;'
+
+_JS_USED_LINK = """
+const a = document.querySelector('a[href*="/used?slide=right"]');
+return a ? a.href : null;
+"""
+
+
+class CDPError(Exception):
+    """CDP 명령 오류 / 연결 끊김 / 페이지 이동 실패"""
+
+
+# ──────────────────────────────────────────────────────────────
+# 연결: 명령 id ↔ 응답, (sessionId, method) ↔ 이벤트
+# ──────────────────────────────────────────────────────────────
+
+class CDPConnection:
+    """browser websocket 하나. 모든 탭의 명령과 이벤트가 이 연결을 공유."""
+
+    def __init__(self, ws):
+        self._ws = ws
+        self._next_id = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._waiters: list[tuple[str, str | None, asyncio.Future]] = []
+        self._closed_error: Exception | None = None
+        self._reader = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, ws_url: str) -> 'CDPConnection':
+        ws = await websockets.connect(ws_url, max_size=None, ping_interval=None)
+        return cls(ws)
+
+    async def _read(self):
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                if 'id' in message:
+                    future = self._pending.pop(message['id'], None)
+                    if future is None or future.done():
+                        continue
+                    if 'error' in message:
+                        future.set_exception(CDPError(message['error'].get('message', 'CDP error')))
+                    else:
+                        future.set_result(message.get('result', {}))
+                elif 'method' in message:
+                    self._dispatch(message['method'], message.get('sessionId'),
+                                   message.get('params', {}))
+        except Exception as e:
+            self._closed_error = e
+        finally:
+            error = CDPError(f'CDP connection closed: {self._closed_error or "eof"}')
+            self._closed_error = error
+            for future in [*self._pending.values(), *(w[2] for w in self._waiters)]:
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+            self._waiters.clear()
+
+    def _dispatch(self, method: str, session_id: str | None, params: dict):
+        for waiter in list(self._waiters):
+            if waiter[0] == method and waiter[1] == session_id:
+                self._waiters.remove(waiter)
+                if not waiter[2].done():
+                    waiter[2].set_result(params)
+
+    def expect(self, method: str, session_id: str | None = None) -> asyncio.Future:
+        """다음 method 이벤트를 받을 Future (명령을 보내기 전에 등록해야 놓치지 않음)"""
+        future = asyncio.get_running_loop().create_future()
+        if self._closed_error:
+            future.set_exception(self._closed_error)
+        else:
+            self._waiters.append((method, session_id, future))
+        return future
+
+    def forget(self, future: asyncio.Future):
+        self._waiters = [w for w in self._waiters if w[2] is not future]
+
+    async def send(self, method: str, params: dict | None = None, session_id: str | None = None,
+                   timeout: float = COMMAND_TIMEOUT) -> dict:
+        if self._closed_error:
+            raise self._closed_error
+        self._next_id += 1
+        message_id = self._next_id
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        metrics.CDP_COMMANDS.inc(method=method)
+        try:
+            await self._ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise CDPError(f'{method} timed out after {timeout}s')
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def close(self):
+        await self._ws.close()
+        await asyncio.gather(self._reader, return_exceptions=True)
+
+
+# ──────────────────────────────────────────────────────────────
+# 탭
+# ──────────────────────────────────────────────────────────────
+
+class CDPTab:
+    """target 하나 (flat session). 페이지 스크립트는 Selenium execute_script 규칙 그대로."""
+
+    def __init__(self, conn: CDPConnection, target_id: str, session_id: str, lean: bool):
+        self.conn = conn
+        self.target_id = target_id
+        self.session_id = session_id
+        self.lean = lean
+        self.pages = 0
+        self._blocked = None
+
+    async def send(self, method: str, params: dict | None = None, timeout: float = COMMAND_TIMEOUT):
+        return await self.conn.send(method, params, self.session_id, timeout)
+
+    async def evaluate(self, script: str, *args):
+        """execute_script와 같은 형식 (본문에서 return, 인자는 arguments[i])"""
+        expression = f'(function() {{\n{script}\n}}).apply(null, {json.dumps(list(args))})'
+        return await self._evaluate(expression, COMMAND_TIMEOUT)
+
+    async def evaluate_async(self, script: str, timeout: float, *args):
+        """execute_async_script와 같은 형식 (마지막 인자가 done 콜백). 시간 초과/오류 시 None."""
+        expression = (f'new Promise(done => (function() {{\n{script}\n}})'
+                      f'.apply(null, {json.dumps(list(args))}.concat([done])))')
+        try:
+            return await self._evaluate(expression, timeout + 2)
+        except CDPError:
+            return None
+
+    async def _evaluate(self, expression: str, timeout: float):
+        response = await self.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': True,
+        }, timeout=timeout)
+        if 'exceptionDetails' in response:
+            details = response['exceptionDetails']
+            text = details.get('exception', {}).get('description') or details.get('text')
+            raise CDPError(f'evaluate failed: {text}')
+        return response.get('result', {}).get('value')
+
+    async def goto(self, url: str, timeout: float = NAVIGATE_TIMEOUT):
+        """이동 후 load (경량 모드는 DOMContentLoaded) 이벤트까지 대기"""
+        event = 'Page.domContentEventFired' if self.lean else 'Page.loadEventFired'
+        loaded = self.conn.expect(event, self.session_id)
+        try:
+            response = await self.send('Page.navigate', {'url': url})
+            if response.get('errorText'):
+                raise CDPError(f"navigate {url}: {response['errorText']}")
+            await asyncio.wait_for(loaded, timeout)
+        except asyncio.TimeoutError:
+            raise CDPError(f'navigate {url}: no load event after {timeout}s')
+        finally:
+            self.conn.forget(loaded)
+        self.pages += 1
+
+    async def title(self) -> str:
+        return await self.evaluate('return document.title;') or ''
+
+    async def apply_resource_policy(self, step: str):
+        """경량 모드 차단 목록 (snkrdunk_psa10_scraper._apply_resource_policy와 같은 규칙)"""
+        if not self.lean:
+            return
+        allow = set(LEAN_STEP_ALLOW.get(step, ()))
+        blocked = [p for p in LEAN_BLOCKED_URLS if p not in allow]
+        if blocked != self._blocked:
+            await self.send('Network.setBlockedURLs', {'urls': blocked})
+            self._blocked = blocked
+
+    async def close(self):
+        await self.conn.send('Target.closeTarget', {'targetId': self.target_id})
+
+
+# ──────────────────────────────────────────────────────────────
+# 브라우저
+# ──────────────────────────────────────────────────────────────
+
+def _chrome_binary() -> str:
+    binary = os.environ.get('CHROME_BIN') or next(filter(None, map(shutil.which, _CHROME_BINARIES)), None)
+    if not binary:
+        raise CDPError('Chrome binary not found (set CHROME_BIN)')
+    return binary
+
+
+class CDPBrowser:
+    """
+    Chrome 프로세스 하나 + CDP 연결 하나 + 탭 풀.
+
+    Args:
+        max_tabs : 동시에 쓰는 탭 수 상한
+        headless : headless 모드 여부
+        lean     : 경량 프로필 (None이면 SNKRDUNK_LEAN_BROWSER)
+    """
+
+    def __init__(self, max_tabs: int | None = None, headless: bool = True, lean: bool | None = None):
+        self.max_tabs = max(1, max_tabs or DEFAULT_MAX_TABS)
+        self.headless = headless
+        self.lean = LEAN_BROWSER if lean is None else lean
+        self.conn: CDPConnection | None = None
+        self._process: subprocess.Popen | None = None
+        self._profile_dir: str | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._idle: list[CDPTab] = []
+        self._busy = 0
+        self._opened = 0
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self) -> 'CDPBrowser':
+        with metrics.step('driver_start', 'cdp'):
+            self._profile_dir = tempfile.mkdtemp(prefix='snkrdunk-cdp-')
+            args = [
+                _chrome_binary(),
+                '--remote-debugging-port=0',
+                f'--user-data-dir={self._profile_dir}',
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--window-size=1920,1080',
+                '--disable-blink-features=AutomationControlled',
+                f'--user-agent={_USER_AGENT}',
+                '--no-first-run',
+                '--no-default-browser-check',
+            ]
+            if self.headless:
+                args.append('--headless=new')
+            if self.lean:
+                args.extend(_LEAN_CHROME_ARGS)
+                args.append('--blink-settings=imagesEnabled=false')
+            args.append('about:blank')
+            try:
+                self._process = subprocess.Popen(args, stdin=subprocess.DEVNULL,
+                                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                self.conn = await CDPConnection.connect(await self._ws_url())
+            except BaseException:
+                # __aenter__가 실패하면 __aexit__가 불리지 않음 → Chrome/프로필 디렉터리를 여기서 정리
+                await self.close()
+                raise
+        self._slots = asyncio.Semaphore(self.max_tabs)
+        print(f"🚀 CDP 브라우저 시작 (pid {self._process.pid}, 탭 최대 {self.max_tabs}개)")
+        return self
+
+    async def _ws_url(self) -> str:
+        """Chrome이 user-data-dir에 쓰는 DevToolsActivePort (포트, browser websocket 경로)"""
+        path = os.path.join(self._profile_dir, 'DevToolsActivePort')
+        deadline = time.monotonic() + LAUNCH_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise CDPError(f'Chrome exited with code {self._process.returncode}')
+            try:
+                with open(path, encoding='utf-8') as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    return f'ws://127.0.0.1:{lines[0]}{lines[1]}'
+            except OSError:
+                pass
+            await asyncio.sleep(0.05)
+        raise CDPError(f'DevToolsActivePort not written after {LAUNCH_TIMEOUT}s')
+
+    async def _open_tab(self) -> CDPTab:
+        target = await self.conn.send('Target.createTarget', {'url': 'about:blank'})
+        attached = await self.conn.send('Target.attachToTarget',
+                                        {'targetId': target['targetId'], 'flatten': True})
+        tab = CDPTab(self.conn, target['targetId'], attached['sessionId'], self.lean)
+        await tab.send('Page.enable')
+        await tab.send('Page.addScriptToEvaluateOnNewDocument', {
+            'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
+        })
+        if self.lean:
+            await tab.send('Network.enable')
+        self._opened += 1
+        return tab
+
+    @asynccontextmanager
+    async def tab(self):
+        """
+        탭 하나를 빌려 씀 (동시 max_tabs개까지, 나머지는 대기).
+        블록이 예외로 끝나면 탭 상태를 믿을 수 없으므로 재사용하지 않고 닫음
+        (DriverPool이 건강하지 않은 드라이버를 버리는 것과 같은 규칙).
+        """
+        async with self._slots:
+            tab = self._idle.pop() if self._idle else await self._open_tab()
+            self._busy += 1
+            healthy = False
+            try:
+                yield tab
+                healthy = True
+            finally:
+                self._busy -= 1
+                if healthy and tab.pages < MAX_TAB_PAGES:
+                    self._idle.append(tab)
+                else:
+                    try:
+                        await tab.close()
+                    except CDPError:
+                        pass
+
+    async def close(self):
+        connected = self.conn is not None
+        if connected:
+            try:
+                await self.conn.send('Browser.close', timeout=5)
+            except CDPError:
+                pass
+            await self.conn.close()
+            self.conn = None
+        if self._process is not None:
+            # 연결 전(기동 실패)이면 Browser.close를 못 보냈으므로 바로 종료 신호
+            if not connected and self._process.poll() is None:
+                self._process.terminate()
+            await asyncio.to_thread(self._wait_process)
+            self._process = None
+        if self._profile_dir:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+        self._idle.clear()
+        print("👋 CDP 브라우저 종료")
+
+    def _wait_process(self):
+        """이벤트 루프를 막지 않도록 스레드에서 호출"""
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+    def stats(self) -> dict:
+        return {'max_tabs': self.max_tabs, 'busy': self._busy, 'idle': len(self._idle),
+                'opened': self._opened, 'lean': self.lean}
+
+
+# ──────────────────────────────────────────────────────────────
+# 파이프라인 (Step 1~4, 탭 하나)
+# ──────────────────────────────────────────────────────────────
+
+async def _capture_page(tab: CDPTab, kind: str, url: str, pokemon_name: str = '', lookup=None):
+    """현재 DOM을 스냅샷으로 보관 (꺼져 있으면 outerHTML 왕복도 생략, 파일/DB 쓰기는 스레드에서)"""
+    if snapshots.SNAPSHOTS_ENABLED:
+        page_html = await tab.evaluate(_JS_OUTER_HTML)
+        await asyncio.to_thread(snapshots.capture, kind, url, page_html, 'cdp',
+                                pokemon_name, lookup)
+
+
+async def _search_candidates(tab: CDPTab, pokemon_name: str) -> list[dict]:
+    """Step 1: 검색 결과 페이지 → 매칭 후보 목록"""
+    search_url = f"{SNKRDUNK_BASE_URL}/en/search/result?keyword={quote(pokemon_name)}"
+    print(f"[CDP Step 1] 검색 URL: {search_url}")
+    await tab.apply_resource_policy('search')
+    await tab.goto(search_url)
+    timeout = STEP_TIMEOUTS['search']
+    await tab.evaluate_async(_JS_STABLE_COUNT, timeout, 'img[alt], .product__item-name',
+                             QUIET_MS, int(timeout * 1000), 1)
+    if not tab.lean:
+        timeout = STEP_TIMEOUTS['search_scroll']
+        await tab.evaluate_async(_JS_SCROLL_UNTIL_STABLE, timeout, 'img[alt], .product__item-name',
+                                 800, QUIET_MS, int(timeout * 1000), 5)
+    await _capture_page(tab, 'search', search_url, pokemon_name=pokemon_name)
+    candidates = await tab.evaluate(_JS_HARVEST_CANDIDATES) or []
+    print(f"         후보 수: {len(candidates)}")
+    return candidates
+
+
+async def _open_listings(tab: CDPTab, card_url: str) -> str:
+    """Step 3: /used?slide=right로 이동 (패턴이 안 맞으면 상세 페이지의 See More 링크)"""
+    await tab.apply_resource_policy('navigate')
+    used_url = _used_listings_url(card_url)
+    if not used_url:
+        print(f"[CDP Step 3] 카드 상세 페이지에서 See More 탐색: {card_url}")
+        await tab.goto(card_url)
+        used_url = await tab.evaluate(_JS_USED_LINK)
+        if not used_url:
+            print(f"         ⚠️ See More 링크 없음 — 현재 페이지에서 진행")
+            return card_url
+    print(f"[CDP Step 3] 리스팅 URL: {used_url}")
+    await tab.goto(used_url)
+    return used_url
+
+
+async def _extract_listings(tab: CDPTab) -> list[dict]:
+    """Step 4: lazy-load 스크롤 후 모든 등급 요소 수집"""
+    await tab.apply_resource_policy('extract')
+    timeout = STEP_TIMEOUTS['listing_scroll']
+    await tab.evaluate_async(_JS_SCROLL_UNTIL_STABLE, timeout, 'p.evaluation',
+                             900, QUIET_MS, int(timeout * 1000), 6)
+    return await tab.evaluate(_JS_EXTRACT_LISTINGS) or []
+
+
+async def _run_tab_pipeline(tab: CDPTab, lookup: _Lookup) -> dict | None:
+    if lookup.card_url:
+        card_url = lookup.card_url
+        print(f"[CDP Step 1-2] 카드 URL 사용: {card_url}")
+    else:
+        with metrics.step('search', 'cdp'):
+            candidates = await _search_candidates(tab, lookup.pokemon_name)
+        with metrics.step('match', 'cdp'):
+            match = _match_candidates(candidates, lookup.card_name, lookup.set_name,
+                                      lookup.card_number, lookup.pokemon_name)
+        lookup.match = match
+        if not match:
+            print(f"         ❌ 매칭 실패 ({lookup.card_name})")
+            lookup.record_miss('not_found', candidates)
+            return None
+        card_url = match['href']
+        print(f"         ✅ 매칭 (점수 {match['score']}): {match['text'][:80]}")
+
+    with metrics.step('navigate', 'cdp'):
+        used_url = await _open_listings(tab, card_url)
+    if lookup.from_cache:
+        title = await tab.title()
+        if not _listing_page_matches(title, lookup.pokemon_name):
+            raise StaleResolution(f"title={title!r}")
+
+    with metrics.step('extract', 'cdp'):
+        listings = await _extract_listings(tab)
+        psa10_count = sum(1 for item in listings if _normalize(item['grade']) == 'psa 10')
+        print(f"[CDP Step 4] 전체 PSA 10 요소 수: {psa10_count}")
+        result = _summarize_listings(listings, lookup)
+    await _capture_page(tab, 'listing', used_url, lookup=lookup)
+    if result:
+        result['url'] = used_url
+    else:
+        lookup.record_miss('no_psa10', url=used_url)
+    return result
+
+
+async def _run_lookup(browser: CDPBrowser, lookup: _Lookup) -> dict | None:
+    """탭 하나로 Step 1~4. 브라우저/CDP 오류는 Selenium 경로처럼 {'error'} dict로."""
+    # 예외는 tab() 밖에서 잡음 → 오류가 난 탭(크래시, 'Target closed', 로딩 중 시간 초과)은
+    # 풀로 돌아가지 않고 닫힘 (늦게 온 load 이벤트가 다음 카드의 goto를 깨우지 않도록)
+    try:
+        async with browser.tab() as tab:
+            result = await _run_tab_pipeline(tab, lookup)
+    except StaleResolution:
+        raise
+    except Exception as e:
+        print(f"❌ CDP 엔진 오류 ({lookup.card_name}): {e}")
+        return {'error': str(e), 'debug_info': {}}
+    return lookup.decorate(result, 'cdp')
+
+
+async def _execute_lookup(browser: CDPBrowser, lookup: _Lookup, use_cache: bool) -> dict | None:
+    """조회 1건 + 캐시 반영 + 트레이스 (태스크마다 트레이스 하나)"""
+    trace = metrics.start_trace(card_name=lookup.card_name, set_name=lookup.set_name,
+                                card_number=lookup.card_number, pokemon_name=lookup.pokemon_name,
+                                requested_engine='cdp')
+    try:
+        try:
+            result = await _run_lookup(browser, lookup)
+        except StaleResolution as e:
+            await asyncio.to_thread(_drop_stale_resolution, lookup, e)
+            result = await _run_lookup(browser, lookup)
+        if use_cache:
+            await asyncio.to_thread(_record_outcome, lookup, result)
+    except Exception as e:
+        _finish_trace(trace, lookup, {'error': str(e)})
+        raise
+    _finish_trace(trace, lookup, result)
+    return result
+
+
+async def _prepare_lookup(card_name: str, set_name: str, card_number: str,
+                          use_cache: bool) -> _Lookup | None:
+    """음성 캐시 적중이면 None, 아니면 카드 URL 캐시를 적용한 _Lookup"""
+    if use_cache:
+        miss = await asyncio.to_thread(get_card_miss, card_name, set_name, card_number)
+        metrics.cache_result('negative', 'hit' if miss else 'miss')
+        if miss:
+            print(f"⚡ 음성 캐시 적중 ({card_name}: {miss['reason']})")
+            return None
+    lookup = _Lookup(card_name, set_name, card_number, extract_pokemon_name(card_name))
+    if use_cache:
+        await asyncio.to_thread(_apply_cached_resolution, lookup)
+    return lookup
+
+
+# ──────────────────────────────────────────────────────────────
+# 공개 API
+# ──────────────────────────────────────────────────────────────
+
+async def get_cheapest_psa10_async(card_name: str,
+                                   set_name: str,
+                                   card_number: str,
+                                   browser: CDPBrowser | None = None,
+                                   use_cache: bool = True) -> dict | None:
+    """
+    get_cheapest_psa10의 asyncio 버전 (같은 결과 dict, engine='cdp').
+    browser를 주면 그 브라우저의 탭 하나를 쓰고, 없으면 임시 브라우저를 띄웠다가 종료.
+    """
+    lookup = await _prepare_lookup(card_name, set_name, card_number, use_cache)
+    if lookup is None:
+        return None
+    if browser is not None:
+        return await _execute_lookup(browser, lookup, use_cache)
+    async with CDPBrowser(max_tabs=1) as own_browser:
+        return await _execute_lookup(own_browser, lookup, use_cache)
+
+
+async def get_cheapest_psa10_many_async(cards,
+                                        browser: CDPBrowser | None = None,
+                                        max_tabs: int | None = None,
+                                        use_cache: bool = True):
+    """
+    여러 카드를 탭 여러 개로 동시에 조회. 끝나는 순서대로 yield (async generator).
+    항목 형식은 get_cheapest_psa10_many와 같음: {'card_name', 'set_name', 'card_number', 'result', 'grades'}
+    """
+    unique = {}
+    for card in cards:
+        card = _as_card(card)
+        unique.setdefault(resolution_key(card['card_name'], card['set_name'], card['card_number']), card)
+    if not unique:
+        return
+
+    own_browser = None
+    if browser is None:
+        browser = own_browser = await CDPBrowser(max_tabs=max_tabs).start()
+
+    async def run(card: dict) -> dict:
+        lookup = None
+        try:
+            lookup = await _prepare_lookup(card['card_name'], card['set_name'],
+                                           card['card_number'], use_cache)
+            result = lookup and await _execute_lookup(browser, lookup, use_cache)
+        except Exception as e:
+            result = {'error': str(e), 'debug_info': {}}
+        return dict(card, result=result, grades=lookup.grades if lookup else {})
+
+    tasks = [asyncio.create_task(run(card)) for card in unique.values()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_browser is not None:
+            await own_browser.close()
+
+
+def iter_cheapest_psa10(cards, max_tabs: int | None = None, use_cache: bool = True):
+    """
+    동기 코드용: 전용 스레드의 이벤트 루프에서 get_cheapest_psa10_many_async를 돌리고
+    끝나는 순서대로 yield (snkrdunk_batch --engine cdp).
+    """
+    results = queue.Queue()
+    done = object()
+
+    async def produce():
+        async for item in get_cheapest_psa10_many_async(cards, max_tabs=max_tabs,
+                                                        use_cache=use_cache):
+            results.put(item)
+
+    def run():
+        try:
+            asyncio.run(produce())
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put(done)
+
+    thread = threading.Thread(target=run, name='snkrdunk-cdp', daemon=True)
+    thread.start()
+    while True:
+        item = results.get()
+        if item is done:
+            break
+        if isinstance(item, Exception):
+            raise item
+        yield item
+    thread.join()
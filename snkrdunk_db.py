@@ -0,0 +1,1408 @@
+"""
+SNKRDUNK 가격 DB 저장소
+=====================================
+snkrdunk.db 접근을 한 곳으로 모은 모듈.
+
+  - 스키마 버전 관리: PRAGMA user_version + MIGRATIONS 목록 (순서대로 1회씩 적용)
+  - WAL 모드, synchronous=NORMAL, busy_timeout
+  - 스레드별로 한 번 연 커넥션을 계속 재사용 (SQL 문은 모듈 상수 → sqlite3 statement cache 적중)
+  - (name_norm, set_norm, number_norm, scraped_at) 복합 인덱스로 최신 가격 조회
+  - FTS5(trigram) 테이블로 부분 문자열/유사 이름 검색 (기존 LIKE '%x%' 대체)
+  - executemany 일괄 저장
+  - 가격 이력: 리스팅별 관측값 + 일별 집계(min/p25/median/p75) 테이블 (등급별)
+  - 등급별 최신 요약: card_grade_prices (리스팅 페이지 한 번에서 나온 모든 등급)
+  - 스크래핑 작업 큐: scrape_jobs (임대/완료/백오프 재시도/dead-letter, snkrdunk_jobs에서 사용)
+  - 페이지 스냅샷 색인: page_snapshots (본문은 snkrdunk_snapshots가 디스크에 저장)
+
+사용 예시:
+  from snkrdunk_db import get_storage
+  db = get_storage()
+  db.save_price('GENGAR-HOLO', 71, url, 3, set_name='Fossil', card_number='94')
+  db.latest_price('gengar')
+  db.latest_grades('GENGAR-HOLO', 'Fossil', '94')['grades']['PSA 9']
+  db.price_history('GENGAR-HOLO', 'Fossil', '94', days=180)
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+
+
+DB_NAME = os.environ.get('SNKRDUNK_DB', 'snkrdunk.db')
+
+
+def normalize(text) -> str:
+    return re.sub(r'\s+', ' ', str(text or '')).strip().lower()
+
+
+# 기본 조회 등급 / 미감정(상태 등급 A, B, ...) 리스팅 전체를 합친 등급
+PSA10_GRADE = 'PSA 10'
+RAW_GRADE = 'Raw'
+
+
+_SPACES_RE = re.compile(r'\s+')
+_GRADE_NUMBER_RE = re.compile(r'^([A-Z]+)\s*(\d)')
+
+
+@lru_cache(maxsize=1024)
+def grade_label(text) -> str:
+    """
+    등급 표기 통일: 'psa  10' / 'PSA10' → 'PSA 10', 'bgs 9.5' → 'BGS 9.5', 'a' → 'A', 'raw' → 'Raw'
+    리스팅마다 호출되지만 서로 다른 표기는 몇 개뿐이라 캐시.
+    """
+    label = _SPACES_RE.sub(' ', str(text or '')).strip().upper()
+    if label == RAW_GRADE.upper():
+        return RAW_GRADE
+    return _GRADE_NUMBER_RE.sub(r'\1 \2', label)
+
+
+def resolution_key(card_name, set_name, card_number) -> str:
+    """카드 식별 키: 정규화된 (카드명, 세트명, 카드번호)"""
+    return '|'.join([normalize(card_name), normalize(set_name), normalize(card_number)])
+
+
+# ──────────────────────────────────────────────────────────────
+# 마이그레이션
+# ──────────────────────────────────────────────────────────────
+
+def _columns(conn, table: str) -> list[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+
+
+def _migrate_v1(conn):
+    """
+    card_prices 정규화 스키마 + 인덱스 + FTS5, card_resolutions.
+
+    기존 DB는 두 가지 형태가 섞여 있음:
+      - 배포된 snkrdunk.db : card_id PRIMARY KEY, set_name, card_number, psa10_average_price
+      - 구 init_db()      : id AUTOINCREMENT, card_name, psa10_latest_price, url, item_count
+    어느 쪽이든 있는 컬럼만 새 테이블로 옮김.
+    """
+    legacy_rows = []
+    old_columns = _columns(conn, 'card_prices')
+    if old_columns:
+        wanted = ['card_id', 'card_name', 'set_name', 'card_number', 'psa10_latest_price',
+                  'psa10_average_price', 'url', 'scraped_at', 'item_count']
+        present = [c for c in wanted if c in old_columns]
+        legacy_rows = [dict(zip(present, row)) for row in
+                       conn.execute(f'SELECT {", ".join(present)} FROM card_prices')]
+        conn.execute('DROP TABLE card_prices')
+
+    conn.execute('''
+    CREATE TABLE card_prices (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        card_name TEXT NOT NULL,
+        set_name TEXT NOT NULL DEFAULT '',
+        card_number TEXT NOT NULL DEFAULT '',
+        name_norm TEXT NOT NULL,
+        set_norm TEXT NOT NULL DEFAULT '',
+        number_norm TEXT NOT NULL DEFAULT '',
+        card_id TEXT,
+        psa10_latest_price NUMERIC,
+        psa10_average_price NUMERIC,
+        item_count INTEGER DEFAULT 0,
+        url TEXT,
+        scraped_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    conn.execute('''
+    CREATE INDEX idx_card_prices_card
+    ON card_prices (name_norm, set_norm, number_norm, scraped_at)
+    ''')
+    conn.execute('CREATE INDEX idx_card_prices_name_time ON card_prices (name_norm, scraped_at)')
+    conn.execute('CREATE INDEX idx_card_prices_scraped_at ON card_prices (scraped_at)')
+
+    try:
+        conn.execute('''
+        CREATE VIRTUAL TABLE card_prices_fts USING fts5(
+            card_name, content='card_prices', content_rowid='id', tokenize='trigram'
+        )
+        ''')
+        conn.execute('''
+        CREATE TRIGGER card_prices_fts_ai AFTER INSERT ON card_prices BEGIN
+            INSERT INTO card_prices_fts(rowid, card_name) VALUES (new.id, new.card_name);
+        END
+        ''')
+        conn.execute('''
+        CREATE TRIGGER card_prices_fts_ad AFTER DELETE ON card_prices BEGIN
+            INSERT INTO card_prices_fts(card_prices_fts, rowid, card_name)
+            VALUES ('delete', old.id, old.card_name);
+        END
+        ''')
+        conn.execute('''
+        CREATE TRIGGER card_prices_fts_au AFTER UPDATE OF card_name ON card_prices BEGIN
+            INSERT INTO card_prices_fts(card_prices_fts, rowid, card_name)
+            VALUES ('delete', old.id, old.card_name);
+            INSERT INTO card_prices_fts(rowid, card_name) VALUES (new.id, new.card_name);
+        END
+        ''')
+    except sqlite3.OperationalError as e:
+        # FTS5/trigram 미지원 SQLite → LIKE 검색으로 동작
+        print(f"⚠️ FTS5 사용 불가, LIKE 검색 사용: {e}", file=sys.stderr)
+
+    conn.executemany('''
+    INSERT INTO card_prices
+        (card_name, set_name, card_number, name_norm, set_norm, number_norm, card_id,
+         psa10_latest_price, psa10_average_price, item_count, url, scraped_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    ''', [
+        (row.get('card_name') or '', row.get('set_name') or '', row.get('card_number') or '',
+         normalize(row.get('card_name')), normalize(row.get('set_name')),
+         normalize(row.get('card_number')), row.get('card_id'),
+         row.get('psa10_latest_price'), row.get('psa10_average_price'),
+         row.get('item_count') or 0, row.get('url'), row.get('scraped_at'))
+        for row in legacy_rows
+    ])
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS card_resolutions (
+        resolution_key TEXT PRIMARY KEY,
+        card_id TEXT,
+        card_url TEXT NOT NULL,
+        match_score INTEGER,
+        match_text TEXT,
+        verified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+
+def _migrate_v2(conn):
+    """카드별 캐시 TTL 설정 (없으면 기본값 사용)"""
+    conn.execute('''
+    CREATE TABLE card_ttls (
+        name_norm TEXT NOT NULL,
+        set_norm TEXT NOT NULL DEFAULT '',
+        number_norm TEXT NOT NULL DEFAULT '',
+        fresh_ttl INTEGER NOT NULL,
+        max_stale INTEGER,
+        PRIMARY KEY (name_norm, set_norm, number_norm)
+    ) WITHOUT ROWID
+    ''')
+
+
+def _migrate_v3(conn):
+    """
+    스크래핑 임대(lease) — 프로세스 간 single-flight.
+    같은 카드를 동시에 스크래핑하지 않도록 키마다 소유자 한 명만 'running' 행을 가짐.
+    끝나면 결과(outcome, JSON)를 남겨 기다리던 다른 프로세스가 같은 결과를 받음.
+    """
+    conn.execute('''
+    CREATE TABLE scrape_leases (
+        lease_key TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        status TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        outcome TEXT,
+        finished_at REAL
+    ) WITHOUT ROWID
+    ''')
+
+
+def _migrate_v4(conn):
+    """음성 캐시: SNKRDUNK에 없는 카드 / PSA 10 리스팅이 없는 카드 (이유별 TTL)"""
+    conn.execute('''
+    CREATE TABLE card_misses (
+        name_norm TEXT NOT NULL,
+        set_norm TEXT NOT NULL DEFAULT '',
+        number_norm TEXT NOT NULL DEFAULT '',
+        card_name TEXT NOT NULL,
+        reason TEXT NOT NULL,
+        candidates TEXT,
+        url TEXT,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (name_norm, set_norm, number_norm)
+    ) WITHOUT ROWID
+    ''')
+
+
+def _migrate_v5(conn):
+    """
+    가격 이력.
+      - price_observations : 스크래핑마다 리스팅 가격 전부 (card_prices 행 하나 = 스크래핑 1회)
+      - price_daily        : 카드 x 등급 x 날짜별 집계 (min, p25, median, p75, max, count)
+    이력 조회는 price_daily 기본 키 범위 스캔 (WITHOUT ROWID → 인덱스만 읽음).
+    """
+    conn.execute('''
+    CREATE TABLE price_observations (
+        price_id INTEGER NOT NULL REFERENCES card_prices (id),
+        name_norm TEXT NOT NULL,
+        set_norm TEXT NOT NULL DEFAULT '',
+        number_norm TEXT NOT NULL DEFAULT '',
+        grade TEXT NOT NULL,
+        day TEXT NOT NULL,
+        price NUMERIC NOT NULL
+    )
+    ''')
+    # 일별 집계 재계산(카드, 등급, 날짜 → 가격)이 테이블을 읽지 않도록 커버링 인덱스
+    conn.execute('''
+    CREATE INDEX idx_price_observations_card_day
+    ON price_observations (name_norm, set_norm, number_norm, grade, day, price, price_id)
+    ''')
+    conn.execute('''
+    CREATE TABLE price_daily (
+        name_norm TEXT NOT NULL,
+        set_norm TEXT NOT NULL DEFAULT '',
+        number_norm TEXT NOT NULL DEFAULT '',
+        grade TEXT NOT NULL,
+        day TEXT NOT NULL,
+        min_price NUMERIC,
+        p25_price NUMERIC,
+        median_price NUMERIC,
+        p75_price NUMERIC,
+        max_price NUMERIC,
+        listing_count INTEGER NOT NULL,
+        scrape_count INTEGER NOT NULL,
+        PRIMARY KEY (name_norm, set_norm, number_norm, grade, day)
+    ) WITHOUT ROWID
+    ''')
+
+
+def _migrate_v6(conn):
+    """
+    갱신 스케줄러 상태. 카드별 요청 빈도(시간 감쇠)와 마지막 갱신/실패 기록.
+    우선순위 계산은 스케줄러가 매 주기마다 이 테이블 + card_prices 최신 시각으로 수행.
+    """
+    conn.execute('''
+    CREATE TABLE refresh_schedule (
+        name_norm TEXT NOT NULL,
+        set_norm TEXT NOT NULL DEFAULT '',
+        number_norm TEXT NOT NULL DEFAULT '',
+        card_name TEXT NOT NULL,
+        set_name TEXT NOT NULL DEFAULT '',
+        card_number TEXT NOT NULL DEFAULT '',
+        demand REAL NOT NULL DEFAULT 0,
+        last_requested REAL NOT NULL,
+        last_refreshed REAL,
+        failures INTEGER NOT NULL DEFAULT 0,
+        next_attempt REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (name_norm, set_norm, number_norm)
+    ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX idx_refresh_schedule_next ON refresh_schedule (next_attempt)')
+
+
+def _migrate_v7(conn):
+    """
+    스크래핑 작업 큐 (snkrdunk_jobs).
+      status: queued → leased → done | dead (재시도 한도 초과)
+      available_at: queued면 실행 가능 시각(백오프), leased면 임대 만료 시각
+    같은 카드(job_key)는 대기/실행 중인 작업이 하나만 있도록 부분 UNIQUE 인덱스.
+    """
+    conn.execute('''
+    CREATE TABLE scrape_jobs (
+        job_id INTEGER PRIMARY KEY,
+        job_key TEXT NOT NULL,
+        card_name TEXT NOT NULL,
+        set_name TEXT NOT NULL DEFAULT '',
+        card_number TEXT NOT NULL DEFAULT '',
+        priority INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL,
+        available_at REAL NOT NULL,
+        leased_by TEXT,
+        result TEXT,
+        error TEXT,
+        created_at REAL NOT NULL,
+        finished_at REAL
+    )
+    ''')
+    conn.execute('''
+    CREATE UNIQUE INDEX idx_scrape_jobs_pending_key ON scrape_jobs (job_key)
+    WHERE status IN ('queued', 'leased')
+    ''')
+    conn.execute('''
+    CREATE INDEX idx_scrape_jobs_ready ON scrape_jobs (status, priority DESC, available_at)
+    WHERE status IN ('queued', 'leased')
+    ''')
+
+
+def _migrate_v8(conn):
+    """
+    등급별 최신 요약. 리스팅 페이지 한 번에서 나온 모든 등급(PSA 10/9, BGS, CGC, 상태 등급, Raw)을
+    카드마다 한 세트로 보관 → 어느 등급을 조회해도 같은 스크래핑 결과에서 응답.
+    스크래핑할 때마다 카드의 행을 전부 교체 (이번에 리스팅이 없는 등급은 사라짐).
+    """
+    conn.execute('''
+    CREATE TABLE card_grade_prices (
+        name_norm TEXT NOT NULL,
+        set_norm TEXT NOT NULL DEFAULT '',
+        number_norm TEXT NOT NULL DEFAULT '',
+        grade TEXT NOT NULL,
+        price_id INTEGER NOT NULL REFERENCES card_prices (id),
+        min_price NUMERIC NOT NULL,
+        listing_count INTEGER NOT NULL,
+        prices TEXT NOT NULL,
+        url TEXT,
+        scraped_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (name_norm, set_norm, number_norm, grade)
+    ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+    CREATE INDEX idx_card_grade_prices_name ON card_grade_prices (name_norm, price_id)
+    ''')
+
+
+def _migrate_v9(conn):
+    """
+    페이지 스냅샷 색인 (snkrdunk_snapshots). HTML 본문은 디스크에 sha256 이름의 gzip 파일로,
+    여기에는 어떤 조회에서 어떤 페이지를 받았는지만 기록 → 같은 페이지는 한 번만 저장.
+    """
+    conn.execute('''
+    CREATE TABLE page_snapshots (
+        snapshot_id INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        url TEXT NOT NULL,
+        engine TEXT NOT NULL,
+        pokemon_name TEXT NOT NULL DEFAULT '',
+        card_name TEXT NOT NULL DEFAULT '',
+        set_name TEXT NOT NULL DEFAULT '',
+        card_number TEXT NOT NULL DEFAULT '',
+        size INTEGER NOT NULL,
+        captured_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    conn.execute('''
+    CREATE INDEX idx_page_snapshots_kind ON page_snapshots (kind, captured_at)
+    ''')
+    conn.execute('''
+    CREATE INDEX idx_page_snapshots_digest ON page_snapshots (digest)
+    ''')
+
+
+def _migrate_v10(conn):
+    """
+    작업별로 무시할 음성 캐시 이유 (쉼표 구분, 예: 'no_psa10').
+    PSA 10이 없는 카드의 다른 등급을 갱신하는 작업이 no_psa10 기록에 막히지 않도록.
+    """
+    conn.execute("ALTER TABLE scrape_jobs ADD COLUMN ignore_miss TEXT NOT NULL DEFAULT ''")
+
+
+# (버전, 함수) — 새 스키마 변경은 맨 뒤에 추가. 이미 배포된 항목은 수정하지 않음.
+MIGRATIONS = [
+    (1, _migrate_v1),
+    (2, _migrate_v2),
+    (3, _migrate_v3),
+    (4, _migrate_v4),
+    (5, _migrate_v5),
+    (6, _migrate_v6),
+    (7, _migrate_v7),
+    (8, _migrate_v8),
+    (9, _migrate_v9),
+    (10, _migrate_v10),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ──────────────────────────────────────────────────────────────
+# SQL
+# ──────────────────────────────────────────────────────────────
+
+_PRICE_COLUMNS = '''
+    p.card_name, p.psa10_latest_price, p.scraped_at, p.url, p.item_count,
+    p.set_name, p.card_number, p.card_id, p.psa10_average_price
+'''
+
+_SQL_LATEST_EXACT = f'''
+SELECT {_PRICE_COLUMNS} FROM card_prices p
+WHERE p.name_norm = ? AND p.set_norm = ? AND p.number_norm = ?
+  AND p.psa10_latest_price IS NOT NULL
+ORDER BY p.scraped_at DESC LIMIT 1
+'''
+
+_SQL_LATEST_BY_NAME = f'''
+SELECT {_PRICE_COLUMNS} FROM card_prices p
+WHERE p.name_norm = ? AND p.psa10_latest_price IS NOT NULL
+ORDER BY p.scraped_at DESC LIMIT 1
+'''
+
+_SQL_SEARCH_FTS = f'''
+SELECT {_PRICE_COLUMNS} FROM card_prices_fts f
+JOIN card_prices p ON p.id = f.rowid
+WHERE card_prices_fts MATCH ? AND p.psa10_latest_price IS NOT NULL
+ORDER BY p.scraped_at DESC LIMIT ?
+'''
+
+_SQL_SEARCH_LIKE = f'''
+SELECT {_PRICE_COLUMNS} FROM card_prices p
+WHERE p.card_name LIKE ? AND p.psa10_latest_price IS NOT NULL
+ORDER BY p.scraped_at DESC LIMIT ?
+'''
+
+_SQL_INSERT_PRICE = '''
+INSERT INTO card_prices
+    (card_name, set_name, card_number, name_norm, set_norm, number_norm, card_id,
+     psa10_latest_price, psa10_average_price, item_count, url, scraped_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+'''
+
+# 과거 시각으로 저장(스냅샷 재추출)할 때: 같은 시각 행이 이미 있으면 건너뜀 / 더 새 행이 있으면
+# 등급별 최신 요약은 건드리지 않음
+_SQL_PRICE_AT = '''
+SELECT 1 FROM card_prices
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ? AND scraped_at = ?
+LIMIT 1
+'''
+
+_SQL_NEWER_PRICE = '''
+SELECT 1 FROM card_prices
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ? AND scraped_at > ?
+LIMIT 1
+'''
+
+_SQL_CLEAR_GRADES = '''
+DELETE FROM card_grade_prices WHERE name_norm = ? AND set_norm = ? AND number_norm = ?
+'''
+
+_SQL_INSERT_GRADE = '''
+INSERT INTO card_grade_prices
+    (name_norm, set_norm, number_norm, grade, price_id, min_price, listing_count, prices, url,
+     scraped_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+'''
+
+_GRADE_COLUMNS = 'g.grade, g.min_price, g.listing_count, g.prices, g.url, g.scraped_at, p.card_name'
+
+_SQL_GRADES_EXACT = f'''
+SELECT {_GRADE_COLUMNS} FROM card_grade_prices g
+JOIN card_prices p ON p.id = g.price_id
+WHERE g.name_norm = ? AND g.set_norm = ? AND g.number_norm = ?
+'''
+
+# 이름만 일치: 가장 최근에 스크래핑된 카드(price_id 최대) 한 장의 등급들
+_SQL_GRADES_BY_NAME = f'''
+SELECT {_GRADE_COLUMNS} FROM card_grade_prices g
+JOIN card_prices p ON p.id = g.price_id
+WHERE g.name_norm = ? AND g.price_id = (
+    SELECT MAX(price_id) FROM card_grade_prices WHERE name_norm = ?
+)
+'''
+
+_SQL_INSERT_OBSERVATION = '''
+INSERT INTO price_observations (price_id, name_norm, set_norm, number_norm, grade, day, price)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_DAY_OBSERVATIONS = '''
+SELECT price, price_id FROM price_observations
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ? AND grade = ? AND day = ?
+ORDER BY price
+'''
+
+_SQL_SAVE_DAILY = '''
+INSERT OR REPLACE INTO price_daily
+    (name_norm, set_norm, number_norm, grade, day, min_price, p25_price, median_price,
+     p75_price, max_price, listing_count, scrape_count)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_PRICE_HISTORY = '''
+SELECT day, min_price, p25_price, median_price, p75_price, max_price, listing_count, scrape_count
+FROM price_daily
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ? AND grade = ? AND day >= ?
+ORDER BY day
+'''
+
+_SQL_GET_DEMAND = '''
+SELECT demand, last_requested FROM refresh_schedule
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ?
+'''
+
+_SQL_RECORD_REQUEST = '''
+INSERT INTO refresh_schedule
+    (name_norm, set_norm, number_norm, card_name, set_name, card_number, demand, last_requested)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name_norm, set_norm, number_norm) DO UPDATE SET
+    demand = excluded.demand, last_requested = excluded.last_requested
+'''
+
+# 갱신 후보 계획: 카드별 TTL 설정(세트/번호 지정이 이름만 설정보다 우선, 없으면 기본값)과
+# 마지막 스크래핑/갱신 시각으로 staleness(상한 있음)를 계산하고, 음성 캐시에 있는 카드는 제외.
+# demand는 마지막 요청 이후 반감기만큼 감쇠한 값 — 최근 요청이 없는 카드는 점점 밀려나다 빠짐.
+# 우선순위 = staleness × log1p(demand) 순으로 LIMIT개.
+_SQL_REFRESH_PLAN = '''
+SELECT card_name, set_name, card_number, demand, last_requested, last_refreshed, failures,
+       scraped_at, staleness, staleness * log1p(demand) AS priority
+FROM (
+    SELECT c.*,
+           CASE WHEN MAX(COALESCE(c.scraped_at, 0), COALESCE(c.last_refreshed, 0)) > 0
+                THEN MIN(?, MAX(0.0, ? - MAX(COALESCE(c.scraped_at, 0), COALESCE(c.last_refreshed, 0)))
+                            / MAX(c.fresh_ttl, 1))
+                ELSE ? END AS staleness
+    FROM (
+        SELECT s.card_name, s.set_name, s.card_number,
+               s.demand * pow(0.5, MAX(0.0, ? - s.last_requested) / ?) AS demand,
+               s.last_requested, s.last_refreshed, s.failures,
+               (SELECT CAST(strftime('%s', MAX(p.scraped_at)) AS REAL) FROM card_prices p
+                WHERE p.name_norm = s.name_norm AND p.set_norm = s.set_norm
+                  AND p.number_norm = s.number_norm) AS scraped_at,
+               COALESCE((SELECT t.fresh_ttl FROM card_ttls t
+                         WHERE t.name_norm = s.name_norm AND t.set_norm IN (s.set_norm, '')
+                           AND t.number_norm IN (s.number_norm, '')
+                         ORDER BY t.set_norm DESC, t.number_norm DESC LIMIT 1), ?) AS fresh_ttl
+        FROM refresh_schedule s
+        WHERE s.next_attempt <= ?
+          AND NOT EXISTS (SELECT 1 FROM card_misses m
+                          WHERE m.name_norm = s.name_norm AND m.set_norm = s.set_norm
+                            AND m.number_norm = s.number_norm AND m.expires_at > ?)
+    ) c
+    WHERE c.demand >= ?
+)
+WHERE staleness >= ?
+ORDER BY priority DESC
+LIMIT ?
+'''
+
+_SQL_REFRESH_DONE = '''
+UPDATE refresh_schedule SET last_refreshed = ?, failures = 0, next_attempt = 0
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ?
+'''
+
+_SQL_REFRESH_FAILED = '''
+UPDATE refresh_schedule SET failures = failures + 1, next_attempt = ?
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ?
+'''
+
+_SQL_GET_TTL = '''
+SELECT fresh_ttl, max_stale FROM card_ttls
+WHERE name_norm = ? AND set_norm IN (?, '') AND number_norm IN (?, '')
+ORDER BY set_norm DESC, number_norm DESC LIMIT 1
+'''
+
+_SQL_SET_TTL = '''
+INSERT OR REPLACE INTO card_ttls (name_norm, set_norm, number_norm, fresh_ttl, max_stale)
+VALUES (?, ?, ?, ?, ?)
+'''
+
+# 비어 있거나, 끝났거나, 만료된(소유자 사망) 임대만 가져올 수 있음
+_SQL_ACQUIRE_LEASE = '''
+INSERT INTO scrape_leases (lease_key, owner, status, expires_at)
+VALUES (?, ?, 'running', ?)
+ON CONFLICT (lease_key) DO UPDATE SET
+    owner = excluded.owner, status = 'running', expires_at = excluded.expires_at,
+    outcome = NULL, finished_at = NULL
+WHERE scrape_leases.status != 'running' OR scrape_leases.expires_at < ?
+'''
+
+_SQL_GET_LEASE = '''
+SELECT owner, status, expires_at, outcome, finished_at FROM scrape_leases WHERE lease_key = ?
+'''
+
+_SQL_RENEW_LEASE = '''
+UPDATE scrape_leases SET expires_at = ?
+WHERE lease_key = ? AND owner = ? AND status = 'running'
+'''
+
+_SQL_RELEASE_LEASE = '''
+UPDATE scrape_leases SET status = ?, outcome = ?, finished_at = ?
+WHERE lease_key = ? AND owner = ?
+'''
+
+_SQL_GET_MISS = '''
+SELECT card_name, reason, candidates, url, created_at, expires_at FROM card_misses
+WHERE name_norm = ? AND set_norm = ? AND number_norm = ? AND expires_at > ?
+'''
+
+_SQL_SAVE_MISS = '''
+INSERT OR REPLACE INTO card_misses
+    (name_norm, set_norm, number_norm, card_name, reason, candidates, url, created_at, expires_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_CLEAR_MISS = '''
+DELETE FROM card_misses WHERE name_norm = ? AND set_norm = ? AND number_norm = ?
+'''
+
+_SQL_GET_RESOLUTION = '''
+SELECT card_id, card_url, match_score, match_text, verified_at
+FROM card_resolutions WHERE resolution_key = ?
+'''
+
+_SQL_SAVE_RESOLUTION = '''
+INSERT OR REPLACE INTO card_resolutions
+    (resolution_key, card_id, card_url, match_score, match_text, verified_at)
+VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+
+_SQL_TOUCH_RESOLUTION = '''
+UPDATE card_resolutions SET verified_at = CURRENT_TIMESTAMP WHERE resolution_key = ?
+'''
+
+_SQL_DELETE_RESOLUTION = 'DELETE FROM card_resolutions WHERE resolution_key = ?'
+
+_SQL_PENDING_JOB = '''
+SELECT job_id, priority, ignore_miss FROM scrape_jobs
+WHERE job_key = ? AND status IN ('queued', 'leased')
+'''
+
+_SQL_BUMP_JOB = 'UPDATE scrape_jobs SET priority = ? WHERE job_id = ? AND priority < ?'
+
+_SQL_SET_JOB_IGNORE_MISS = 'UPDATE scrape_jobs SET ignore_miss = ? WHERE job_id = ?'
+
+_SQL_INSERT_JOB = '''
+INSERT INTO scrape_jobs
+    (job_key, card_name, set_name, card_number, priority, max_attempts, available_at, created_at,
+     ignore_miss)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# 임대가 만료된 작업 중 재시도 한도를 다 쓴 것 → dead (워커가 실행 중 죽은 경우)
+_SQL_EXPIRE_JOBS = '''
+UPDATE scrape_jobs SET status = 'dead', leased_by = NULL, finished_at = ?,
+    error = COALESCE(error, 'lease expired')
+WHERE status = 'leased' AND available_at < ? AND attempts >= max_attempts
+'''
+
+# 실행 가능한 대기 작업 또는 임대가 만료된 작업 중 우선순위가 가장 높은 것
+_SQL_NEXT_JOB = '''
+SELECT job_id FROM scrape_jobs
+WHERE status IN ('queued', 'leased') AND available_at <= ?
+ORDER BY priority DESC, available_at LIMIT 1
+'''
+
+_SQL_LEASE_JOB = '''
+UPDATE scrape_jobs SET status = 'leased', leased_by = ?, available_at = ?, attempts = attempts + 1
+WHERE job_id = ?
+RETURNING job_id, card_name, set_name, card_number, priority, attempts, max_attempts, ignore_miss
+'''
+
+_SQL_HEARTBEAT_JOB = '''
+UPDATE scrape_jobs SET available_at = ?
+WHERE job_id = ? AND leased_by = ? AND status = 'leased'
+'''
+
+_SQL_ACK_JOB = '''
+UPDATE scrape_jobs SET status = 'done', result = ?, error = NULL, leased_by = NULL, finished_at = ?
+WHERE job_id = ? AND leased_by = ? AND status = 'leased'
+'''
+
+_SQL_FAIL_JOB = '''
+UPDATE scrape_jobs SET
+    status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+    finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END,
+    available_at = ?, error = ?, leased_by = NULL
+WHERE job_id = ? AND leased_by = ? AND status = 'leased'
+RETURNING status
+'''
+
+_SQL_GET_JOB = '''
+SELECT job_id, card_name, set_name, card_number, priority, status, attempts, max_attempts,
+       available_at, leased_by, result, error, created_at, finished_at
+FROM scrape_jobs WHERE job_id = ?
+'''
+
+_SQL_JOB_STATS = 'SELECT status, COUNT(*) FROM scrape_jobs GROUP BY status'
+
+_SQL_DEAD_JOBS = "SELECT job_id, job_key FROM scrape_jobs WHERE status = 'dead' ORDER BY job_id DESC"
+
+_SQL_RETRY_JOB = '''
+UPDATE scrape_jobs SET status = 'queued', attempts = 0, available_at = ?, finished_at = NULL
+WHERE job_id = ?
+'''
+
+_SQL_PURGE_JOBS = "DELETE FROM scrape_jobs WHERE status IN ('done', 'dead') AND finished_at < ?"
+
+
+_SQL_INSERT_SNAPSHOT = '''
+INSERT INTO page_snapshots
+    (kind, digest, url, engine, pokemon_name, card_name, set_name, card_number, size)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+RETURNING snapshot_id, captured_at
+'''
+
+_SNAPSHOT_COLUMNS = '''
+    snapshot_id, kind, digest, url, engine, pokemon_name, card_name, set_name, card_number,
+    size, captured_at
+'''
+
+_SQL_SNAPSHOTS = f'''
+SELECT {_SNAPSHOT_COLUMNS} FROM page_snapshots
+WHERE kind = ? AND captured_at >= ? AND captured_at < ?
+ORDER BY captured_at, snapshot_id
+'''
+
+_SQL_SNAPSHOT_STATS = '''
+SELECT kind, COUNT(*), COUNT(DISTINCT digest), SUM(size), MIN(captured_at), MAX(captured_at)
+FROM page_snapshots GROUP BY kind
+'''
+
+_SQL_EXPIRED_DIGESTS = '''
+SELECT DISTINCT digest FROM page_snapshots WHERE captured_at < ?
+'''
+
+_SQL_PURGE_SNAPSHOTS = 'DELETE FROM page_snapshots WHERE captured_at < ?'
+
+_SQL_SNAPSHOT_DIGESTS = 'SELECT DISTINCT digest FROM page_snapshots'
+
+
+def _price_row(row) -> dict | None:
+    if not row:
+        return None
+    return {
+        'card_name':           row[0],
+        'psa10_latest_price':  row[1],
+        'scraped_at':          row[2],
+        'url':                 row[3],
+        'item_count':          row[4],
+        'set_name':            row[5],
+        'card_number':         row[6],
+        'card_id':             row[7],
+        'psa10_average_price': row[8],
+    }
+
+
+def _percentile(sorted_values: list, q: float):
+    """정렬된 목록의 q 분위수 (선형 보간)"""
+    if not sorted_values:
+        return None
+    pos = (len(sorted_values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    value = sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+    return round(value, 2)
+
+
+def _daily_rollup(observations: list[tuple]) -> dict:
+    """하루치 (price, price_id) 목록 → 집계. listing_count는 스크래핑 1회당 최대 리스팅 수."""
+    prices = [row[0] for row in observations]
+    per_scrape = {}
+    for _, price_id in observations:
+        per_scrape[price_id] = per_scrape.get(price_id, 0) + 1
+    return {
+        'min':           prices[0],
+        'p25':           _percentile(prices, 0.25),
+        'median':        _percentile(prices, 0.5),
+        'p75':           _percentile(prices, 0.75),
+        'max':           prices[-1],
+        'listing_count': max(per_scrape.values()),
+        'scrape_count':  len(per_scrape),
+    }
+
+
+def _card_id(url: str | None) -> str | None:
+    match = re.search(r'/trading-cards/(\d+)', url or '')
+    return match.group(1) if match else None
+
+
+def _split_reasons(text: str | None) -> tuple:
+    """scrape_jobs.ignore_miss ('no_psa10,...') → ('no_psa10', ...)"""
+    return tuple(r for r in (text or '').split(',') if r)
+
+
+def _join_reasons(reasons) -> str:
+    return ','.join(sorted(set(reasons)))
+
+
+# ──────────────────────────────────────────────────────────────
+# 저장소
+# ──────────────────────────────────────────────────────────────
+
+class Storage:
+    """
+    snkrdunk.db 접근 객체. 스레드마다 커넥션 하나를 열어 프로세스 수명 동안 재사용.
+    """
+
+    def __init__(self, path: str = DB_NAME):
+        self.path = path
+        self._local = threading.local()
+        self._migrate_lock = threading.Lock()
+        self._migrated = False
+        self._has_fts = False
+
+    # ── 커넥션 ──
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   cached_statements=256)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            conn.create_function('log1p', 1, math.log1p, deterministic=True)
+            conn.create_function('pow', 2, math.pow, deterministic=True)
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn):
+        with self._migrate_lock:
+            if self._migrated:
+                return
+            self.migrate(conn)
+            self._has_fts = bool(conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'card_prices_fts'"
+            ).fetchone())
+            self._migrated = True
+
+    def migrate(self, conn: sqlite3.Connection | None = None):
+        """아직 적용되지 않은 마이그레이션을 순서대로 적용 (다른 프로세스와 동시 실행 안전)"""
+        conn = conn or self.conn
+        if conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            for target, migration in MIGRATIONS:
+                if target > version:
+                    print(f"🗄️ DB 마이그레이션 v{version} → v{target}", file=sys.stderr)
+                    migration(conn)
+                    conn.execute(f'PRAGMA user_version = {target}')
+                    version = target
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ── 가격 ──
+
+    def latest_price(self, card_name: str, set_name: str = '', card_number: str = '') -> dict | None:
+        """
+        최신 가격 행 조회.
+          1. (이름, 세트, 번호) 정확히 일치
+          2. 이름만 일치
+          3. FTS5 부분 문자열 검색 (FTS 없으면 LIKE)
+        """
+        conn = self.conn
+        name_norm = normalize(card_name)
+
+        if set_name or card_number:
+            row = conn.execute(_SQL_LATEST_EXACT,
+                               (name_norm, normalize(set_name), normalize(card_number))).fetchone()
+            if row:
+                return _price_row(row)
+
+        row = conn.execute(_SQL_LATEST_BY_NAME, (name_norm,)).fetchone()
+        if row:
+            return _price_row(row)
+
+        matches = self.search_prices(card_name, limit=1)
+        return matches[0] if matches else None
+
+    def search_prices(self, query: str, limit: int = 10) -> list[dict]:
+        """이름 부분 문자열 검색 (대소문자 무시), 최신순"""
+        query = (query or '').strip()
+        if not query:
+            return []
+        # trigram 토크나이저는 3글자 이상부터 인덱스 사용 가능
+        if self._has_fts and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self.conn.execute(_SQL_SEARCH_FTS, (phrase, limit)).fetchall()
+        else:
+            rows = self.conn.execute(_SQL_SEARCH_LIKE, (f'%{query}%', limit)).fetchall()
+        return [_price_row(row) for row in rows]
+
+    def save_prices(self, rows: list[dict], grade: str = PSA10_GRADE):
+        """
+        가격 여러 건 일괄 저장 (트랜잭션 1회).
+        rows: [{'card_name', 'price', 'url', 'item_count', 'set_name', 'card_number',
+                'average_price', 'all_prices', 'grades'}, ...]
+
+        all_prices가 있으면 리스팅 가격을 price_observations에 모두 기록하고
+        (executemany) 해당 날짜의 price_daily 집계를 갱신. average_price가 없으면 평균으로 채움.
+        grades({'PSA 9': {'price', 'count', 'all_prices'}, ...})가 있으면 카드의 등급별 요약을
+        교체하고, 관측값/일별 집계도 등급마다 기록 (이때 grade 인자는 쓰지 않음).
+        price가 None인 행(PSA 10 리스팅 없음)은 최신가 조회에서 제외됨.
+        scraped_at('YYYY-MM-DD HH:MM:SS', UTC)이 있으면 그 시각/날짜로 기록 (스냅샷 재추출 백필):
+        같은 카드의 같은 시각 행이 이미 있으면 건너뛰고, 더 새 행이 있으면 등급별 최신 요약은 유지.
+        """
+        conn = self.conn
+        today = conn.execute("SELECT date('now')").fetchone()[0]
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            observations = []
+            touched = set()
+            for row in rows:
+                all_prices = row.get('all_prices') or []
+                average = row.get('average_price')
+                if average is None and all_prices:
+                    average = round(sum(all_prices) / len(all_prices), 2)
+                key = (normalize(row['card_name']), normalize(row.get('set_name')),
+                       normalize(row.get('card_number')))
+                scraped_at = row.get('scraped_at')
+                if scraped_at and conn.execute(_SQL_PRICE_AT, (*key, scraped_at)).fetchone():
+                    continue
+                day = str(scraped_at)[:10] if scraped_at else today
+                cursor = conn.execute(_SQL_INSERT_PRICE, (
+                    row['card_name'], row.get('set_name') or '', row.get('card_number') or '',
+                    *key, _card_id(row.get('url')), row.get('price'), average,
+                    row.get('item_count') or 0, row.get('url'), scraped_at))
+                price_id = cursor.lastrowid
+
+                grades = row.get('grades')
+                if grades:
+                    if not (scraped_at and conn.execute(_SQL_NEWER_PRICE, (*key, scraped_at)).fetchone()):
+                        conn.execute(_SQL_CLEAR_GRADES, key)
+                        conn.executemany(_SQL_INSERT_GRADE, [
+                            (*key, label, price_id, summary['price'], summary['count'],
+                             json.dumps(summary['all_prices']), row.get('url'), scraped_at)
+                            for label, summary in grades.items()])
+                    per_grade = {label: summary['all_prices'] for label, summary in grades.items()}
+                else:
+                    per_grade = {grade: all_prices}
+
+                for label, prices in per_grade.items():
+                    if prices:
+                        observations.extend((price_id, *key, label, day, price) for price in prices)
+                        touched.add((key, label, day))
+
+            if observations:
+                conn.executemany(_SQL_INSERT_OBSERVATION, observations)
+                for key, label, day in touched:
+                    self._refresh_daily(conn, key, label, day)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def save_price(self, card_name, price, url, item_count,
+                   set_name='', card_number='', average_price=None, all_prices=None, grades=None):
+        self.save_prices([{
+            'card_name': card_name, 'price': price, 'url': url, 'item_count': item_count,
+            'set_name': set_name, 'card_number': card_number, 'average_price': average_price,
+            'all_prices': all_prices, 'grades': grades,
+        }])
+
+    def latest_grades(self, card_name: str, set_name: str = '', card_number: str = '') -> dict | None:
+        """
+        마지막 스크래핑의 등급별 요약.
+          1. (이름, 세트, 번호) 정확히 일치
+          2. 이름만 일치 (가장 최근 카드)
+        반환: {'card_name', 'scraped_at', 'url',
+               'grades': {'PSA 9': {'price', 'count', 'all_prices'}, ...}}
+        """
+        conn = self.conn
+        name_norm = normalize(card_name)
+        rows = []
+        if set_name or card_number:
+            rows = conn.execute(_SQL_GRADES_EXACT,
+                                (name_norm, normalize(set_name), normalize(card_number))).fetchall()
+        if not rows:
+            rows = conn.execute(_SQL_GRADES_BY_NAME, (name_norm, name_norm)).fetchall()
+        if not rows:
+            return None
+        return {
+            'card_name':  rows[0][6],
+            'scraped_at': rows[0][5],
+            'url':        rows[0][4],
+            'grades': {
+                row[0]: {'price': row[1], 'count': row[2], 'all_prices': json.loads(row[3])}
+                for row in rows
+            },
+        }
+
+    # ── 가격 이력 ──
+
+    @staticmethod
+    def _refresh_daily(conn, key: tuple, grade: str, day: str):
+        """(카드, 등급, 날짜) 하나의 집계를 원본 관측값으로 다시 계산 (커버링 인덱스만 읽음)"""
+        observations = conn.execute(_SQL_DAY_OBSERVATIONS, (*key, grade, day)).fetchall()
+        if not observations:
+            return
+        rollup = _daily_rollup(observations)
+        conn.execute(_SQL_SAVE_DAILY, (
+            *key, grade, day, rollup['min'], rollup['p25'], rollup['median'], rollup['p75'],
+            rollup['max'], rollup['listing_count'], rollup['scrape_count']))
+
+    def price_history(self, card_name, set_name='', card_number='',
+                      grade: str = PSA10_GRADE, days: int = 90) -> list[dict]:
+        """일별 집계 (오래된 날짜부터). days일 전까지."""
+        since = self.conn.execute("SELECT date('now', ?)", (f'-{int(days)} days',)).fetchone()[0]
+        rows = self.conn.execute(_SQL_PRICE_HISTORY, (
+            normalize(card_name), normalize(set_name), normalize(card_number), grade, since,
+        )).fetchall()
+        return [{
+            'day':           row[0],
+            'min':           row[1],
+            'p25':           row[2],
+            'median':        row[3],
+            'p75':           row[4],
+            'max':           row[5],
+            'listing_count': row[6],
+            'scrape_count':  row[7],
+        } for row in rows]
+
+    # ── 갱신 스케줄 ──
+
+    def record_request(self, card_name, set_name='', card_number='', half_life: float = 7 * 86400):
+        """
+        사용자 조회 1회 기록 (스케줄러의 인기도 가중치).
+        demand = 이전 demand를 half_life 반감기로 감쇠한 값 + 1
+        """
+        key = (normalize(card_name), normalize(set_name), normalize(card_number))
+        now = time.time()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(_SQL_GET_DEMAND, key).fetchone()
+            demand = 1.0
+            if row:
+                demand += row[0] * 0.5 ** (max(0.0, now - row[1]) / half_life)
+            conn.execute(_SQL_RECORD_REQUEST, (*key, card_name, set_name or '', card_number or '',
+                                               demand, now))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def refresh_plan(self, limit: int, fresh_ttl: float, refresh_at: float,
+                     max_staleness: float, half_life: float, min_demand: float) -> list[dict]:
+        """
+        재시도 대기 중이 아니고 음성 캐시에 없는 스케줄 항목 중 staleness >= refresh_at인 것을
+        우선순위(staleness × log1p(demand)) 순으로 최대 limit개.
+          fresh_ttl     : TTL 설정이 없는 카드의 기본값
+          max_staleness : staleness 상한 (스크래핑 기록이 없는 카드도 이 값)
+          half_life     : demand를 마지막 요청 이후 이 반감기로 감쇠해서 사용 (반환값도 감쇠된 값)
+          min_demand    : 감쇠된 demand가 이보다 작으면 제외
+        """
+        now = time.time()
+        rows = self.conn.execute(_SQL_REFRESH_PLAN, (
+            max_staleness, now, max_staleness, now, max(half_life, 1), fresh_ttl, now, now,
+            min_demand, refresh_at, limit)).fetchall()
+        return [{
+            'card_name':      row[0],
+            'set_name':       row[1],
+            'card_number':    row[2],
+            'demand':         row[3],
+            'last_requested': row[4],
+            'last_refreshed': row[5],
+            'failures':       row[6],
+            'scraped_at':     row[7],
+            'staleness':      row[8],
+            'priority':       row[9],
+        } for row in rows]
+
+    def mark_refreshed(self, card_name, set_name='', card_number=''):
+        self.conn.execute(_SQL_REFRESH_DONE, (time.time(), normalize(card_name),
+                                              normalize(set_name), normalize(card_number)))
+
+    def mark_refresh_failed(self, card_name, set_name='', card_number='', retry_in: float = 60):
+        self.conn.execute(_SQL_REFRESH_FAILED, (time.time() + retry_in, normalize(card_name),
+                                                normalize(set_name), normalize(card_number)))
+
+    # ── 카드별 TTL ──
+
+    def get_ttl(self, card_name, set_name='', card_number='') -> tuple[int, int | None] | None:
+        """
+        (fresh_ttl, max_stale) 초 단위. (이름, 세트, 번호) 설정이 이름만 설정보다 우선.
+        설정이 없으면 None.
+        """
+        row = self.conn.execute(_SQL_GET_TTL, (normalize(card_name), normalize(set_name),
+                                               normalize(card_number))).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set_ttl(self, card_name, fresh_ttl: int, max_stale: int | None = None,
+                set_name='', card_number=''):
+        """세트/번호를 비우면 해당 이름의 모든 카드에 적용"""
+        self.conn.execute(_SQL_SET_TTL, (normalize(card_name), normalize(set_name),
+                                         normalize(card_number), fresh_ttl, max_stale))
+
+    # ── 음성 캐시 ──
+
+    def get_miss(self, card_name, set_name='', card_number='') -> dict | None:
+        """만료되지 않은 미발견 기록. 없으면 None."""
+        now = time.time()
+        row = self.conn.execute(_SQL_GET_MISS, (normalize(card_name), normalize(set_name),
+                                                normalize(card_number), now)).fetchone()
+        if not row:
+            return None
+        return {
+            'card_name':  row[0],
+            'reason':     row[1],
+            'candidates': json.loads(row[2]) if row[2] else [],
+            'url':        row[3],
+            'created_at': row[4],
+            'expires_in': int(row[5] - now),
+        }
+
+    def save_miss(self, card_name, set_name, card_number, reason: str,
+                  candidates: list | None, url: str | None, ttl: int):
+        """reason: 'not_found' | 'no_psa10'. 같은 카드의 이전 기록은 덮어씀."""
+        now = time.time()
+        self.conn.execute(_SQL_SAVE_MISS, (normalize(card_name), normalize(set_name),
+                                           normalize(card_number), card_name, reason,
+                                           json.dumps(candidates or [], ensure_ascii=False),
+                                           url, now, now + ttl))
+
+    def clear_miss(self, card_name, set_name='', card_number=''):
+        self.conn.execute(_SQL_CLEAR_MISS, (normalize(card_name), normalize(set_name),
+                                            normalize(card_number)))
+
+    # ── 스크래핑 임대 (single-flight) ──
+
+    def acquire_lease(self, key: str, owner: str, ttl: float) -> bool:
+        """임대를 가져오면 True. 다른 소유자가 실행 중(만료 전)이면 False."""
+        now = time.time()
+        cursor = self.conn.execute(_SQL_ACQUIRE_LEASE, (key, owner, now + ttl, now))
+        return cursor.rowcount > 0
+
+    def get_lease(self, key: str) -> dict | None:
+        row = self.conn.execute(_SQL_GET_LEASE, (key,)).fetchone()
+        if not row:
+            return None
+        return {
+            'owner':       row[0],
+            'status':      row[1],
+            'expires_at':  row[2],
+            'outcome':     row[3],
+            'finished_at': row[4],
+        }
+
+    def renew_lease(self, key: str, owner: str, ttl: float) -> bool:
+        """실행 중인 임대 연장. 이미 다른 소유자에게 넘어갔으면 False."""
+        cursor = self.conn.execute(_SQL_RENEW_LEASE, (time.time() + ttl, key, owner))
+        return cursor.rowcount > 0
+
+    def release_lease(self, key: str, owner: str, status: str, outcome: str | None = None):
+        """status: 'done' | 'failed'. 이미 다른 소유자에게 넘어간 임대는 건드리지 않음."""
+        self.conn.execute(_SQL_RELEASE_LEASE, (status, outcome, time.time(), key, owner))
+
+    # ── 카드 URL 캐시 ──
+
+    def get_resolution(self, card_name, set_name, card_number) -> dict | None:
+        row = self.conn.execute(_SQL_GET_RESOLUTION,
+                                (resolution_key(card_name, set_name, card_number),)).fetchone()
+        if not row:
+            return None
+        return {
+            'card_id':     row[0],
+            'card_url':    row[1],
+            'match_score': row[2],
+            'match_text':  row[3],
+            'verified_at': row[4],
+        }
+
+    def save_resolution(self, card_name, set_name, card_number, card_url, match_score, match_text):
+        self.conn.execute(_SQL_SAVE_RESOLUTION,
+                          (resolution_key(card_name, set_name, card_number), _card_id(card_url),
+                           card_url, match_score, match_text))
+
+    def touch_resolution(self, card_name, set_name, card_number):
+        self.conn.execute(_SQL_TOUCH_RESOLUTION, (resolution_key(card_name, set_name, card_number),))
+
+    def invalidate_resolution(self, card_name, set_name, card_number):
+        self.conn.execute(_SQL_DELETE_RESOLUTION, (resolution_key(card_name, set_name, card_number),))
+
+
+    # ── 스크래핑 작업 큐 ──
+
+    def enqueue_job(self, card_name, set_name='', card_number='', priority: int = 0,
+                    max_attempts: int = 3, delay: float = 0, ignore_miss_reasons=()) -> int:
+        """
+        작업 추가 후 job_id 반환. 같은 카드가 이미 대기/실행 중이면 새로 만들지 않고
+        그 작업의 id를 반환 (priority가 더 높으면 올려 주고, ignore_miss_reasons는 합침).
+        """
+        key = resolution_key(card_name, set_name, card_number)
+        now = time.time()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(_SQL_PENDING_JOB, (key,)).fetchone()
+            if row:
+                job_id = row[0]
+                conn.execute(_SQL_BUMP_JOB, (priority, job_id, priority))
+                merged = _join_reasons({*_split_reasons(row[2]), *ignore_miss_reasons})
+                if merged != row[2]:
+                    conn.execute(_SQL_SET_JOB_IGNORE_MISS, (merged, job_id))
+            else:
+                job_id = conn.execute(_SQL_INSERT_JOB, (
+                    key, card_name, set_name or '', card_number or '', priority, max_attempts,
+                    now + delay, now, _join_reasons(ignore_miss_reasons))).lastrowid
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return job_id
+
+    def claim_job(self, owner: str, lease_ttl: float) -> dict | None:
+        """
+        실행할 작업 하나를 임대 (우선순위 → 대기 시간 순). 없으면 None.
+        임대가 만료된 작업(워커 사망)도 다시 가져오며, 재시도 한도를 넘은 것은 dead 처리.
+        """
+        now = time.time()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(_SQL_EXPIRE_JOBS, (now, now))
+            row = conn.execute(_SQL_NEXT_JOB, (now,)).fetchone()
+            job = None
+            if row:
+                job = conn.execute(_SQL_LEASE_JOB, (owner, now + lease_ttl, row[0])).fetchone()
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if not job:
+            return None
+        return {
+            'job_id':       job[0],
+            'card_name':    job[1],
+            'set_name':     job[2],
+            'card_number':  job[3],
+            'priority':     job[4],
+            'attempts':     job[5],
+            'max_attempts': job[6],
+            'ignore_miss_reasons': _split_reasons(job[7]),
+        }
+
+    def heartbeat_job(self, job_id: int, owner: str, lease_ttl: float) -> bool:
+        """임대 연장. 이미 다른 워커에게 넘어갔으면 False."""
+        cursor = self.conn.execute(_SQL_HEARTBEAT_JOB, (time.time() + lease_ttl, job_id, owner))
+        return cursor.rowcount > 0
+
+    def ack_job(self, job_id: int, owner: str, result: dict | None = None) -> bool:
+        cursor = self.conn.execute(_SQL_ACK_JOB, (
+            json.dumps(result, ensure_ascii=False) if result is not None else None,
+            time.time(), job_id, owner))
+        return cursor.rowcount > 0
+
+    def fail_job(self, job_id: int, owner: str, error: str, retry_in: float = 60) -> str | None:
+        """
+        실패 기록. 재시도가 남았으면 retry_in초 뒤 다시 'queued', 아니면 'dead'.
+        바뀐 status 반환 (임대를 잃었으면 None).
+        """
+        now = time.time()
+        row = self.conn.execute(_SQL_FAIL_JOB, (now, now + retry_in, error, job_id,
+                                                owner)).fetchone()
+        return row[0] if row else None
+
+    def get_job(self, job_id: int) -> dict | None:
+        row = self.conn.execute(_SQL_GET_JOB, (job_id,)).fetchone()
+        if not row:
+            return None
+        return {
+            'job_id':       row[0],
+            'card_name':    row[1],
+            'set_name':     row[2],
+            'card_number':  row[3],
+            'priority':     row[4],
+            'status':       row[5],
+            'attempts':     row[6],
+            'max_attempts': row[7],
+            'available_at': row[8],
+            'leased_by':    row[9],
+            'result':       json.loads(row[10]) if row[10] else None,
+            'error':        row[11],
+            'created_at':   row[12],
+            'finished_at':  row[13],
+        }
+
+    def job_stats(self) -> dict:
+        """status별 작업 수"""
+        stats = {'queued': 0, 'leased': 0, 'done': 0, 'dead': 0}
+        stats.update(dict(self.conn.execute(_SQL_JOB_STATS).fetchall()))
+        return stats
+
+    def retry_dead_jobs(self) -> int:
+        """dead 작업을 다시 대기열로 (카드별 최신 작업 하나, 이미 대기 중인 카드는 제외)"""
+        now = time.time()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            seen = set()
+            retried = 0
+            for job_id, key in conn.execute(_SQL_DEAD_JOBS).fetchall():
+                if key in seen:
+                    continue
+                seen.add(key)
+                if conn.execute(_SQL_PENDING_JOB, (key,)).fetchone():
+                    continue
+                conn.execute(_SQL_RETRY_JOB, (now, job_id))
+                retried += 1
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return retried
+
+    def purge_jobs(self, older_than: float = 7 * 86400) -> int:
+        """끝난(done/dead) 작업 중 older_than초보다 오래된 것 삭제"""
+        cursor = self.conn.execute(_SQL_PURGE_JOBS, (time.time() - older_than,))
+        return cursor.rowcount
+
+    # ── 페이지 스냅샷 (snkrdunk_snapshots) ──
+
+    def record_snapshot(self, kind: str, digest: str, url: str, size: int, engine: str,
+                        pokemon_name='', card_name='', set_name='', card_number='') -> dict:
+        """스냅샷 1건 색인. 반환: {'snapshot_id', 'captured_at'}"""
+        row = self.conn.execute(_SQL_INSERT_SNAPSHOT, (
+            kind, digest, url, engine, pokemon_name or '', card_name or '', set_name or '',
+            card_number or '', size)).fetchone()
+        return {'snapshot_id': row[0], 'captured_at': row[1]}
+
+    def snapshots(self, kind: str, since: str = '', until: str = '') -> list[dict]:
+        """kind('search' | 'listing') 스냅샷 목록, 오래된 것부터. since/until: 'YYYY-MM-DD[ HH:MM:SS]'"""
+        # '9999'처럼 숫자로 보이는 값은 TIMESTAMP(NUMERIC) 열과 비교할 때 숫자로 바뀌므로 날짜 형식으로
+        rows = self.conn.execute(_SQL_SNAPSHOTS, (kind, since or '', until or '9999-12-31')).fetchall()
+        return [{
+            'snapshot_id':  row[0],
+            'kind':         row[1],
+            'digest':       row[2],
+            'url':          row[3],
+            'engine':       row[4],
+            'pokemon_name': row[5],
+            'card_name':    row[6],
+            'set_name':     row[7],
+            'card_number':  row[8],
+            'size':         row[9],
+            'captured_at':  row[10],
+        } for row in rows]
+
+    def snapshot_stats(self) -> dict:
+        """kind별 {'count', 'pages'(고유 본문 수), 'bytes'(원본 크기 합), 'first', 'last'}"""
+        return {row[0]: {'count': row[1], 'pages': row[2], 'bytes': row[3],
+                         'first': row[4], 'last': row[5]}
+                for row in self.conn.execute(_SQL_SNAPSHOT_STATS)}
+
+    def purge_snapshots(self, older_than_days: float) -> tuple[int, set[str]]:
+        """
+        older_than_days일보다 오래된 색인 삭제.
+        반환: (삭제한 행 수, 더 이상 어떤 스냅샷도 가리키지 않는 digest — 본문 파일 삭제 대상)
+        """
+        conn = self.conn
+        cutoff = conn.execute("SELECT datetime('now', ?)",
+                              (f'-{float(older_than_days)} days',)).fetchone()[0]
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            expired = {row[0] for row in conn.execute(_SQL_EXPIRED_DIGESTS, (cutoff,))}
+            deleted = conn.execute(_SQL_PURGE_SNAPSHOTS, (cutoff,)).rowcount
+            remaining = {row[0] for row in conn.execute(_SQL_SNAPSHOT_DIGESTS)}
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return deleted, expired - remaining
+
+    def snapshot_digests(self) -> set[str]:
+        """색인이 가리키는 모든 digest (고아 본문 파일 정리용)"""
+        return {row[0] for row in self.conn.execute(_SQL_SNAPSHOT_DIGESTS)}
+
+
+_storages: dict[str, Storage] = {}
+_storages_lock = threading.Lock()
+
+
+def get_storage(path: str | None = None) -> Storage:
+    """경로별 Storage 싱글턴"""
+    path = path or DB_NAME
+    with _storages_lock:
+        storage = _storages.get(path)
+        if storage is None:
+            storage = _storages[path] = Storage(path)
+        return storage
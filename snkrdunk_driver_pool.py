@@ -0,0 +1,351 @@
+"""
+SNKRDUNK WebDriver 풀
+=====================================
+조회마다 Chrome을 새로 띄우는 대신, 미리 만든 드라이버를 재사용.
+
+  - size        : 동시에 유지할 최대 드라이버 수
+  - checkout    : 유휴 드라이버를 빌려감 (없으면 생성, 꽉 차면 대기)
+  - checkin     : 쿠키/스토리지 초기화 후 반납
+  - health check: 빌려주기 전 세션이 살아있는지 확인
+  - recycle     : N 페이지 로드 또는 RSS 상한 초과 시 종료 후 재생성
+  - prewarm     : 워커 기동 시 드라이버를 미리 띄워 첫 요청이 Chrome 기동을 기다리지 않게 함
+
+사용 예시:
+  from snkrdunk_driver_pool import DriverPool
+  from snkrdunk_psa10_scraper import get_cheapest_psa10
+
+  pool = DriverPool(size=2)
+  result = get_cheapest_psa10("GENGAR-HOLO", "POKEMON JAPANESE FOSSIL", "94", pool=pool)
+  pool.close()
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from snkrdunk_psa10_scraper import SNKRDUNK_BASE_URL, _build_driver, resolve_chromedriver
+
+
+DEFAULT_POOL_SIZE = int(os.environ.get('SNKRDUNK_POOL_SIZE', '2'))
+DEFAULT_MAX_PAGES = int(os.environ.get('SNKRDUNK_POOL_MAX_PAGES', '50'))
+DEFAULT_MAX_RSS_MB = int(os.environ.get('SNKRDUNK_POOL_MAX_RSS_MB', '1024'))
+
+
+class PoolTimeout(Exception):
+    """checkout 대기 시간 초과"""
+
+
+# ──────────────────────────────────────────────────────────────
+# 프로세스 메모리 (RSS) 측정
+# ──────────────────────────────────────────────────────────────
+
+def _process_tree_rss_mb(root_pid: int) -> float | None:
+    """
+    chromedriver 프로세스와 그 자식(Chrome 본체, 렌더러 등)의 RSS 합계(MB).
+    /proc 가 없는 환경(macOS, Windows)에서는 None.
+    """
+    if not root_pid or not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+            # comm 필드에 공백/괄호가 들어갈 수 있으므로 마지막 ')' 이후로 파싱
+            ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f'/proc/{pid}/statm', 'r') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            pass
+        stack.extend(children.get(pid, []))
+
+    return total / (1024 * 1024)
+
+
+def _driver_pid(driver) -> int | None:
+    try:
+        return driver.service.process.pid
+    except Exception:
+        return None
+
+
+# ──────────────────────────────────────────────────────────────
+# 드라이버 풀
+# ──────────────────────────────────────────────────────────────
+
+class _PoolEntry:
+    __slots__ = ('driver', 'pages', 'jobs', 'created_at')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.jobs = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """
+    스레드 안전한 Chrome WebDriver 풀.
+
+    Args:
+        size       : 최대 드라이버 수
+        headless   : headless 모드 여부
+        max_pages  : 드라이버 하나가 로드할 수 있는 최대 페이지 수 (초과 시 재생성)
+        max_rss_mb : 드라이버 프로세스 트리의 RSS 상한 (초과 시 재생성, 0이면 무시)
+        factory    : 드라이버 생성 함수 (기본값: _build_driver)
+    """
+
+    def __init__(self,
+                 size: int | None = None,
+                 headless: bool = True,
+                 max_pages: int | None = None,
+                 max_rss_mb: int | None = None,
+                 factory=None):
+        self.size = size or DEFAULT_POOL_SIZE
+        self.headless = headless
+        self.max_pages = DEFAULT_MAX_PAGES if max_pages is None else max_pages
+        self.max_rss_mb = DEFAULT_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self._factory = factory or (lambda: _build_driver(headless=self.headless))
+
+        self._cond = threading.Condition()
+        self._idle: list[_PoolEntry] = []
+        self._busy: dict[int, _PoolEntry] = {}
+        self._total = 0
+        self._closed = False
+        self._recycled = 0
+        self._prewarmed = 0
+
+    # ── 내부 헬퍼 ──
+
+    def _create(self) -> _PoolEntry:
+        driver = self._factory()
+        entry = _PoolEntry(driver)
+        _count_page_loads(driver, entry)
+        return entry
+
+    def _destroy(self, entry: _PoolEntry):
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
+
+    def _is_healthy(self, entry: _PoolEntry) -> bool:
+        try:
+            process = entry.driver.service.process
+            if process is not None and process.poll() is not None:
+                return False
+        except Exception:
+            pass
+        try:
+            return entry.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _needs_recycle(self, entry: _PoolEntry) -> bool:
+        if self.max_pages and entry.pages >= self.max_pages:
+            print(f"♻️ 드라이버 재생성 (페이지 {entry.pages}회 로드)")
+            return True
+        if self.max_rss_mb:
+            rss = _process_tree_rss_mb(_driver_pid(entry.driver))
+            if rss is not None and rss >= self.max_rss_mb:
+                print(f"♻️ 드라이버 재생성 (RSS {rss:.0f}MB)")
+                return True
+        return False
+
+    def _reset(self, entry: _PoolEntry):
+        """다음 작업에 이전 세션 상태가 남지 않도록 정리"""
+        driver = entry.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        try:
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': SNKRDUNK_BASE_URL,
+                'storageTypes': 'cookies,local_storage,session_storage,indexeddb,cache_storage',
+            })
+        except Exception:
+            pass
+        driver.execute_script("window.location.href = 'about:blank';")
+
+    # ── 공개 API ──
+
+    def checkout(self, timeout: float | None = None):
+        """
+        드라이버를 빌려감. 유휴 드라이버가 없고 풀이 꽉 찼으면 반납될 때까지 대기.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            entry = None
+            create = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError('DriverPool is closed')
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._total < self.size:
+                        self._total += 1
+                        create = True
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise PoolTimeout(f'No driver available within {timeout}s')
+                    self._cond.wait(remaining)
+
+            if create:
+                try:
+                    entry = self._create()
+                except Exception:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(entry):
+                print("⚠️ 비정상 드라이버 폐기 후 재생성")
+                self._destroy(entry)
+                with self._cond:
+                    self._total -= 1
+                    self._recycled += 1
+                continue
+
+            entry.jobs += 1
+            with self._cond:
+                self._busy[id(entry.driver)] = entry
+            return entry.driver
+
+    def checkin(self, driver, discard: bool = False):
+        """
+        드라이버 반납. discard=True 이거나 재생성 조건에 걸리면 종료.
+        """
+        with self._cond:
+            entry = self._busy.pop(id(driver), None)
+        if entry is None:
+            raise ValueError('Driver does not belong to this pool')
+
+        if not discard and not self._closed:
+            discard = self._needs_recycle(entry)
+        if not discard and not self._closed:
+            try:
+                self._reset(entry)
+            except Exception as e:
+                print(f"⚠️ 드라이버 초기화 실패, 폐기: {e}")
+                discard = True
+
+        if discard or self._closed:
+            self._destroy(entry)
+            with self._cond:
+                self._total -= 1
+                self._recycled += 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def prewarm(self, count: int | None = None) -> int:
+        """
+        드라이버를 count개(기본값: size)까지 미리 띄워 빈 페이지를 로드한 뒤 유휴 목록에 넣음.
+        그동안 들어온 checkout은 준비된 드라이버를 기다림. 새로 띄운 개수 반환.
+        """
+        count = self.size if count is None else min(count, self.size)
+        resolve_chromedriver()
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or self._total >= count:
+                    break
+                self._total += 1
+            entry = None
+            try:
+                entry = self._create()
+                entry.driver.get('about:blank')
+                entry.pages = 0
+            except Exception as e:
+                print(f"⚠️ 드라이버 예열 실패: {e}")
+                if entry is not None:
+                    self._destroy(entry)
+                with self._cond:
+                    self._total -= 1
+                    self._cond.notify()
+                break
+            with self._cond:
+                closed = self._closed
+                if closed:
+                    # 기동하는 동안 close()됨 → 유휴 목록에 넣지 않고 종료
+                    self._total -= 1
+                else:
+                    self._idle.append(entry)
+                    self._prewarmed += 1
+                self._cond.notify()
+            if closed:
+                self._destroy(entry)
+                break
+            started += 1
+        return started
+
+    @contextmanager
+    def driver(self, timeout: float | None = None):
+        """with pool.driver() as driver: ... 형태로 빌리고 자동 반납"""
+        driver = self.checkout(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'size':      self.size,
+                'total':     self._total,
+                'idle':      len(self._idle),
+                'busy':      len(self._busy),
+                'recycled':  self._recycled,
+                'prewarmed': self._prewarmed,
+            }
+
+    def close(self):
+        """유휴 드라이버를 모두 종료. 사용 중인 드라이버는 반납 시 종료됨."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._destroy(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _count_page_loads(driver, entry: _PoolEntry):
+    """driver.get() 호출 수를 entry.pages에 누적 (재생성 판단용)"""
+    original_get = driver.get
+
+    def get(url):
+        entry.pages += 1
+        return original_get(url)
+
+    driver.get = get
@@ -0,0 +1,220 @@
+"""
+SNKRDUNK HTTP 전용 엔진 (브라우저 없음)
+=====================================
+서버 렌더링된 HTML에 데이터가 이미 있는 경우 Chrome 없이 처리.
+
+  0. 카드 URL 캐시 적중 시 1~2 생략
+  1. 검색 결과 페이지 GET → img alt / product__item-name 후보 수집
+  2. Selenium 경로와 같은 _match_candidates로 카드 매칭
+  3. 카드 URL에서 /used?slide=right URL 생성 (패턴이 안 맞으면 상세 페이지에서 링크 탐색)
+  4. 리스팅 페이지 GET → 등급 / SOLD / 가격 파싱 (_summarize_listings, 모든 등급 요약 포함)
+
+keep-alive 커넥션 풀(urllib3)과 lxml 파서를 사용.
+파서는 snkrdunk_snapshots의 오프라인 재추출에서도 그대로 사용 (받은 HTML도 거기에 보관).
+결과가 없으면 None을 반환하고, Selenium fallback 여부는 get_cheapest_psa10이 결정.
+"""
+
+import re
+from urllib.parse import quote
+
+import urllib3
+from lxml import html as lxml_html
+
+import snkrdunk_metrics as metrics
+import snkrdunk_snapshots as snapshots
+from snkrdunk_psa10_scraper import (
+    SNKRDUNK_BASE_URL,
+    StaleResolution,
+    _absolute_url,
+    _listing_page_matches,
+    _match_candidates,
+    _summarize_listings,
+    _used_listings_url,
+)
+
+
+_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+_http = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=16,
+    headers=_HEADERS,
+    timeout=urllib3.Timeout(connect=5.0, read=15.0),
+    retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+)
+
+# Selenium 경로의 XPath와 동일한 규칙
+_XPATH_ITEM_NAME = "//*[contains(@class,'product__item-name')]"
+_XPATH_EVALUATION = "//p[contains(@class,'evaluation')]"
+_XPATH_CONTAINER = ("ancestor::*[contains(@class,'product__item') "
+                    "or contains(@class,'item--') "
+                    "or local-name()='li'][1]")
+
+
+class FetchError(Exception):
+    """HTTP 응답이 200이 아님"""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f'GET {url} -> {status}')
+        self.url = url
+        self.status = status
+
+
+def fetch(url: str) -> str:
+    response = _http.request('GET', url)
+    if response.status != 200:
+        raise FetchError(url, response.status)
+    return response.data.decode('utf-8', errors='replace')
+
+
+def _parse(page_html: str):
+    return lxml_html.fromstring(page_html)
+
+
+def _text(el) -> str:
+    return re.sub(r'\s+', ' ', el.text_content()).strip()
+
+
+def _ancestor_href(el) -> str | None:
+    hrefs = el.xpath('ancestor-or-self::a[@href][1]/@href')
+    return hrefs[0] if hrefs else None
+
+
+# ──────────────────────────────────────────────────────────────
+# 파서 (HTML 문자열 → 후보/리스팅 목록)
+# ──────────────────────────────────────────────────────────────
+
+def parse_search_candidates(page_html: str) -> list[dict]:
+    """검색 결과 HTML → [{'text', 'href', 'source'}, ...]"""
+    doc = _parse(page_html)
+    candidates = []
+    for img in doc.xpath('//img[@alt]'):
+        candidates.append({
+            'text':   img.get('alt') or '',
+            'href':   _ancestor_href(img),
+            'source': 'alt',
+        })
+    for item in doc.xpath(_XPATH_ITEM_NAME):
+        candidates.append({
+            'text':   _text(item),
+            'href':   _ancestor_href(item),
+            'source': 'name',
+        })
+    return candidates
+
+
+def parse_listings(page_html: str) -> list[dict]:
+    """리스팅 HTML → [{'grade', 'price_text', 'sold', 'href'}, ...]"""
+    doc = _parse(page_html)
+    listings = []
+    for grade_el in doc.xpath(_XPATH_EVALUATION):
+        containers = grade_el.xpath(_XPATH_CONTAINER) or grade_el.xpath('ancestor::*[3]')
+        if not containers:
+            continue
+        container = containers[0]
+
+        container_html = lxml_html.tostring(container, encoding='unicode')
+        sold = 'label-sold' in container_html or ' SOLD ' in container_html
+
+        price_text = ''
+        for price_el in container.xpath(".//p[contains(@class,'price')]"):
+            text = _text(price_el)
+            if re.search(r'[$¥]\s*[\d,]+', text):
+                price_text = text
+                break
+
+        listings.append({
+            'grade':      _text(grade_el),
+            'price_text': price_text,
+            'sold':       sold,
+            'href':       _ancestor_href(container) or next(iter(container.xpath('.//a/@href')), None),
+        })
+    return listings
+
+
+def find_used_link(page_html: str) -> str | None:
+    """카드 상세 HTML에서 See More(/used?slide=right) 링크 탐색"""
+    doc = _parse(page_html)
+    hrefs = doc.xpath("//a[contains(@href,'/used?slide=right')]/@href")
+    return _absolute_url(hrefs[0]) if hrefs else None
+
+
+# ──────────────────────────────────────────────────────────────
+# 파이프라인
+# ──────────────────────────────────────────────────────────────
+
+def search_candidates(pokemon_name: str) -> list[dict]:
+    """Step 1: 검색 결과 페이지 → 매칭 후보 목록"""
+    search_url = f"{SNKRDUNK_BASE_URL}/en/search/result?keyword={quote(pokemon_name)}"
+    print(f"[HTTP Step 1] 검색 URL: {search_url}")
+    page_html = fetch(search_url)
+    snapshots.capture('search', search_url, page_html, 'http', pokemon_name=pokemon_name)
+    candidates = parse_search_candidates(page_html)
+    print(f"         후보 수: {len(candidates)}")
+    return candidates
+
+
+def _page_title(page_html: str) -> str:
+    titles = _parse(page_html).xpath('//title/text()')
+    return titles[0].strip() if titles else ''
+
+
+def get_cheapest_psa10_http(lookup) -> dict | None:
+    """
+    Step 1~4를 HTTP 요청만으로 실행. 찾지 못하면 None.
+    lookup.card_url이 있으면(캐시 적중) 검색/매칭을 건너뜀.
+    """
+    if lookup.card_url:
+        card_url = lookup.card_url
+        print(f"[HTTP Step 1-2] 캐시된 카드 URL 사용: {card_url}")
+    else:
+        with metrics.step('search', 'http'):
+            candidates = search_candidates(lookup.pokemon_name)
+
+        print(f"[HTTP Step 2] 카드 매칭 중...")
+        with metrics.step('match', 'http'):
+            match = _match_candidates(candidates, lookup.card_name, lookup.set_name,
+                                      lookup.card_number, lookup.pokemon_name)
+        if not match:
+            print(f"         ❌ 매칭 실패 (서버 렌더링 HTML에 후보 없음)")
+            lookup.record_miss('not_found', candidates)
+            return None
+        lookup.match = match
+        card_url = match['href']
+        print(f"         ✅ 매칭 (점수 {match['score']}): {match['text'][:80]}")
+        print(f"         URL: {card_url}")
+
+    used_url = _used_listings_url(card_url)
+    with metrics.step('navigate', 'http'):
+        if not used_url:
+            print(f"[HTTP Step 3] 카드 상세 페이지에서 See More 탐색: {card_url}")
+            used_url = find_used_link(fetch(card_url)) or card_url
+        print(f"[HTTP Step 3] 리스팅 URL: {used_url}")
+
+        print(f"[HTTP Step 4] PSA 10 최저가 추출 중...")
+        try:
+            page_html = fetch(used_url)
+        except FetchError as e:
+            if lookup.from_cache and e.status == 404:
+                raise StaleResolution(str(e))
+            raise
+    if lookup.from_cache and not _listing_page_matches(_page_title(page_html), lookup.pokemon_name):
+        raise StaleResolution(f"title={_page_title(page_html)!r}")
+    snapshots.capture('listing', used_url, page_html, 'http', lookup=lookup)
+
+    with metrics.step('extract', 'http'):
+        listings = parse_listings(page_html)
+        print(f"         전체 등급 요소 수: {len(listings)}")
+        result = _summarize_listings(listings, lookup)
+    if result:
+        result['url'] = used_url
+    else:
+        lookup.record_miss('no_psa10', url=used_url)
+    return result
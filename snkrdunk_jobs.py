@@ -0,0 +1,331 @@
+"""
+SNKRDUNK 스크래핑 작업 큐 / 워커 fleet
+=====================================
+스크래핑을 호출한 프로세스 안에서 바로 돌리지 않고 snkrdunk.db의 scrape_jobs 테이블에 넣으면,
+별도의 워커 프로세스들이 가져가 실행.
+
+  - enqueue : 같은 카드가 이미 대기/실행 중이면 그 작업을 공유 (priority는 더 높은 쪽으로)
+  - lease   : 워커가 작업을 임대 (expires = now + JOB_LEASE_TTL), 실행 중에는 heartbeat로 연장
+              워커가 죽으면 임대가 만료된 뒤 다른 워커가 다시 가져감 → 작업 유실 없음
+  - ack     : 성공 시 done + 결과 {"found": bool}
+  - retry   : 실패 시 RETRY_BASE × 2^(시도-1)초 뒤 재시도 (최대 RETRY_MAX)
+  - dead    : 시도 횟수가 max_attempts에 도달하면 dead-letter (retry-dead로 되살릴 수 있음)
+
+  워커 프로세스 하나 = DriverPool(size=browsers) + 브라우저마다 스레드 하나
+  fleet = 워커 프로세스 N개 (기본 CPU 수), 죽으면 다시 띄움
+  여러 컨테이너가 같은 snkrdunk.db(SNKRDUNK_DB)를 보면 그대로 수평 확장
+
+호출 측 (query_snkrdunk_db는 SNKRDUNK_JOB_QUEUE=1일 때 이 경로를 사용):
+  from snkrdunk_jobs import JobQueue
+  job = JobQueue().run('GENGAR-HOLO', 'Pokemon Japanese Fossil', '94', timeout=120)
+
+실행:
+  python snkrdunk_jobs.py fleet --processes 4 --browsers 2
+  python snkrdunk_jobs.py work --browsers 1
+  python snkrdunk_jobs.py enqueue "GENGAR-HOLO" "Pokemon Japanese Fossil" "94"
+  python snkrdunk_jobs.py stats
+  python snkrdunk_jobs.py retry-dead
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from snkrdunk_db import get_storage
+
+
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get('SNKRDUNK_JOB_MAX_ATTEMPTS', '3'))
+# 작업 1건의 임대 시간(초). heartbeat가 JOB_LEASE_TTL / 3마다 연장.
+JOB_LEASE_TTL = float(os.environ.get('SNKRDUNK_JOB_LEASE_TTL', '120'))
+# 실패 시 재시도 간격: RETRY_BASE × 2^(시도-1), 최대 RETRY_MAX
+RETRY_BASE = float(os.environ.get('SNKRDUNK_JOB_RETRY_BASE', '30'))
+RETRY_MAX = 30 * 60
+DEFAULT_PROCESSES = int(os.environ.get('SNKRDUNK_JOB_PROCESSES', '0')) or os.cpu_count() or 1
+DEFAULT_BROWSERS = int(os.environ.get('SNKRDUNK_JOB_BROWSERS', '1'))
+
+# 우선순위 (높을수록 먼저)
+PRIORITY_INTERACTIVE = 10   # 사용자가 기다리는 조회
+PRIORITY_BATCH = 5
+PRIORITY_REFRESH = 0        # stale 캐시 백그라운드 갱신
+
+# 결과를 기다릴 때 / 큐가 비었을 때 확인 간격(초)
+POLL_INTERVAL = 0.5
+IDLE_SLEEP = 1.0
+# fleet: 워커 프로세스가 죽었을 때 다시 띄우기까지 대기(초)
+RESTART_DELAY = 5.0
+
+
+class JobFailed(Exception):
+    """작업이 재시도 한도를 넘겨 dead-letter 됨 (마지막 에러 메시지를 그대로 전달)"""
+
+
+def retry_delay(attempts: int) -> float:
+    return min(RETRY_MAX, RETRY_BASE * 2 ** max(0, attempts - 1))
+
+
+# ──────────────────────────────────────────────────────────────
+# 호출 측: 넣고 기다리기
+# ──────────────────────────────────────────────────────────────
+
+class JobQueue:
+    """scrape_jobs 테이블에 작업을 넣고 결과를 기다리는 클라이언트"""
+
+    def __init__(self, storage=None, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 poll_interval: float = POLL_INTERVAL):
+        self.storage = storage or get_storage()
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+
+    def submit(self, card_name, set_name='', card_number='', priority: int = PRIORITY_BATCH,
+               ignore_miss_reasons=()) -> int:
+        """ignore_miss_reasons: 워커가 무시할 음성 캐시 이유 (run_scraper_and_save와 같음)"""
+        return self.storage.enqueue_job(card_name, set_name, card_number, priority=priority,
+                                        max_attempts=self.max_attempts,
+                                        ignore_miss_reasons=ignore_miss_reasons)
+
+    def wait(self, job_id: int, timeout: float | None = None) -> dict:
+        """작업이 done/dead가 될 때까지 대기 후 작업 dict 반환. 시간 초과 시 TimeoutError."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.storage.get_job(job_id)
+            if job is None:
+                raise KeyError(f'job {job_id} not found')
+            if job['status'] in ('done', 'dead'):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f'job {job_id} still {job["status"]} after {timeout}s')
+            time.sleep(self.poll_interval)
+
+    def run(self, card_name, set_name='', card_number='', priority: int = PRIORITY_INTERACTIVE,
+            timeout: float | None = None, ignore_miss_reasons=()) -> dict:
+        """submit + wait. dead면 JobFailed."""
+        job = self.wait(self.submit(card_name, set_name, card_number, priority=priority,
+                                    ignore_miss_reasons=ignore_miss_reasons), timeout)
+        if job['status'] == 'dead':
+            raise JobFailed(job['error'] or 'scrape job failed')
+        return job
+
+    def stats(self) -> dict:
+        return self.storage.job_stats()
+
+
+# ──────────────────────────────────────────────────────────────
+# 워커 프로세스
+# ──────────────────────────────────────────────────────────────
+
+class JobWorker:
+    """
+    브라우저 browsers개를 가진 워커 프로세스 하나.
+    브라우저마다 스레드 하나가 claim → 스크래핑 → ack/fail을 반복.
+    stop() 후에는 실행 중인 작업만 끝내고 종료 (남은 작업은 다른 워커가 가져감).
+    """
+
+    def __init__(self, browsers: int = DEFAULT_BROWSERS, pool=None, storage=None,
+                 lease_ttl: float = JOB_LEASE_TTL):
+        self.browsers = max(1, browsers)
+        self.pool = pool
+        self.storage = storage or get_storage()
+        self.lease_ttl = lease_ttl
+        self.owner_prefix = f'{socket.gethostname()}:{os.getpid()}'
+        self._inflight: dict[int, str] = {}     # job_id → 임대 소유자
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.done = 0
+        self.failed = 0
+
+    def _execute(self, job: dict) -> dict:
+        from snkrdunk_psa10_scraper import run_scraper_and_save
+        found = run_scraper_and_save(job['card_name'], job['set_name'], job['card_number'],
+                                     pool=self.pool,
+                                     ignore_miss_reasons=job.get('ignore_miss_reasons', ()))
+        return {'found': bool(found)}
+
+    def _process(self, job: dict, owner: str):
+        label = f"#{job['job_id']} {job['card_name']} (시도 {job['attempts']}/{job['max_attempts']})"
+        print(f"🧵 작업 시작 {label}")
+        try:
+            result = self._execute(job)
+        except Exception as e:
+            status = self.storage.fail_job(job['job_id'], owner, str(e),
+                                           retry_in=retry_delay(job['attempts']))
+            self.failed += 1
+            if status == 'dead':
+                print(f"💀 작업 dead-letter {label}: {e}")
+            else:
+                print(f"⚠️ 작업 실패 {label}: {e} — {retry_delay(job['attempts']):.0f}초 후 재시도")
+            return
+        if self.storage.ack_job(job['job_id'], owner, result):
+            self.done += 1
+            print(f"✅ 작업 완료 {label}: {result}")
+        else:
+            print(f"⚠️ 임대를 잃은 작업 {label} (다른 워커가 다시 실행)")
+
+    def _loop(self, slot: int):
+        owner = f'{self.owner_prefix}:{slot}'
+        while not self._stop.is_set():
+            try:
+                job = self.storage.claim_job(owner, self.lease_ttl)
+            except Exception as e:
+                print(f"⚠️ 작업 임대 실패: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(IDLE_SLEEP)
+                continue
+            with self._lock:
+                self._inflight[job['job_id']] = owner
+            try:
+                self._process(job, owner)
+            finally:
+                with self._lock:
+                    self._inflight.pop(job['job_id'], None)
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.lease_ttl / 3):
+            with self._lock:
+                inflight = list(self._inflight.items())
+            for job_id, owner in inflight:
+                try:
+                    self.storage.heartbeat_job(job_id, owner, self.lease_ttl)
+                except Exception as e:
+                    print(f"⚠️ 작업 heartbeat 실패 (#{job_id}): {e}")
+
+    def run(self):
+        """stop()이 호출될 때까지 실행 (현재 스레드에서 블록)"""
+        threads = [threading.Thread(target=self._loop, args=(slot,), name=f'snkrdunk-job-{slot}')
+                   for slot in range(self.browsers)]
+        heartbeat = threading.Thread(target=self._heartbeat, name='snkrdunk-job-heartbeat',
+                                     daemon=True)
+        for thread in threads:
+            thread.start()
+        heartbeat.start()
+        # signal.pause 대신 짧게 대기해야 메인 스레드가 시그널을 처리함
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1.0)
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            inflight = len(self._inflight)
+        return {'browsers': self.browsers, 'inflight': inflight,
+                'done': self.done, 'failed': self.failed}
+
+
+def run_worker(browsers: int = DEFAULT_BROWSERS):
+    """워커 프로세스 본체: 드라이버 풀을 만들고 SIGTERM/SIGINT까지 작업 처리"""
+    from snkrdunk_driver_pool import DriverPool
+
+    pool = DriverPool(size=browsers)
+    worker = JobWorker(browsers=browsers, pool=pool)
+
+    def shutdown(signum, frame):
+        print(f"🛑 워커 종료 요청 (signal {signum}) — 실행 중인 작업을 마치고 종료")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    print(f"🚀 작업 워커 시작 (pid {os.getpid()}, 브라우저 {worker.browsers}개)")
+    try:
+        worker.run()
+    finally:
+        pool.close()
+    print(f"👋 작업 워커 종료 (완료 {worker.done}, 실패 {worker.failed})")
+
+
+# ──────────────────────────────────────────────────────────────
+# fleet: 워커 프로세스 N개
+# ──────────────────────────────────────────────────────────────
+
+def run_fleet(processes: int = DEFAULT_PROCESSES, browsers: int = DEFAULT_BROWSERS):
+    """
+    워커 프로세스를 processes개 띄우고, 죽으면 RESTART_DELAY 후 다시 띄움.
+    SIGTERM/SIGINT를 받으면 모든 워커에 SIGTERM을 보내고 종료를 기다림.
+    """
+    command = [sys.executable, os.path.abspath(__file__), 'work', '--browsers', str(browsers)]
+    stopping = threading.Event()
+    children: list[subprocess.Popen | None] = [None] * max(1, processes)
+    restart_at = [0.0] * len(children)
+
+    def shutdown(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    print(f"🚀 작업 fleet 시작: 프로세스 {len(children)}개 × 브라우저 {browsers}개")
+
+    while not stopping.is_set():
+        now = time.monotonic()
+        for i, child in enumerate(children):
+            if child is not None and child.poll() is not None:
+                print(f"⚠️ 워커 {i} (pid {child.pid}) 종료됨 (code {child.returncode}) "
+                      f"— {RESTART_DELAY:.0f}초 후 재시작")
+                children[i] = None
+                restart_at[i] = now + RESTART_DELAY
+            if children[i] is None and now >= restart_at[i]:
+                children[i] = subprocess.Popen(command, stdin=subprocess.DEVNULL)
+        stopping.wait(1.0)
+
+    for child in children:
+        if child is not None and child.poll() is None:
+            child.send_signal(signal.SIGTERM)
+    for child in children:
+        if child is not None:
+            child.wait()
+    print("👋 작업 fleet 종료")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SNKRDUNK scrape job queue and worker fleet')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    fleet = sub.add_parser('fleet', help='Run N worker processes (restarted if they die)')
+    fleet.add_argument('--processes', type=int, default=DEFAULT_PROCESSES)
+    fleet.add_argument('--browsers', type=int, default=DEFAULT_BROWSERS,
+                       help='Browsers (and job threads) per process')
+
+    work = sub.add_parser('work', help='Run one worker process')
+    work.add_argument('--browsers', type=int, default=DEFAULT_BROWSERS)
+
+    enqueue = sub.add_parser('enqueue', help='Queue a card scrape')
+    enqueue.add_argument('card_name')
+    enqueue.add_argument('set_name', nargs='?', default='')
+    enqueue.add_argument('card_number', nargs='?', default='')
+    enqueue.add_argument('--priority', type=int, default=PRIORITY_BATCH)
+    enqueue.add_argument('--wait', action='store_true', help='Wait for the job to finish')
+    enqueue.add_argument('--timeout', type=float, default=None)
+
+    sub.add_parser('stats', help='Job counts by status')
+    sub.add_parser('retry-dead', help='Requeue dead-lettered jobs')
+    purge = sub.add_parser('purge', help='Delete finished jobs')
+    purge.add_argument('--days', type=float, default=7)
+
+    args = parser.parse_args()
+
+    if args.command == 'fleet':
+        run_fleet(args.processes, args.browsers)
+    elif args.command == 'work':
+        run_worker(args.browsers)
+    elif args.command == 'enqueue':
+        queue = JobQueue()
+        job_id = queue.submit(args.card_name, args.set_name, args.card_number,
+                              priority=args.priority)
+        job = queue.wait(job_id, args.timeout) if args.wait else queue.storage.get_job(job_id)
+        print(json.dumps(job, ensure_ascii=False))
+    elif args.command == 'stats':
+        print(json.dumps(JobQueue().stats()))
+    elif args.command == 'retry-dead':
+        print(f"🔁 dead 작업 {get_storage().retry_dead_jobs()}건 재시도 대기열로 이동")
+    elif args.command == 'purge':
+        print(f"🧹 끝난 작업 {get_storage().purge_jobs(args.days * 86400)}건 삭제")
+
+
+if __name__ == '__main__':
+    main()
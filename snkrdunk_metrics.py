@@ -0,0 +1,252 @@
+"""
+SNKRDUNK 스크래퍼 메트릭 / 트레이스
+=====================================
+print 로그 대신 구조화된 측정값.
+
+  - 카운터/히스토그램 레지스트리 → Prometheus 텍스트 포맷 (render)
+      snkrdunk_step_duration_seconds{engine, step}   단계별 시간 (driver_start, search, match,
+                                                      navigate, extract, total)
+      snkrdunk_webdriver_commands_total{command}      WebDriver 명령 수
+      snkrdunk_cdp_commands_total{method}             CDP 명령 수 (cdp 엔진)
+      snkrdunk_cache_requests_total{cache, result}    캐시 적중/미적중 (price, resolution, negative)
+      snkrdunk_match_score                            카드 매칭 점수
+      snkrdunk_psa10_listings                         리스팅 페이지의 PSA 10 요소 수
+      snkrdunk_psa10_sold_skipped_total / snkrdunk_psa10_listings_seen_total  (SOLD 스킵 비율)
+      snkrdunk_lookups_total{engine, outcome}
+  - 조회 1건당 JSON 트레이스 (단계별 ms, 명령 수, 매칭 점수, ...)
+      SNKRDUNK_TRACE_FILE이 있으면 JSON-lines로 추가, 최근 TRACE_BUFFER건은 메모리에 보관
+
+트레이스는 실행 컨텍스트별로 하나 (스레드 1개 또는 asyncio 태스크 1개 = 조회 1건),
+단계/명령 수는 현재 컨텍스트의 트레이스에 누적.
+
+노출:
+  워커 'metrics' op, Node /metrics 엔드포인트
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+TRACE_FILE = os.environ.get('SNKRDUNK_TRACE_FILE')
+TRACE_BUFFER = 200
+
+_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _label_text(labelnames: tuple, values: tuple, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+# ──────────────────────────────────────────────────────────────
+# 레지스트리
+# ──────────────────────────────────────────────────────────────
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_label_text(self.labelnames, key)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (),
+                 buckets: tuple = _DURATION_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values = {}     # key → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, state):
+                    labels = _label_text(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _label_text(self.labelnames, key, 'le="+Inf"')
+                lines.append(f'{self.name}_bucket{labels} {state[-1]}')
+                lines.append(f'{self.name}_sum{_label_text(self.labelnames, key)} {round(state[-2], 6)}')
+                lines.append(f'{self.name}_count{_label_text(self.labelnames, key)} {state[-1]}')
+        return lines
+
+
+STEP_SECONDS = Histogram('snkrdunk_step_duration_seconds',
+                         'Duration of each scrape step', ('engine', 'step'))
+WEBDRIVER_COMMANDS = Counter('snkrdunk_webdriver_commands_total',
+                             'WebDriver commands sent to chromedriver', ('command',))
+CDP_COMMANDS = Counter('snkrdunk_cdp_commands_total',
+                       'DevTools protocol commands sent by the cdp engine', ('method',))
+CACHE_REQUESTS = Counter('snkrdunk_cache_requests_total',
+                         'Cache lookups by cache and result', ('cache', 'result'))
+MATCH_SCORE = Histogram('snkrdunk_match_score', 'Search candidate match score',
+                        buckets=(0, 1, 2, 3, 4, 5, 6))
+PSA10_LISTINGS = Histogram('snkrdunk_psa10_listings', 'PSA 10 elements on a listing page',
+                           buckets=(0, 1, 2, 5, 10, 20, 50, 100))
+PSA10_SEEN = Counter('snkrdunk_psa10_listings_seen_total', 'PSA 10 listings seen')
+PSA10_SOLD = Counter('snkrdunk_psa10_sold_skipped_total', 'PSA 10 listings skipped as SOLD')
+LOOKUPS = Counter('snkrdunk_lookups_total', 'Card lookups by engine and outcome',
+                  ('engine', 'outcome'))
+
+REGISTRY = [STEP_SECONDS, WEBDRIVER_COMMANDS, CDP_COMMANDS, CACHE_REQUESTS, MATCH_SCORE,
+            PSA10_LISTINGS, PSA10_SEEN, PSA10_SOLD, LOOKUPS]
+
+
+def render() -> str:
+    """Prometheus 텍스트 포맷 (version 0.0.4)"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ──────────────────────────────────────────────────────────────
+# 조회별 트레이스
+# ──────────────────────────────────────────────────────────────
+
+# 스레드마다 따로, asyncio 태스크는 생성 시점의 컨텍스트를 복사하므로 태스크마다 따로
+_current: ContextVar['Trace | None'] = ContextVar('snkrdunk_trace', default=None)
+_recent = deque(maxlen=TRACE_BUFFER)
+_trace_file_lock = threading.Lock()
+
+
+class Trace:
+    """조회 1건의 기록. finish() 시 JSON 한 줄로 내보냄."""
+
+    def __init__(self, **fields):
+        self.record = {'ts': round(time.time(), 3), **fields}
+        self.steps = {}
+        self.webdriver_commands = 0
+        self._start = time.perf_counter()
+
+    def add(self, **fields):
+        self.record.update(fields)
+
+    def add_step(self, name: str, seconds: float):
+        self.steps[name] = self.steps.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def finish(self, **fields) -> dict:
+        total = self.elapsed()
+        self.record.update(fields)
+        self.record['steps_ms'] = {name: round(sec * 1000, 1) for name, sec in self.steps.items()}
+        self.record['total_ms'] = round(total * 1000, 1)
+        self.record['webdriver_commands'] = self.webdriver_commands
+        _emit(self.record)
+        return self.record
+
+
+def start_trace(**fields) -> Trace:
+    trace = Trace(**fields)
+    _current.set(trace)
+    return trace
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+def end_trace(trace: Trace, **fields) -> dict:
+    if current_trace() is trace:
+        _current.set(None)
+    return trace.finish(**fields)
+
+
+def _emit(record: dict):
+    _recent.append(record)
+    if TRACE_FILE:
+        line = json.dumps(record, ensure_ascii=False)
+        with _trace_file_lock:
+            with open(TRACE_FILE, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+def recent_traces(limit: int = 50) -> list[dict]:
+    return list(_recent)[-limit:]
+
+
+# ──────────────────────────────────────────────────────────────
+# 계측 헬퍼
+# ──────────────────────────────────────────────────────────────
+
+@contextmanager
+def step(name: str, engine: str):
+    """단계 시간 측정 → 히스토그램 + 현재 트레이스"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STEP_SECONDS.observe(elapsed, engine=engine, step=name)
+        trace = current_trace()
+        if trace is not None:
+            trace.add_step(name, elapsed)
+
+
+def instrument_driver(driver):
+    """driver.execute를 감싸 명령 수를 집계 (명령별 카운터 + 현재 트레이스)"""
+    original = driver.execute
+
+    def execute(command, params=None):
+        WEBDRIVER_COMMANDS.inc(command=command)
+        trace = current_trace()
+        if trace is not None:
+            trace.webdriver_commands += 1
+        return original(command, params)
+
+    driver.execute = execute
+    return driver
+
+
+def cache_result(cache: str, result: str):
+    CACHE_REQUESTS.inc(cache=cache, result=result)
+
+
+def observe_listings(psa10_seen: int, sold_skipped: int):
+    PSA10_LISTINGS.observe(psa10_seen)
+    PSA10_SEEN.inc(psa10_seen)
+    PSA10_SOLD.inc(sold_skipped)
+    trace = current_trace()
+    if trace is not None:
+        trace.add(psa10_elements=psa10_seen, sold_skipped=sold_skipped)
@@ -0,0 +1,282 @@
+"""
+포켓몬 이름 정규화
+=====================================
+PriceCharting 카드명 → SNKRDUNK 검색에 쓸 포켓몬 이름.
+
+  1. 사전 인식: data/pokemon_names.json(영문명 + 일본어명)으로 만든 트라이에서
+                왼쪽부터 가장 긴 이름을 찾음 → 영문 표기로 반환
+                  "Pikachu with Grey Felt Hat" → "Pikachu"
+                  "Tapu Koko GX"               → "Tapu Koko"
+                  "リザードンex"                → "Charizard"
+     이름이 둘 이상이거나 '&'가 있으면(태그팀 등) 2번 규칙으로 전체 이름 유지
+                  "Mewtwo & Mew GX"            → "Mewtwo & Mew"
+  2. 사전에 없으면 기존 규칙: 접두사(FA/, Dark, Brock's, ...) / 접미사(Holo, VMAX, GX, ...) 제거
+
+  - 접두사/접미사 패턴은 미리 컴파일하고, 전체를 하나로 묶은 앵커 alternation으로 먼저 검사
+    (어느 것도 안 맞으면 패턴별 치환을 건너뜀 — 결과는 패턴을 순서대로 적용한 것과 동일)
+  - extract_pokemon_name은 LRU 캐시
+  - normalize_many: pandas Series는 고유값만 정규화 후 펼침 (PriceCharting CSV 전체 처리용)
+
+사전 파일 교체: SNKRDUNK_POKEMON_NAMES=/path/to/names.json  ({"English": ["別名", ...]})
+
+실행:
+  python snkrdunk_names.py export.csv --column product-name > with_names.csv
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+
+POKEMON_NAMES_FILE = os.environ.get(
+    'SNKRDUNK_POKEMON_NAMES',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'pokemon_names.json'),
+)
+
+_REMOVE_PREFIXES = [
+    r'^fa[/\-\s]+',        # FA/Gengar → Gengar
+    r'^full\s*art[/\-\s]+',
+    r"^morty's[\s]+",
+    r"^misty's[\s]+",
+    r"^brock's[\s]+",
+    r"^erika's[\s]+",
+    r"^lt\.?\s*surge's[\s]+",
+    r"^sabrina's[\s]+",
+    r"^blaine's[\s]+",
+    r"^giovanni's[\s]+",
+    r"^koga's[\s]+",
+    r"^rocket's[\s]+",
+    r"^dark[\s]+",
+    r"^light[\s]+",
+    r"^shining[\s]+",
+    r"^radiant[\s]+",
+]
+
+_REMOVE_SUFFIXES = [
+    r'[\-\s]+reverse[\-\s]*holo$',
+    r'[\-\s]+holofoil$',
+    r'[\-\s]+holo$',
+    r'[\-\s]+non[\-\s]*holo$',
+    r'[\-\s]+vmax$',
+    r'[\-\s]+vstar$',
+    r'[\-\s]+v$',
+    r'[\-\s]+ex$',
+    r'[\-\s]+gx$',
+    r'[\-\s]+mega$',
+    r'[\-\s]+break$',
+    r'[\-\s]+prime$',
+    r'[\-\s]+legend$',
+    r'[\-\s]+lv[\-\.]?x$',
+    r'[\-\s]+star$',
+    r'[\-\s]+full[\-\s]*art$',
+    r'[\-\s]+secret$',
+    r'[\-\s]+rainbow$',
+    r'[\-\s]+gold$',
+    r'[\-\s]+shiny$',
+    r'[\-\s]+promo$',
+    r'[\-\s]+prerelease$',
+    r'[\-\s]+staff$',
+    r'[\-\s]+stamped$',
+    r'[\-\s]+radiant$',
+    r'[\-\s]+shining$',
+    r'[\-\s]+dark$',
+    r'[\-\s]+light$',
+    r'[\-\s]+delta[\-\s]*species$',
+    r'[\-\s]+sp$',
+    r'[\-\s]+gl$',
+    r'[\-\s]+fb$',
+]
+
+_PREFIX_RES = [re.compile(p, re.IGNORECASE) for p in _REMOVE_PREFIXES]
+_SUFFIX_RES = [re.compile(p, re.IGNORECASE) for p in _REMOVE_SUFFIXES]
+_ANY_PREFIX_RE = re.compile('|'.join(f'(?:{p})' for p in _REMOVE_PREFIXES), re.IGNORECASE)
+_ANY_SUFFIX_RE = re.compile('|'.join(f'(?:{p})' for p in _REMOVE_SUFFIXES), re.IGNORECASE)
+
+_CARD_NUMBER_RE = re.compile(r'#.*')
+_SPACES_RE = re.compile(r'\s+')
+_NON_WORD_RE = re.compile(r'[^\w]+')
+
+
+# ──────────────────────────────────────────────────────────────
+# 이름 사전 (트라이)
+# ──────────────────────────────────────────────────────────────
+
+_END = ''   # 트라이 노드에서 완성된 이름(영문 표기)을 담는 키
+
+
+def _fold(text: str) -> str:
+    """사전/입력 공통 정규화: NFKC, 소문자, 구두점·기호 → 공백 한 칸"""
+    return _NON_WORD_RE.sub(' ', unicodedata.normalize('NFKC', text).lower()).strip()
+
+
+def _is_ascii_alnum(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class NameTrie:
+    """
+    문자 단위 트라이. 왼쪽부터 가장 긴 이름을 찾음.
+    영문은 단어 경계에서만 시작/끝나야 함 ("Mew"가 "Mewtwo" 안에서 매칭되지 않도록),
+    일본어처럼 띄어쓰기가 없는 문자는 경계 검사 없이 매칭.
+    """
+
+    def __init__(self, names: dict[str, list[str]] | None = None):
+        self.root = {}
+        for canonical, aliases in (names or {}).items():
+            for alias in [canonical, *aliases]:
+                self.add(alias, canonical)
+
+    def add(self, alias: str, canonical: str):
+        key = _fold(alias)
+        if not key:
+            return
+        node = self.root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[_END] = canonical
+
+    def find_all(self, text: str) -> list[str]:
+        """text 안의 이름들을 왼쪽부터 겹치지 않게, 각 위치에서 가장 긴 것으로 (영문 표기 목록)"""
+        text = _fold(text)
+        n = len(text)
+        found_names = []
+        start = 0
+        while start < n:
+            ch = text[start]
+            if ch == ' ' or (start and _is_ascii_alnum(ch) and _is_ascii_alnum(text[start - 1])):
+                start += 1
+                continue
+            node, found, found_end = self.root, None, start
+            for end in range(start, n):
+                node = node.get(text[end])
+                if node is None:
+                    break
+                if _END in node and not (end + 1 < n and _is_ascii_alnum(text[end])
+                                         and _is_ascii_alnum(text[end + 1])):
+                    found, found_end = node[_END], end
+            if found:
+                found_names.append(found)
+                start = found_end + 1
+            else:
+                start += 1
+        return found_names
+
+    def find(self, text: str) -> str | None:
+        """text 안에서 왼쪽부터 가장 긴 이름의 영문 표기 (없으면 None)"""
+        names = self.find_all(text)
+        return names[0] if names else None
+
+
+def load_names(path: str = POKEMON_NAMES_FILE) -> dict[str, list[str]]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 포켓몬 이름 사전 로드 실패 ({path}): {e}", file=sys.stderr)
+        return {}
+
+
+_trie: NameTrie | None = None
+
+
+def _get_trie() -> NameTrie:
+    global _trie
+    if _trie is None:
+        _trie = NameTrie(load_names())
+    return _trie
+
+
+# ──────────────────────────────────────────────────────────────
+# 정규화
+# ──────────────────────────────────────────────────────────────
+
+def _strip_affixes(name: str) -> str:
+    """기존 규칙: 접두사는 순서대로 한 번씩, 접미사는 더 이상 안 바뀔 때까지 반복 제거"""
+    if _ANY_PREFIX_RE.match(name):
+        for pattern in _PREFIX_RES:
+            name = pattern.sub('', name)
+
+    # 접미사 반복 제거 (여러 개 붙어 있을 수 있음)
+    while _ANY_SUFFIX_RE.search(name):
+        for pattern in _SUFFIX_RES:
+            name = pattern.sub('', name)
+
+    # 특수문자 정리 후 Title Case
+    name = name.strip(' -/')
+    name = _SPACES_RE.sub(' ', name)
+    return name.title()
+
+
+@lru_cache(maxsize=16384)
+def extract_pokemon_name(card_name: str) -> str:
+    """
+    Card Name에서 포켓몬 이름만 추출.
+
+    예시:
+      "GENGAR-HOLO"           → "Gengar"
+      "FA/Gengar VMAX"        → "Gengar"
+      "Sylveon-GX"            → "Sylveon"
+      "Pikachu Reverse Holo"  → "Pikachu"
+      "Mr. Mime"              → "Mr. Mime"
+      "ゲンガー"               → "Gengar"
+    """
+    # 카드 번호(#94 등) 제거 - 프론트엔드 구버전 호환용
+    name = _CARD_NUMBER_RE.sub('', card_name.strip().lower()).strip()
+
+    # 태그팀("Mewtwo & Mew GX")이나 이름이 둘 이상인 카드("Eevee Heroes Espeon")는
+    # 하나만 고르면 다른 카드와 섞이므로 기존 규칙으로 전체 이름을 유지
+    known = _get_trie().find_all(name)
+    if len(known) == 1 and '&' not in name:
+        return known[0]
+    return _strip_affixes(name)
+
+
+def normalize_many(card_names):
+    """
+    여러 카드명을 한 번에 정규화.
+    pandas Series면 고유값만 정규화해서 같은 index의 Series로, 그 외 iterable이면 list로 반환.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+
+    if pd is not None and isinstance(card_names, pd.Series):
+        codes, uniques = pd.factorize(card_names.fillna('').astype(str), sort=False)
+        names = pd.Series([extract_pokemon_name(u) for u in uniques], dtype=object)
+        return pd.Series(names.to_numpy()[codes], index=card_names.index,
+                         name='pokemon_name', dtype=object)
+
+    memo = {}
+    out = []
+    for card_name in card_names:
+        card_name = '' if card_name is None else str(card_name)
+        if card_name not in memo:
+            memo[card_name] = extract_pokemon_name(card_name)
+        out.append(memo[card_name])
+    return out
+
+
+def main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Add a pokemon_name column to a card CSV')
+    parser.add_argument('path', help="CSV file ('-' for stdin)")
+    parser.add_argument('--column', default='product-name', help='Card name column')
+    parser.add_argument('--output', '-o', default='-', help="Output CSV ('-' for stdout)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(sys.stdin if args.path == '-' else args.path, dtype=str)
+    if args.column not in df.columns:
+        parser.error(f"column {args.column!r} not found (columns: {', '.join(df.columns)})")
+    df['pokemon_name'] = normalize_many(df[args.column])
+    df.to_csv(sys.stdout if args.output == '-' else args.output, index=False)
+    print(f"✅ {len(df)}행, 고유 포켓몬 {df['pokemon_name'].nunique()}종", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
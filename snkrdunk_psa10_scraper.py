@@ -4,7 +4,8 @@ SNKRDUNK PSA 10 최저가 스크래퍼
 흐름:
   1. Card Name에서 포켓몬 이름만 추출 → 검색
   2. 검색 결과 product__item-name에서 Card Name + Set + Card Number 매칭
-  3. "See More" 링크 클릭 → /used?slide=right 페이지 이동
+  3. 카드 URL에서 /used?slide=right URL을 만들어 바로 이동
+     (패턴이 맞지 않으면 "See More" 링크 클릭)
   4. SOLD 제외, PSA 10 아이템 중 가장 저렴한 가격 반환
 
 사용 예시:
@@ -12,10 +13,19 @@ SNKRDUNK PSA 10 최저가 스크래퍼
   또는
   from snkrdunk_scraper import get_cheapest_psa10
   result = get_cheapest_psa10("GENGAR-HOLO", "POKEMON JAPANESE FOSSIL", "94")
+
+  드라이버 풀 사용 (Chrome 재사용):
+  from snkrdunk_driver_pool import DriverPool
+  pool = DriverPool(size=2)
+  result = get_cheapest_psa10("GENGAR-HOLO", "POKEMON JAPANESE FOSSIL", "94", pool=pool)
 """
 
+import json
+import os
 import re
-import time
+import shutil
+import subprocess
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -24,155 +34,382 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+import snkrdunk_metrics as metrics
+import snkrdunk_snapshots as snapshots
+from snkrdunk_db import PSA10_GRADE, RAW_GRADE, get_storage, grade_label, resolution_key
+from snkrdunk_names import extract_pokemon_name
+from snkrdunk_sets import set_tokens
+from snkrdunk_singleflight import get_single_flight, scrape_key
+from snkrdunk_waits import (
+    STEP_TIMEOUTS,
+    scroll_until_stable,
+    wait_for_dom_quiet,
+    wait_for_ready_state,
+    wait_for_url_change,
+)
+
 
 # ──────────────────────────────────────────────────────────────
-# 포켓몬 이름 추출
+# 매칭 / 가격 파싱 공통 함수 (Selenium, HTTP 엔진 공용)
 # ──────────────────────────────────────────────────────────────
 
-# 포켓몬 이름 앞뒤에 붙는 접두/접미 패턴들
-_REMOVE_PREFIXES = [
-    r'^fa[/\-\s]+',        # FA/Gengar → Gengar
-    r'^full\s*art[/\-\s]+',
-    r"^morty's[\s]+",
-    r"^misty's[\s]+",
-    r"^brock's[\s]+",
-    r"^erika's[\s]+",
-    r"^lt\.?\s*surge's[\s]+",
-    r"^sabrina's[\s]+",
-    r"^blaine's[\s]+",
-    r"^giovanni's[\s]+",
-    r"^koga's[\s]+",
-    r"^rocket's[\s]+",
-    r"^dark[\s]+",
-    r"^light[\s]+",
-    r"^shining[\s]+",
-    r"^radiant[\s]+",
-]
-
-_REMOVE_SUFFIXES = [
-    r'[\-\s]+reverse[\-\s]*holo$',
-    r'[\-\s]+holofoil$',
-    r'[\-\s]+holo$',
-    r'[\-\s]+non[\-\s]*holo$',
-    r'[\-\s]+vmax$',
-    r'[\-\s]+vstar$',
-    r'[\-\s]+v$',
-    r'[\-\s]+ex$',
-    r'[\-\s]+gx$',
-    r'[\-\s]+mega$',
-    r'[\-\s]+break$',
-    r'[\-\s]+prime$',
-    r'[\-\s]+legend$',
-    r'[\-\s]+lv[\-\.]?x$',
-    r'[\-\s]+star$',
-    r'[\-\s]+full[\-\s]*art$',
-    r'[\-\s]+secret$',
-    r'[\-\s]+rainbow$',
-    r'[\-\s]+gold$',
-    r'[\-\s]+shiny$',
-    r'[\-\s]+promo$',
-    r'[\-\s]+prerelease$',
-    r'[\-\s]+staff$',
-    r'[\-\s]+stamped$',
-    r'[\-\s]+radiant$',
-    r'[\-\s]+shining$',
-    r'[\-\s]+dark$',
-    r'[\-\s]+light$',
-    r'[\-\s]+delta[\-\s]*species$',
-    r'[\-\s]+sp$',
-    r'[\-\s]+gl$',
-    r'[\-\s]+fb$',
-]
-
-
-def extract_pokemon_name(card_name: str) -> str:
+# 벤치마크 등에서 로컬 fixture 서버로 바꿀 수 있음 (예: http://127.0.0.1:8765)
+SNKRDUNK_BASE_URL = os.environ.get('SNKRDUNK_BASE_URL', 'https://snkrdunk.com').rstrip('/')
+
+# get_cheapest_psa10 기본 엔진 ('auto' | 'http' | 'selenium')
+DEFAULT_ENGINE = os.environ.get('SNKRDUNK_ENGINE', 'auto')
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def _set_tokens(set_name: str) -> frozenset:
+    """원본 세트명과 카탈로그 세트(SNKRDUNK 표기, 세트 코드)에서 매칭에 쓸 토큰 추출 (캐시됨)"""
+    return set_tokens(set_name)
+
+
+def _absolute_url(href: str) -> str:
+    if not href.startswith('http'):
+        href = SNKRDUNK_BASE_URL + href
+    return href
+
+
+_CARD_URL_RE = re.compile(r'^(https?://[^/]+/en/trading-cards/\d+)/?(?:[?#].*)?$')
+
+
+def _used_listings_url(card_url: str) -> str | None:
+    """/en/trading-cards/{id} → /en/trading-cards/{id}/used?slide=right (패턴 불일치 시 None)"""
+    match = _CARD_URL_RE.match(card_url)
+    if not match:
+        return None
+    return f'{match.group(1)}/used?slide=right'
+
+
+def _score_candidate(text: str,
+                     source: str,
+                     cn: str,
+                     pn: str,
+                     set_tokens: set,
+                     num: str) -> tuple[int, bool, bool, bool] | None:
+    """
+    후보 하나의 점수 계산 (Set: 3점, Number: 2점, Card Name: 1점).
+    포켓몬 이름이 없으면 None.
+    source='alt'이면 XX/YY 형식 카드 번호까지 확인.
     """
-    Card Name에서 포켓몬 이름만 추출.
+    normalized = _normalize(text)
+
+    # Pokemon 이름으로 기본 필터링
+    if pn not in normalized:
+        return None
 
-    예시:
-      "GENGAR-HOLO"           → "Gengar"
-      "FA/Gengar VMAX"        → "Gengar"
-      "Sylveon-GX"            → "Sylveon"
-      "Pikachu Reverse Holo"  → "Pikachu"
+    has_set = any(t in normalized for t in set_tokens) if set_tokens else False
+    has_card_name = cn in normalized
+
+    has_number = False
+    if num:
+        if source == 'alt':
+            # 카드 번호 매칭 (XX/YY 형식에서 앞 두 자리만 추출)
+            for match in re.findall(r'(\d{2,3})/\d{2,3}', text):
+                if num in match or match in num:
+                    has_number = True
+                    break
+            # 직접 번호 매칭도 시도
+            if not has_number and num in text:
+                has_number = True
+        else:
+            has_number = num in normalized
+
+    score = 0
+    if has_set:
+        score += 3
+    if has_number:
+        score += 2
+    if has_card_name:
+        score += 1
+    return score, has_set, has_number, has_card_name
+
+
+def _match_candidates(candidates: list[dict],
+                      card_name: str,
+                      set_name: str,
+                      card_number: str,
+                      pokemon_name: str) -> dict | None:
     """
-    name = card_name.strip().lower()
+    검색 결과 후보 목록에서 카드 매칭 (브라우저 불필요한 순수 함수).
 
-    # 접두사 제거
-    # 카드 번호(#94 등) 제거 - 프론트엔드 구버전 호환용
-    name = re.sub(r'#.*', '', name)
-    name = name.strip()
+    candidates: [{'text': alt 또는 상품명, 'href': 링크 또는 None, 'source': 'alt' | 'name'}, ...]
 
-    for pattern in _REMOVE_PREFIXES:
-        name = re.sub(pattern, '', name, flags=re.IGNORECASE)
+    1단계: 이미지 alt 텍스트 중 최고 점수
+    2단계: product__item-name 중 점수 > 0인 첫 번째 항목
+
+    반환: {'href', 'score', 'text', 'source', 'has_set', 'has_number', 'has_card_name'} 또는 None
+    """
+    cn = _normalize(card_name)
+    pn = _normalize(pokemon_name)
+    set_tokens = _set_tokens(set_name)
+    num = card_number.strip()
 
-    # 접미사 반복 제거 (여러 개 붙어 있을 수 있음)
-    changed = True
-    while changed:
-        prev = name
-        for pattern in _REMOVE_SUFFIXES:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-        changed = name != prev
+    best = None
+    for cand in candidates:
+        if cand['source'] != 'alt' or not cand['text']:
+            continue
+        scored = _score_candidate(cand['text'], 'alt', cn, pn, set_tokens, num)
+        if scored and scored[0] > (best['score'] if best else 0):
+            best = dict(cand, score=scored[0], has_set=scored[1],
+                        has_number=scored[2], has_card_name=scored[3])
 
-    # 특수문자 정리 후 Title Case
-    name = name.strip(' -/')
-    name = re.sub(r'\s+', ' ', name)
-    return name.title()
+    if best and best['href']:
+        best['href'] = _absolute_url(best['href'])
+        return best
 
+    for cand in candidates:
+        if cand['source'] != 'name' or not cand['text']:
+            continue
+        scored = _score_candidate(cand['text'], 'name', cn, pn, set_tokens, num)
+        if scored and scored[0] > 0 and cand['href']:
+            return dict(cand, href=_absolute_url(cand['href']), score=scored[0],
+                        has_set=scored[1], has_number=scored[2], has_card_name=scored[3])
 
-# ──────────────────────────────────────────────────────────────
-# 세트 이름 매핑 (PriceCharting -> SNKRDUNK)
-# ──────────────────────────────────────────────────────────────
+    return None
 
-_SET_MAPPING = {
-    'neo 4': 'destiny',
-    'neo 3': 'revelation',
-    'neo 2': 'discovery',
-    'neo 1': 'genesis',
-    'base set': 'base',
-    'legendary collection': 'legendary',
-    'expedition base set': 'expedition',
-    'aquapolis': 'aquapolis',
-    'skyridge': 'skyridge',
-    'fossil': 'fossil',
-    'jungle': 'jungle',
-    'team rocket': 'rocket',
-    'gym heroes': 'heroes',
-    'gym challenge': 'challenge',
-}
 
-def map_set_name(set_name: str) -> str:
+def _parse_price_text(price_text: str) -> tuple[int, str] | None:
     """
-    세트 이름을 SNKRDUNK 검색에 유리하게 변환.
-    예: "Pokemon Japanese Neo 4" -> "Destiny" (Neo 4 is Neo Destiny)
+    가격 텍스트를 USD 정수로 변환. (usd, 'USD' | 'JPY') 또는 None
+      "US $71" / "$71" → (71, 'USD')
+      "¥10,650"        → (71, 'JPY')   # 150엔 = 1달러 환산
     """
-    s_lower = set_name.lower()
-    
-    for key, value in _SET_MAPPING.items():
-        if key in s_lower:
-            return value
-            
-    return set_name
+    # US $71 또는 $71
+    match = re.search(r'US\s*\$\s*([\d,]+)', price_text)
+    if not match:
+        match = re.search(r'\$\s*([\d,]+)', price_text)
+    if match:
+        return int(match.group(1).replace(',', '')), 'USD'
+
+    # 엔화
+    yen_match = re.search(r'¥\s*([\d,]+)', price_text)
+    if yen_match:
+        return round(int(yen_match.group(1).replace(',', '')) / 150), 'JPY'
+
+    return None
+
+
+# 감정 등급 (회사 + 숫자). 그 외 등급 표기(A, B, ...)는 미감정 카드의 상태 등급.
+_GRADED_RE = re.compile(r'^(psa|bgs|cgc|sgc|ars|ace|tag)\s*\d', re.IGNORECASE)
+
+
+def _price_summary(prices: list[int]) -> dict:
+    prices = sorted(prices)
+    return {
+        'price':      prices[0],
+        'price_str':  f'${prices[0]:,}',
+        'all_prices': prices,
+        'count':      len(prices),
+    }
+
+
+def _grade_summaries(listings: list[dict]) -> dict[str, dict]:
+    """
+    리스팅 목록을 한 번 훑어 등급별 요약 (SOLD 제외, USD).
+    listings: [{'grade': 'PSA 10', 'price_text': 'US $71', 'sold': False, 'href': ...}, ...]
+    감정 등급은 표기 그대로('PSA 10', 'BGS 9.5'), 상태 등급(A, B, ...)은 각각 + RAW_GRADE로 합산.
+    반환: {'PSA 10': {'price', 'price_str', 'all_prices', 'count'}, 'PSA 9': {...}, ...}
+    """
+    by_grade = {}
+    psa10_seen = psa10_sold = 0
+    for item in listings:
+        grade = grade_label(item.get('grade'))
+        if not grade:
+            continue
+        is_psa10 = grade == PSA10_GRADE
+        psa10_seen += is_psa10
+        if item.get('sold'):
+            if is_psa10:
+                psa10_sold += 1
+                print(f"         🚫 SOLD 스킵")
+            continue
+        parsed = _parse_price_text(item.get('price_text') or '')
+        if not parsed or parsed[0] <= 0:
+            continue
+        by_grade.setdefault(grade, []).append(parsed[0])
+        if not _GRADED_RE.match(grade):
+            by_grade.setdefault(RAW_GRADE, []).append(parsed[0])
+        if is_psa10:
+            print(f"         ✅ ${parsed[0]:,}  [{item['price_text']}]")
+    metrics.observe_listings(psa10_seen, psa10_sold)
+
+    summaries = {grade: _price_summary(prices) for grade, prices in sorted(by_grade.items())}
+    if summaries:
+        print("         등급별 최저가: " + ', '.join(
+            f"{grade} ${summary['price']:,}({summary['count']})" for grade, summary in summaries.items()))
+    return summaries
+
+
+def _summarize_prices(prices: list[int]) -> dict | None:
+    """가격 목록 → 결과 dict (없으면 None)"""
+    if not prices:
+        return None
+
+    summary = _price_summary(prices)
+
+    print(f"\n{'='*60}")
+    print(f"  ✅ 최저가 PSA 10: ${summary['price']:,}")
+    print(f"  전체 가격 목록 : {[f'${p:,}' for p in summary['all_prices']]}")
+    print(f"  아이템 수      : {summary['count']}")
+    print(f"{'='*60}\n")
+
+    return summary
+
+
+def _summarize_listings(listings: list[dict], lookup=None) -> dict | None:
+    """
+    리스팅 페이지 하나 → PSA 10 결과 dict (없으면 None).
+    모든 등급 요약은 lookup.grades에 보관 → decorate 시 result['grades'],
+    PSA 10이 없어도 다른 등급은 _scrape_and_save에서 저장.
+    """
+    grades = _grade_summaries(listings)
+    if lookup is not None:
+        lookup.grades = grades
+    return _summarize_prices(grades.get(PSA10_GRADE, {}).get('all_prices', []))
+
+
+# ──────────────────────────────────────────────────────────────
+# 경량 브라우저 프로필 (opt-in: SNKRDUNK_LEAN_BROWSER=1)
+# ──────────────────────────────────────────────────────────────
+# 매칭은 <img alt>/href, 가격은 텍스트만 쓰므로 이미지/폰트/미디어/분석 스크립트는 받을 필요 없음.
+#   - CDP Network.setBlockedURLs로 해당 요청을 네트워크에 내보내기 전에 차단
+#   - pageLoadStrategy 'eager' (DOMContentLoaded에서 driver.get 반환)
+#   - 이미지 렌더링, 백그라운드 네트워킹/번역/동기화 등 불필요한 Chrome 기능 끄기
+#   - 검색 결과 스크롤(지연 로딩 이미지용) 생략
+
+LEAN_BROWSER = os.environ.get('SNKRDUNK_LEAN_BROWSER', '0').lower() not in ('', '0', 'false', 'no')
+
+LEAN_BLOCKED_URLS = (
+    # 이미지
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    # 폰트
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # 미디어
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    # 분석 / 광고
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*connect.facebook.net*', '*hotjar.com*',
+    '*clarity.ms*', '*criteo.*', '*/analytics.js', '*/gtag/js*',
+)
+
+# 단계별로 차단을 풀 패턴. 특정 단계에서 리소스가 실제로 필요해지면 여기(또는 환경변수)에 추가.
+#   SNKRDUNK_LEAN_ALLOW="search=*.webp,*.png;extract=*.svg"
+LEAN_STEP_ALLOW: dict[str, tuple] = {
+    'search':   (),
+    'navigate': (),
+    'extract':  (),
+}
+for _entry in filter(None, os.environ.get('SNKRDUNK_LEAN_ALLOW', '').split(';')):
+    _step, _, _patterns = _entry.partition('=')
+    LEAN_STEP_ALLOW[_step.strip()] = tuple(p.strip() for p in _patterns.split(',') if p.strip())
+
+_LEAN_CHROME_ARGS = (
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-notifications',
+    '--no-first-run',
+    '--mute-audio',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+)
+
+
+def _apply_resource_policy(driver: webdriver.Chrome, step: str):
+    """경량 모드 드라이버에 step의 차단 목록 적용 (이전과 같으면 CDP 호출 생략)"""
+    if not getattr(driver, '_snkrdunk_lean', False):
+        return
+    allow = set(LEAN_STEP_ALLOW.get(step, ()))
+    blocked = [p for p in LEAN_BLOCKED_URLS if p not in allow]
+    if blocked == getattr(driver, '_snkrdunk_blocked', None):
+        return
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked})
+    driver._snkrdunk_blocked = blocked
 
 
 # ──────────────────────────────────────────────────────────────
 # 드라이버 초기화
 # ──────────────────────────────────────────────────────────────
 
-def _build_driver(headless: bool = True) -> webdriver.Chrome:
-    options = Options()
-    if headless:
-        options.add_argument('--headless=new')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_argument(
-        '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-        'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    )
-    options.add_experimental_option('excludeSwitches', ['enable-automation'])
-    options.add_experimental_option('useAutomationExtension', False)
+def _build_driver(headless: bool = True, lean: bool | None = None) -> webdriver.Chrome:
+    """Chrome 기동 (기동 시간/WebDriver 명령 수 계측 포함). lean=None이면 SNKRDUNK_LEAN_BROWSER."""
+    lean = LEAN_BROWSER if lean is None else lean
+    with metrics.step('driver_start', 'selenium'):
+        driver = _start_chrome(headless, lean)
+    return metrics.instrument_driver(driver)
+
+
+# chromedriver 경로 캐시.
+# ChromeDriverManager().install()은 버전 확인용 네트워크 요청을 하고, THIRD_PARTY_NOTICES 경로 버그 시
+# 캐시 디렉터리 전체를 os.walk + chmod 함 → 한 번 찾은 경로를 Chrome 버전 지문과 함께 파일에 저장하고
+# 프로세스 안에서는 메모이즈. Chrome이 업데이트되거나 바이너리가 바뀌면 다시 찾음.
+CHROMEDRIVER_PATH = os.environ.get('SNKRDUNK_CHROMEDRIVER')
+DRIVER_CACHE_FILE = os.environ.get(
+    'SNKRDUNK_DRIVER_CACHE',
+    os.path.join(os.path.expanduser('~'), '.wdm', 'snkrdunk_chromedriver.json'),
+)
+_CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')
+
+_driver_path_resolved = False
+_driver_path: str | None = None
+_driver_path_lock = threading.Lock()
+
+
+def _chrome_version() -> str | None:
+    """설치된 Chrome 버전 (예: '120.0.6099.109'). 찾지 못하면 None."""
+    binary = os.environ.get('CHROME_BIN') or next(filter(None, map(shutil.which, _CHROME_BINARIES)), None)
+    if not binary:
+        return None
+    try:
+        out = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r'\d+(?:\.\d+){1,3}', out)
+    return match.group(0) if match else None
+
+
+def _driver_fingerprint(path: str, chrome_version: str | None) -> dict:
+    stat = os.stat(path)
+    return {
+        'path':           path,
+        'chrome_version': chrome_version,
+        'size':           stat.st_size,
+        'mtime':          int(stat.st_mtime),
+    }
+
 
+def _load_cached_driver(chrome_version: str | None) -> str | None:
+    try:
+        with open(DRIVER_CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+        path = cached['path']
+        if os.access(path, os.X_OK) and _driver_fingerprint(path, chrome_version) == cached:
+            return path
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _save_cached_driver(path: str, chrome_version: str | None):
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+        tmp = f'{DRIVER_CACHE_FILE}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(_driver_fingerprint(path, chrome_version), f)
+        os.replace(tmp, DRIVER_CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️ chromedriver 경로 캐시 저장 실패: {e}")
+
+
+def _install_chromedriver() -> str | None:
+    """ChromeDriverManager로 chromedriver 바이너리 경로 확보. 실패하면 None."""
     # [Fix for Docker/Render]
     # webdriver-manager sometimes points to 'THIRD_PARTY_NOTICES.chromedriver' (text file)
     # instead of the actual binary. We must ensure we point to the executable.
@@ -211,20 +448,83 @@ def _build_driver(headless: bool = True) -> webdriver.Chrome:
             except Exception:
                 pass
 
-        service = Service(driver_path)
+        return driver_path
     except Exception as e:
         print(f"⚠️ WebDriver Manager Error: {e}")
         # Fallback to system-installed chromedriver (since we installed google-chrome-stable)
         print("Using system default chromedriver...")
-        service = Service() # Expects 'chromedriver' in PATH
+        return None  # Expects 'chromedriver' in PATH
+
+
+def resolve_chromedriver(refresh: bool = False) -> str | None:
+    """
+    chromedriver 경로 (None이면 PATH의 chromedriver 사용).
+    SNKRDUNK_CHROMEDRIVER → 프로세스 메모 → DRIVER_CACHE_FILE(지문 일치 시) → ChromeDriverManager 순.
+    """
+    global _driver_path_resolved, _driver_path
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+    with _driver_path_lock:
+        if _driver_path_resolved and not refresh:
+            return _driver_path
+
+        chrome_version = _chrome_version()
+        path = None if refresh else _load_cached_driver(chrome_version)
+        if path is None:
+            path = _install_chromedriver()
+            if path and os.access(path, os.X_OK):
+                _save_cached_driver(path, chrome_version)
+                print(f"💾 chromedriver 경로 캐시: {path} (Chrome {chrome_version})")
+
+        _driver_path, _driver_path_resolved = path, True
+        return path
+
+
+def _start_chrome(headless: bool, lean: bool = False) -> webdriver.Chrome:
+    options = Options()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument(
+        '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    )
+    options.add_experimental_option('excludeSwitches', ['enable-automation'])
+    options.add_experimental_option('useAutomationExtension', False)
+    if lean:
+        options.page_load_strategy = 'eager'
+        for arg in _LEAN_CHROME_ARGS:
+            options.add_argument(arg)
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+
+    driver_path = resolve_chromedriver()
+    # None이면 PATH의 chromedriver 사용 (google-chrome-stable과 함께 설치됨)
+    service = Service(driver_path) if driver_path else Service()
 
     driver = webdriver.Chrome(service=service, options=options)
     driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
         'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
     })
+    if lean:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver._snkrdunk_lean = True
+        _apply_resource_policy(driver, 'search')
     return driver
 
 
+def _capture_page(driver: webdriver.Chrome, kind: str, pokemon_name: str = '', lookup=None):
+    """현재 DOM을 스냅샷으로 보관 (꺼져 있으면 page_source 왕복도 생략)"""
+    if snapshots.SNAPSHOTS_ENABLED:
+        snapshots.capture(kind, driver.current_url, driver.page_source, 'selenium',
+                          pokemon_name=pokemon_name, lookup=lookup)
+
+
 # ──────────────────────────────────────────────────────────────
 # Step 1: 포켓몬 이름으로 검색
 # ──────────────────────────────────────────────────────────────
@@ -234,29 +534,31 @@ def _search_cards(driver: webdriver.Chrome, pokemon_name: str):
     https://snkrdunk.com/en/search 에서 pokemon_name으로 검색.
     검색 결과 페이지를 로드하고 스크롤하여 모든 이미지를 로드한 후 현재 URL을 반환.
     """
-    search_url = f"https://snkrdunk.com/en/search/result?keyword={pokemon_name}"
+    search_url = f"{SNKRDUNK_BASE_URL}/en/search/result?keyword={pokemon_name}"
     print(f"[Step 1] 검색 URL: {search_url}")
     driver.get(search_url)
 
     # 결과 로드 대기
     try:
-        WebDriverWait(driver, 10).until(
+        WebDriverWait(driver, STEP_TIMEOUTS['search'], poll_frequency=0.1).until(
             EC.presence_of_element_located((By.CLASS_NAME, 'product__item-name'))
         )
     except Exception:
         # product__item-name이 없어도 계속 진행 (페이지 구조 다를 수 있음)
-        time.sleep(3)
+        wait_for_dom_quiet(driver, step='search')
+
+    if getattr(driver, '_snkrdunk_lean', False):
+        # 이미지를 받지 않으므로 지연 로딩용 스크롤 불필요 (alt/href는 DOM에 이미 있음)
+        _capture_page(driver, 'search', pokemon_name=pokemon_name)
+        return driver.current_url
 
-    # 스크롤하여 더 많은 이미지 로드
+    # 스크롤하여 더 많은 이미지 로드 (개수가 더 늘지 않으면 즉시 종료, 끝나면 맨 위로)
     print(f"[Step 1] 스크롤하여 이미지 로드 중...")
-    for i in range(5):  # 5번 스크롤
-        driver.execute_script(f"window.scrollTo(0, {(i+1)*800});")
-        time.sleep(1)
-    
-    # 다시 위로 올라가서 전체 페이지 확인
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
+    loaded = scroll_until_stable(driver, 'img[alt], .product__item-name',
+                                 step='search_scroll', step_px=800, max_scrolls=5)
+    print(f"         로드된 항목 수: {loaded['count']} (스크롤 {loaded['scrolls']}회)")
 
+    _capture_page(driver, 'search', pokemon_name=pokemon_name)
     return driver.current_url
 
 
@@ -264,11 +566,40 @@ def _search_cards(driver: webdriver.Chrome, pokemon_name: str):
 # Step 2: product__item-name에서 정확한 카드 매칭
 # ──────────────────────────────────────────────────────────────
 
+# 검색 결과의 매칭 후보를 한 번의 execute_script로 수집.
+#   - source 'alt' : <img alt> 텍스트 + 가장 가까운 조상 <a href>
+#   - source 'name': .product__item-name 텍스트 + 가장 가까운 조상 <a href>
+_JS_HARVEST_CANDIDATES = r"""
+const out = [];
+for (const img of document.querySelectorAll('img')) {
+    const alt = img.getAttribute('alt');
+    if (!alt) continue;
+    const link = img.closest('a[href]');
+    out.push({text: alt, href: link ? link.getAttribute('href') : null, source: 'alt'});
+}
+for (const item of document.getElementsByClassName('product__item-name')) {
+    const link = item.closest('a[href]');
+    out.push({
+        text: (item.innerText || item.textContent || '').trim(),
+        href: link ? link.getAttribute('href') : null,
+        source: 'name',
+    });
+}
+return out;
+"""
+
+
+def _harvest_candidates(driver: webdriver.Chrome) -> list[dict]:
+    """검색 결과 페이지의 (텍스트, href) 후보 목록"""
+    return driver.execute_script(_JS_HARVEST_CANDIDATES) or []
+
+
 def _find_card_link(driver: webdriver.Chrome,
                     card_name: str,
                     set_name: str,
                     card_number: str,
-                    pokemon_name: str) -> str | None:
+                    pokemon_name: str,
+                    lookup=None) -> str | None:
     """
     검색 결과에서 pokemon name 기준으로 카드 매칭.
     
@@ -277,6 +608,8 @@ def _find_card_link(driver: webdriver.Chrome,
       2. Card 번호 매칭 (XX/YY 형식 지원)
       3. Card 이름 매칭
 
+    후보 수집은 브라우저에서 한 번에, 점수 계산은 _match_candidates(순수 함수)에서.
+
     반환: 매칭된 카드 상세 페이지 URL 또는 None
     """
     print(f"[Step 2] 카드 매칭 중...")
@@ -284,146 +617,54 @@ def _find_card_link(driver: webdriver.Chrome,
     print(f"         Pokemon    : {pokemon_name}")
     print(f"         Set        : {set_name}")
     print(f"         Card Number: {card_number}")
-
-    def normalize(text: str) -> str:
-        return re.sub(r'\s+', ' ', text).strip().lower()
-
-    cn = normalize(card_name)
-    pn = normalize(pokemon_name)
-    sn = normalize(set_name)
-    
-    # 세트 이름 매핑 적용 (예: Neo 4 -> Destiny)
-    mapped_set = map_set_name(set_name)
-    mapped_sn = normalize(mapped_set)
-    
-    num = card_number.strip()
-
-    # 세트 이름에서 의미 있는 토큰만 추출
-    _generic = {'pokemon', 'japanese', 'english', 'card', 'cards', 'tcg', 'the', 'neo'}
-    # 매핑된 이름과 원본 이름 모두 토큰화해 사용
-    set_tokens = set(
-        [t for t in sn.split() if t not in _generic and len(t) > 1] +
-        [t for t in mapped_sn.split() if t not in _generic and len(t) > 1]
-    )
-    
-    print(f"         Set Tokens : {set_tokens}")
-
-    # 1단계: 이미지 alt 텍스트로 먼저 시도 (XX/YY 형식 지원)
-    print(f"         이미지 alt 텍스트로 매칭 시작...")
-    images = driver.find_elements(By.TAG_NAME, "img")
-    print(f"         검색된 이미지 수: {len(images)}")
-
-    best_match = None
-    best_score = 0
-
-    for img in images:
-        alt_text = img.get_attribute('alt')
-        if not alt_text:
-            continue
-            
-        alt_normalized = normalize(alt_text)
-
-        # Pokemon 이름으로 기본 필터링
-        if pn not in alt_normalized:
-            continue
-
-        # 우선순위 매칭
-        has_set = any(t in alt_normalized for t in set_tokens) if set_tokens else False
-        has_card_name = cn in alt_normalized
-        
-        # 카드 번호 매칭 (XX/YY 형식에서 앞 두 자리만 추출)
-        has_number = False
-        if num:
-            card_number_matches = re.findall(r'(\d{2,3})/\d{2,3}', alt_text)
-            for match in card_number_matches:
-                if num in match or match in num:
-                    has_number = True
-                    break
-            # 직접 번호 매칭도 시도
-            if not has_number and num in alt_text:
-                has_number = True
-
-        # 점수 계산 (Set: 3점, Number: 2점, Card Name: 1점)
-        score = 0
-        if has_set:
-            score += 3
-        if has_number:
-            score += 2
-        if has_card_name:
-            score += 1
-
-        if score > best_score:
-            best_score = score
-            best_match = (img, alt_text, has_set, has_number, has_card_name)
-
-    # 최고 점수 매칭 반환
-    if best_match and best_score > 0:
-        img, alt_text, has_set, has_number, has_card_name = best_match
-        print(f"         ✅ 최고 매칭 (점수 {best_score}): {alt_text[:80]}")
-        print(f"            Set: {has_set}, Number: {has_number}, Card: {has_card_name}")
-        try:
-            link_el = img.find_element(By.XPATH, "./ancestor::a[@href][1]")
-            href = link_el.get_attribute('href')
-            if href:
-                if not href.startswith('http'):
-                    href = 'https://snkrdunk.com' + href
-                print(f"         URL: {href}")
-                return href
-        except Exception:
-            pass
-
-    # 2단계: product__item-name으로 fallback
-    print(f"         ⚠️ 이미지 alt 텍스트 매칭 실패, product__item-name으로 시도...")
-    items = driver.find_elements(By.CLASS_NAME, 'product__item-name')
-    print(f"         검색된 product__item-name 수: {len(items)}")
-
-    for item in items:
-        item_text = normalize(item.text)
-        
-        # Pokemon 이름으로 기본 필터링
-        if pn not in item_text:
-            continue
-
-        # 우선순위 매칭
-        has_set = any(t in item_text for t in set_tokens) if set_tokens else False
-        has_number = num in item_text if num else False
-        has_card_name = cn in item_text
-
-        # 점수 계산 (Set: 3점, Number: 2점, Card Name: 1점)
-        score = 0
-        if has_set:
-            score += 3
-        if has_number:
-            score += 2
-        if has_card_name:
-            score += 1
-
-        if score > 0:
-            print(f"         ✅ 매칭 (점수 {score}): {item.text[:80]}")
-            print(f"            Set: {has_set}, Number: {has_number}, Card: {has_card_name}")
-            try:
-                link_el = item.find_element(By.XPATH, "./ancestor::a[@href][1]")
-                href = link_el.get_attribute('href')
-                if href:
-                    if not href.startswith('http'):
-                        href = 'https://snkrdunk.com' + href
-                    print(f"         URL: {href}")
-                    return href
-            except Exception:
-                pass
+    print(f"         Set Tokens : {_set_tokens(set_name)}")
+
+    candidates = _harvest_candidates(driver)
+    alt_count = sum(1 for c in candidates if c['source'] == 'alt')
+    print(f"         검색된 이미지 수: {alt_count}")
+    print(f"         검색된 product__item-name 수: {len(candidates) - alt_count}")
+
+    match = _match_candidates(candidates, card_name, set_name, card_number, pokemon_name)
+    if lookup is not None:
+        lookup.match = match
+        if not match:
+            lookup.record_miss('not_found', candidates)
+    if match:
+        print(f"         ✅ 매칭 (점수 {match['score']}, {match['source']}): {match['text'][:80]}")
+        print(f"            Set: {match['has_set']}, Number: {match['has_number']}, "
+              f"Card: {match['has_card_name']}")
+        print(f"         URL: {match['href']}")
+        return match['href']
 
     # 매칭 실패 시 디버그 출력
     print(f"         ❌ 매칭 실패. 전체 product__item-name 목록:")
-    for item in items[:10]:
-        print(f"            - {item.text[:80]}")
+    for cand in [c for c in candidates if c['source'] == 'name'][:10]:
+        print(f"            - {cand['text'][:80]}")
 
     return None
 
 
 # ──────────────────────────────────────────────────────────────
-# Step 3: See More 클릭 → /used?slide=right 이동
+# Step 3: /used?slide=right 이동 (URL 직접 이동, 실패 시 See More 클릭)
 # ──────────────────────────────────────────────────────────────
 
+def _open_used_listings(driver: webdriver.Chrome, card_url: str) -> bool:
+    """
+    카드 URL에서 /en/trading-cards/{id}/used?slide=right 를 만들어 바로 이동.
+    상세 페이지 로드 + See More 클릭 과정을 생략.
+    URL 패턴이 맞지 않으면 기존 See More 클릭 방식으로 fallback.
+    """
+    used_url = _used_listings_url(card_url)
+    if not used_url:
+        print(f"[Step 3] ⚠️ 카드 URL 패턴 불일치 — See More 클릭으로 진행")
+        return _click_see_more(driver, card_url)
+
+    print(f"[Step 3] 리스팅 페이지로 직접 이동: {used_url}")
+    driver.get(used_url)
+    wait_for_ready_state(driver, step='navigate')
+    return True
+
+
 def _click_see_more(driver: webdriver.Chrome, card_url: str) -> bool:
     """
     카드 상세 페이지에서 See More 링크를 클릭.
@@ -433,7 +674,6 @@ def _click_see_more(driver: webdriver.Chrome, card_url: str) -> bool:
     """
     print(f"[Step 3] 카드 상세 페이지 로드: {card_url}")
     driver.get(card_url)
-    time.sleep(3)
 
     # <a class="arrow"> See More </a> 탐색
     selectors = [
@@ -442,6 +682,14 @@ def _click_see_more(driver: webdriver.Chrome, card_url: str) -> bool:
         "//a[contains(normalize-space(text()),'See More')]",
     ]
 
+    # See More 후보가 나타날 때까지만 대기
+    try:
+        WebDriverWait(driver, STEP_TIMEOUTS['detail'], poll_frequency=0.1).until(
+            lambda d: d.find_elements(By.XPATH, ' | '.join(selectors))
+        )
+    except Exception:
+        pass
+
     for sel in selectors:
         els = driver.find_elements(By.XPATH, sel)
         for el in els:
@@ -451,9 +699,12 @@ def _click_see_more(driver: webdriver.Chrome, card_url: str) -> bool:
                 driver.execute_script(
                     "arguments[0].scrollIntoView({block:'center'});", el
                 )
-                time.sleep(0.5)
+                before_url = driver.current_url
                 driver.execute_script("arguments[0].click();", el)
-                time.sleep(4)
+                if wait_for_url_change(driver, before_url, step='navigate'):
+                    wait_for_ready_state(driver, step='navigate')
+                else:
+                    wait_for_dom_quiet(driver, step='navigate')
                 print(f"         현재 URL: {driver.current_url}")
                 return True
 
@@ -463,119 +714,143 @@ def _click_see_more(driver: webdriver.Chrome, card_url: str) -> bool:
 # Step 4: SOLD 제외, PSA 10 최저가 추출
 # ──────────────────────────────────────────────────────────────
 
-def _extract_cheapest_psa10(driver: webdriver.Chrome) -> dict | None:
-    print(f"[Step 4] PSA 10 최저가 추출 중...")
-
-    for i in range(6):
-        driver.execute_script(f"window.scrollTo(0, {(i + 1) * 900});")
-        time.sleep(0.8)
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(1)
+# 리스팅 페이지의 모든 등급 요소를 한 번의 execute_script로 수집.
+# 컨테이너/SOLD/가격 규칙은 기존 XPath 방식과 동일:
+#   - 컨테이너: class에 product__item 또는 item-- 포함, 또는 <li> (없으면 3단계 위 조상)
+#   - SOLD    : 컨테이너 HTML에 'label-sold' 또는 ' SOLD ' 포함
+#   - 가격    : 컨테이너 안 p.price 중 통화 기호 + 숫자가 있는 첫 번째 텍스트
+_JS_EXTRACT_LISTINGS = r"""
+const isContainer = (el) => {
+    const cls = el.getAttribute('class') || '';
+    return cls.includes('product__item') || cls.includes('item--') || el.localName === 'li';
+};
+const norm = (t) => (t || '').replace(/\s+/g, ' ').trim();
+const out = [];
+for (const gradeEl of document.querySelectorAll('p[class*="evaluation"]')) {
+    let container = gradeEl.parentElement;
+    while (container && !isContainer(container)) container = container.parentElement;
+    if (!container) {
+        container = gradeEl;
+        for (let i = 0; i < 3 && container.parentElement; i++) container = container.parentElement;
+    }
+    const html = container.outerHTML;
+    let priceText = '';
+    for (const p of container.querySelectorAll('p[class*="price"]')) {
+        const t = norm(p.innerText);
+        if (/[$¥]\s*[\d,]+/.test(t)) { priceText = t; break; }
+    }
+    const link = container.closest('a[href]') || container.querySelector('a[href]');
+    out.push({
+        grade: norm(gradeEl.textContent),
+        price_text: priceText,
+        sold: html.includes('label-sold') || html.includes(' SOLD '),
+        href: link ? link.href : null,
+    });
+}
+return out;
+"""
 
-    psa10_elements = driver.find_elements(
-        By.XPATH,
-        "//p[contains(@class,'evaluation') and normalize-space(text())='PSA 10']"
-    )
-    print(f"         전체 PSA 10 요소 수: {len(psa10_elements)}")
 
-    prices = []
+def _extract_cheapest_psa10(driver: webdriver.Chrome, lookup=None) -> dict | None:
+    """PSA 10 결과 dict. 같은 페이지의 다른 등급 요약은 lookup.grades로 (_summarize_listings)"""
+    print(f"[Step 4] PSA 10 최저가 추출 중...")
 
-    for psa10_el in psa10_elements:
-        try:
-            # ── 핵심: PSA 10 기준으로 가장 가까운 조상 컨테이너 찾기 ──
-            # ancestor 중 product__item, item--, li 등 아이템 단위 컨테이너
-            try:
-                container = psa10_el.find_element(
-                    By.XPATH,
-                    "ancestor::*[contains(@class,'product__item') "
-                    "or contains(@class,'item--') "
-                    "or local-name()='li'][1]"
-                )
-            except Exception:
-                # 컨테이너를 못 찾으면 부모 3단계 위까지
-                container = psa10_el.find_element(By.XPATH, "ancestor::*[3]")
-
-            # ── SOLD 체크 방법 1: 컨테이너 내 label-sold 직접 탐색 ──
-            sold_check = container.find_elements(
-                By.XPATH,
-                ".//*[contains(@class,'label-sold')]"
-            )
-            if sold_check:
-                print(f"         🚫 SOLD 스킵 (label-sold 발견)")
-                continue
-
-            # ── SOLD 체크 방법 2: outerHTML에서 텍스트로 확인 ──
-            # (클래스명이 다를 경우 대비)
-            container_html = container.get_attribute('outerHTML') or ''
-            if 'label-sold' in container_html or ' SOLD ' in container_html:
-                print(f"         🚫 SOLD 스킵 (HTML 텍스트 확인)")
-                continue
-
-            # ── 가격 추출 ──
-            price_els = container.find_elements(
-                By.XPATH,
-                ".//p[contains(@class,'price')]"
-            )
-
-            for price_el in price_els:
-                price_text = price_el.text.strip()
-
-                # US $71 또는 $71
-                match = re.search(r'US\s*\$\s*([\d,]+)', price_text)
-                if not match:
-                    match = re.search(r'\$\s*([\d,]+)', price_text)
-                if match:
-                    price = int(match.group(1).replace(',', ''))
-                    if price > 0:
-                        prices.append(price)
-                        print(f"         ✅ ${price:,}  [{price_text}]")
-                    break
+    scroll_until_stable(driver, 'p.evaluation', step='listing_scroll',
+                        step_px=900, max_scrolls=6)
+    _capture_page(driver, 'listing', lookup=lookup)
 
-                # 엔화
-                yen_match = re.search(r'¥\s*([\d,]+)', price_text)
-                if yen_match:
-                    usd = round(int(yen_match.group(1).replace(',', '')) / 150)
-                    if usd > 0:
-                        prices.append(usd)
-                        print(f"         ✅ ${usd:,} (¥환산)  [{price_text}]")
-                    break
+    # 한 번의 왕복으로 모든 리스팅 수집 → 등급/SOLD/통화 필터링은 Python에서
+    listings = driver.execute_script(_JS_EXTRACT_LISTINGS) or []
+    psa10_count = sum(1 for item in listings if _normalize(item['grade']) == 'psa 10')
+    print(f"         전체 PSA 10 요소 수: {psa10_count}")
 
-        except Exception as e:
-            print(f"         ⚠️ 오류: {e}")
-            continue
+    result = _summarize_listings(listings, lookup)
 
-    if not prices:
+    if not result:
         print("         ❌ PSA 10 아이템 없음 — 디버그 파일 저장")
         driver.save_screenshot('snkrdunk_debug.png')
         with open('snkrdunk_debug.html', 'w', encoding='utf-8') as f:
             f.write(driver.page_source)
         return None
 
-    prices.sort()
-    cheapest = prices[0]
-
-    print(f"\n{'='*60}")
-    print(f"  ✅ 최저가 PSA 10: ${cheapest:,}")
-    print(f"  전체 가격 목록 : {[f'${p:,}' for p in prices]}")
-    print(f"  아이템 수      : {len(prices)}")
-    print(f"{'='*60}\n")
-
-    return {
-        'price':      cheapest,
-        'price_str':  f'${cheapest:,}',
-        'all_prices': prices,
-        'count':      len(prices),
-    }
+    return result
 
 
 # ──────────────────────────────────────────────────────────────
 # 메인 함수
 # ──────────────────────────────────────────────────────────────
 
+# 음성 캐시에 남길 후보 수
+MISS_CANDIDATE_LIMIT = 20
+
+
+class StaleResolution(Exception):
+    """캐시된 카드 URL이 404이거나 다른 카드 페이지로 연결됨"""
+
+
+class _Lookup:
+    """카드 한 장 조회 동안 엔진/단계 사이에 공유되는 상태"""
+
+    def __init__(self, card_name: str, set_name: str, card_number: str, pokemon_name: str):
+        self.card_name = card_name
+        self.set_name = set_name
+        self.card_number = card_number
+        self.pokemon_name = pokemon_name
+        self.card_url = None      # 캐시에서 가져온 카드 상세 URL (있으면 Step 1~2 생략)
+        self.from_cache = False
+        self.match = None         # 이번 조회에서 새로 매칭된 _match_candidates 결과
+        self.miss_reason = None   # 결과가 없을 때 이유: 'not_found' | 'no_psa10' (음성 캐시에 저장)
+        self.miss_candidates = [] # 'not_found'일 때 검토한 검색 후보
+        self.miss_url = None      # 'no_psa10'일 때 확인한 리스팅 페이지
+        self.grades = {}          # 리스팅 페이지의 등급별 요약 (_grade_summaries)
+
+    def record_miss(self, reason: str, candidates: list[dict] | None = None, url: str | None = None):
+        self.miss_reason = reason
+        self.miss_url = url
+        self.miss_candidates = []
+        seen = set()
+        for cand in candidates or []:
+            text = (cand.get('text') or '').strip()
+            if text and text not in seen and len(self.miss_candidates) < MISS_CANDIDATE_LIMIT:
+                seen.add(text)
+                self.miss_candidates.append({'text': text[:120], 'href': cand.get('href')})
+
+    def clear_miss(self):
+        self.miss_reason = None
+        self.miss_candidates = []
+        self.miss_url = None
+
+    def decorate(self, result: dict | None, engine: str) -> dict | None:
+        if result:
+            result['card_name']    = self.card_name
+            result['pokemon_name'] = self.pokemon_name
+            result['set_name']     = self.set_name
+            result['card_number']  = self.card_number
+            result['engine']       = engine
+            result['resolved_from_cache'] = self.from_cache
+            result['grades']       = self.grades
+        return result
+
+
+def _listing_page_matches(title: str, pokemon_name: str) -> bool:
+    """캐시된 URL로 이동한 페이지가 404가 아니고 같은 포켓몬 카드인지 확인"""
+    t = _normalize(title or '')
+    if '404' in t or 'not found' in t:
+        return False
+    if not t:
+        return True
+    return _normalize(pokemon_name) in t
+
+
 def get_cheapest_psa10(card_name: str,
                        set_name: str,
                        card_number: str,
-                       headless: bool = True) -> dict | None:
+                       headless: bool = True,
+                       driver: webdriver.Chrome | None = None,
+                       pool=None,
+                       engine: str = DEFAULT_ENGINE,
+                       use_cache: bool = True,
+                       ignore_miss_reasons: tuple = ()) -> dict | None:
     """
     SNKRDUNK에서 PSA 10 최저가 아이템을 찾아 반환.
 
@@ -583,7 +858,17 @@ def get_cheapest_psa10(card_name: str,
         card_name   : Sylveon Agent가 제공한 Card Name (예: "GENGAR-HOLO")
         set_name    : 세트명 (예: "POKEMON JAPANESE FOSSIL")
         card_number : 카드 번호 (예: "94")
-        headless    : 브라우저 headless 모드 여부
+        headless    : 브라우저 headless 모드 여부 (driver/pool 미지정 시에만 사용)
+        driver      : 이미 빌려온 드라이버. 지정 시 종료하지 않고 그대로 사용
+        pool        : DriverPool. 지정 시 풀에서 드라이버를 빌리고 반납
+        engine      : 'auto'     - HTTP 엔진 먼저, 결과 없으면 Selenium fallback
+                      'http'     - HTTP 엔진만 (브라우저 없음)
+                      'selenium' - Selenium만
+        use_cache   : card_resolutions 테이블의 카드 URL 캐시 사용 여부
+                      (적중 시 검색/매칭 단계를 건너뛰고 리스팅 페이지로 바로 이동)
+                      + card_misses 음성 캐시 (TTL 안에 다시 조회하면 바로 None)
+        ignore_miss_reasons : 이 이유의 음성 캐시는 무시하고 조회 (예: ('no_psa10',) —
+                      PSA 10이 없어도 같은 페이지의 다른 등급을 갱신해야 할 때)
 
     Returns:
         {
@@ -594,9 +879,25 @@ def get_cheapest_psa10(card_name: str,
             'url':         '...',        # 최종 페이지 URL
             'card_name':   'GENGAR-HOLO',
             'pokemon_name':'Gengar',
+            'engine':      'http',       # 결과를 만든 엔진 ('http' | 'selenium')
+            'resolved_from_cache': True, # 카드 URL 캐시 적중 여부
+            'grades': {                  # 같은 리스팅 페이지의 등급별 요약 (SOLD 제외)
+                'PSA 10': {'price': 71, 'price_str': '$71', 'all_prices': [...], 'count': 3},
+                'PSA 9':  {...}, 'BGS 10': {...}, 'A': {...}, 'Raw': {...},   # Raw = 상태 등급 합산
+            },
         }
-        또는 None (카드를 찾지 못한 경우)
+        또는 None (카드를 찾지 못했거나 PSA 10 리스팅이 없는 경우)
     """
+    return _lookup_card(card_name, set_name, card_number, headless, driver, pool, engine,
+                        use_cache, ignore_miss_reasons)[1]
+
+
+def _lookup_card(card_name, set_name, card_number, headless, driver, pool, engine,
+                 use_cache, ignore_miss_reasons=()) -> tuple[_Lookup | None, dict | None]:
+    """get_cheapest_psa10 본체. (_Lookup, 결과) — PSA 10이 없어도 lookup.grades는 남음."""
+    if engine not in ('auto', 'http', 'selenium'):
+        raise ValueError(f"Unknown engine: {engine}")
+
     pokemon_name = extract_pokemon_name(card_name)
 
     print(f"\n{'='*60}")
@@ -608,34 +909,200 @@ def get_cheapest_psa10(card_name: str,
     print(f"  Card Number : {card_number}")
     print(f"{'='*60}\n")
 
+    if use_cache:
+        miss = get_card_miss(card_name, set_name, card_number)
+        metrics.cache_result('negative', 'hit' if miss else 'miss')
+        if miss and miss['reason'] in ignore_miss_reasons:
+            print(f"⚡ 음성 캐시 무시 ({miss['reason']}) — 다른 등급 갱신을 위해 조회")
+        elif miss:
+            print(f"⚡ 음성 캐시 적중 ({miss['reason']}) — {miss['expires_in']}초 후 재시도 가능")
+            return None, None
+
+    lookup = _Lookup(card_name, set_name, card_number, pokemon_name)
+    if use_cache:
+        _apply_cached_resolution(lookup)
+
+    return lookup, _execute_lookup(lookup, engine, driver, pool, headless, use_cache)
+
+
+def _apply_cached_resolution(lookup: _Lookup) -> bool:
+    cached = get_card_resolution(lookup.card_name, lookup.set_name, lookup.card_number)
+    metrics.cache_result('resolution', 'hit' if cached else 'miss')
+    if not cached:
+        return False
+    lookup.card_url = cached['card_url']
+    lookup.from_cache = True
+    print(f"⚡ 카드 URL 캐시 적중 (점수 {cached['match_score']}): {lookup.card_url}")
+    return True
+
+
+def _execute_lookup(lookup: _Lookup,
+                    engine: str,
+                    driver,
+                    pool,
+                    headless: bool,
+                    use_cache: bool) -> dict | None:
+    """조회 1건 실행 + 트레이스 기록"""
+    trace = metrics.start_trace(card_name=lookup.card_name, set_name=lookup.set_name,
+                                card_number=lookup.card_number, pokemon_name=lookup.pokemon_name,
+                                requested_engine=engine)
+    try:
+        result = _execute_engines(lookup, engine, driver, pool, headless, use_cache)
+    except Exception as e:
+        _finish_trace(trace, lookup, {'error': str(e)})
+        raise
+    _finish_trace(trace, lookup, result)
+    return result
+
+
+def _finish_trace(trace, lookup: _Lookup, result: dict | None):
+    if result and 'error' not in result:
+        outcome = 'ok'
+    elif result:
+        outcome = 'error'
+    else:
+        outcome = lookup.miss_reason or 'not_found'
+    engine = (result or {}).get('engine') or trace.record['requested_engine']
+
+    metrics.LOOKUPS.inc(engine=engine, outcome=outcome)
+    if lookup.match:
+        metrics.MATCH_SCORE.observe(lookup.match['score'])
+    with_match = {'match_score': lookup.match['score']} if lookup.match else {}
+    metrics.STEP_SECONDS.observe(trace.elapsed(), engine=engine, step='total')
+    metrics.end_trace(trace, engine=engine, outcome=outcome, resolved_from_cache=lookup.from_cache,
+                      price=(result or {}).get('price'), error=(result or {}).get('error'),
+                      **with_match)
+
+
+def _execute_engines(lookup: _Lookup,
+                     engine: str,
+                     driver,
+                     pool,
+                     headless: bool,
+                     use_cache: bool) -> dict | None:
+    """엔진 실행 + 캐시 무효화/재시도 + 매칭 결과 저장"""
+    try:
+        result = _dispatch(lookup, engine, driver, pool, headless)
+    except StaleResolution as e:
+        _drop_stale_resolution(lookup, e)
+        result = _dispatch(lookup, engine, driver, pool, headless)
+
+    if use_cache:
+        _record_outcome(lookup, result)
+    return result
+
+
+def _drop_stale_resolution(lookup: _Lookup, reason: Exception):
+    """무효한 카드 URL 캐시 삭제 → 다음 시도는 검색부터"""
+    print(f"⚠️ 캐시된 카드 URL 무효 ({reason}) — 캐시 삭제 후 검색부터 다시 시도")
+    invalidate_card_resolution(lookup.card_name, lookup.set_name, lookup.card_number)
+    lookup.card_url = None
+    lookup.from_cache = False
+    lookup.match = None
+    lookup.clear_miss()
+
+
+def _record_outcome(lookup: _Lookup, result: dict | None):
+    """조회 결과를 음성 캐시 / 카드 URL 캐시에 반영 (엔진 공통)"""
+    if result and 'error' not in result:
+        clear_card_miss(lookup.card_name, lookup.set_name, lookup.card_number)
+    elif not result and lookup.miss_reason:
+        save_card_miss(lookup)
+
+    if lookup.match:
+        save_card_resolution(lookup.card_name, lookup.set_name, lookup.card_number,
+                             lookup.match['href'], lookup.match['score'], lookup.match['text'])
+    elif lookup.from_cache and result and 'error' not in result:
+        touch_card_resolution(lookup.card_name, lookup.set_name, lookup.card_number)
+
+
+def _dispatch(lookup: _Lookup, engine: str, driver, pool, headless: bool) -> dict | None:
+    """엔진 선택 및 드라이버 확보"""
+    if engine in ('auto', 'http'):
+        result = _run_http_pipeline(lookup)
+        if result or engine == 'http':
+            return result
+        print("⚠️ HTTP 엔진 결과 없음 — Selenium으로 재시도")
+        # 미발견 이유는 Selenium 결과 기준으로 다시 판단
+        lookup.clear_miss()
+
+    if driver is not None:
+        return _run_pipeline(driver, lookup)
+
+    if pool is not None:
+        with pool.driver() as pooled_driver:
+            return _run_pipeline(pooled_driver, lookup)
+
     driver = _build_driver(headless=headless)
 
     try:
-        # Step 1: 포켓몬 이름으로 검색
-        _search_cards(driver, pokemon_name)
+        return _run_pipeline(driver, lookup)
+    finally:
+        driver.quit()
+        print("👋 브라우저 종료")
+
+
+def _run_http_pipeline(lookup: _Lookup) -> dict | None:
+    """브라우저 없이 Step 1~4 실행. 실패/미발견 시 None."""
+    from snkrdunk_http_engine import get_cheapest_psa10_http
+
+    try:
+        result = get_cheapest_psa10_http(lookup)
+    except StaleResolution:
+        raise
+    except Exception as e:
+        print(f"⚠️ HTTP 엔진 오류: {e}")
+        return None
 
-        # Step 2: 정확한 카드 매칭
-        card_url = _find_card_link(driver, card_name, set_name, card_number, pokemon_name)
-        if not card_url:
-            print(f"❌ 카드를 찾지 못했습니다: {card_name}")
-            return None
+    return lookup.decorate(result, 'http')
 
-        # Step 3: See More 클릭
-        _click_see_more(driver, card_url)
+
+def _run_pipeline(driver: webdriver.Chrome, lookup: _Lookup) -> dict | None:
+    """Step 1~4 실행. 드라이버 생성/종료는 호출자 책임."""
+    try:
+        if lookup.card_url:
+            # 캐시(또는 배치 검색)로 이미 알고 있는 카드 URL → 리스팅 페이지로 바로 이동
+            print(f"[Step 1-2] 카드 URL 사용: {lookup.card_url}")
+            _apply_resource_policy(driver, 'navigate')
+            with metrics.step('navigate', 'selenium'):
+                _open_used_listings(driver, lookup.card_url)
+            if lookup.from_cache and not _listing_page_matches(driver.title, lookup.pokemon_name):
+                raise StaleResolution(f"title={driver.title!r}")
+        else:
+            # Step 1: 포켓몬 이름으로 검색
+            _apply_resource_policy(driver, 'search')
+            with metrics.step('search', 'selenium'):
+                _search_cards(driver, lookup.pokemon_name)
+
+            # Step 2: 정확한 카드 매칭
+            with metrics.step('match', 'selenium'):
+                card_url = _find_card_link(driver, lookup.card_name, lookup.set_name,
+                                           lookup.card_number, lookup.pokemon_name, lookup=lookup)
+            if not card_url:
+                print(f"❌ 카드를 찾지 못했습니다: {lookup.card_name}")
+                return None
+
+            # Step 3: 리스팅 페이지 이동
+            _apply_resource_policy(driver, 'navigate')
+            with metrics.step('navigate', 'selenium'):
+                _open_used_listings(driver, card_url)
 
         final_url = driver.current_url
 
-        # Step 4: PSA 10 최저가 추출
-        result = _extract_cheapest_psa10(driver)
+        # Step 4: PSA 10 최저가 추출 (+ 같은 페이지의 모든 등급 요약)
+        _apply_resource_policy(driver, 'extract')
+        with metrics.step('extract', 'selenium'):
+            result = _extract_cheapest_psa10(driver, lookup)
 
         if result:
-            result['url']          = final_url
-            result['card_name']    = card_name
-            result['pokemon_name'] = pokemon_name
-            result['set_name']     = set_name
-            result['card_number']  = card_number
+            result['url'] = final_url
+        else:
+            lookup.record_miss('no_psa10', url=final_url)
 
-        return result
+        return lookup.decorate(result, 'selenium')
+
+    except StaleResolution:
+        raise
 
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
@@ -656,9 +1123,171 @@ def get_cheapest_psa10(card_name: str,
             'debug_info': debug_info
         }
 
+
+# ──────────────────────────────────────────────────────────────
+# 배치 조회: 포켓몬 이름별로 검색 1회 → 카드별 리스팅 페이지 병렬 방문
+# ──────────────────────────────────────────────────────────────
+
+def _search_candidates(pokemon_name: str, engine: str, pool, headless: bool) -> list[dict]:
+    """검색 결과 후보 수집 (HTTP 우선, 없으면 Selenium)"""
+    if engine in ('auto', 'http'):
+        from snkrdunk_http_engine import search_candidates
+        try:
+            candidates = search_candidates(pokemon_name)
+            if candidates or engine == 'http':
+                return candidates
+        except Exception as e:
+            print(f"⚠️ HTTP 검색 오류: {e}")
+            if engine == 'http':
+                return []
+
+    with pool.driver() as driver:
+        _search_cards(driver, pokemon_name)
+        return _harvest_candidates(driver)
+
+
+def _as_card(card) -> dict:
+    if isinstance(card, dict):
+        return {
+            'card_name':   card.get('card_name') or '',
+            'set_name':    card.get('set_name') or '',
+            'card_number': str(card.get('card_number') or ''),
+        }
+    card_name, set_name, card_number = (list(card) + ['', ''])[:3]
+    return {'card_name': card_name, 'set_name': set_name or '', 'card_number': str(card_number or '')}
+
+
+def get_cheapest_psa10_many(cards,
+                            pool=None,
+                            engine: str = DEFAULT_ENGINE,
+                            use_cache: bool = True,
+                            max_workers: int | None = None,
+                            headless: bool = True):
+    """
+    여러 카드를 한 번에 조회. 끝나는 순서대로 결과를 yield (generator).
+
+    - 같은 (카드명, 세트, 번호)는 한 번만 조회
+    - extract_pokemon_name 결과로 묶어 포켓몬당 검색 페이지 1회
+    - 같은 검색 후보 목록으로 그룹 내 모든 카드 매칭
+    - 리스팅 페이지 방문은 스레드 풀로 분산 (pool이 있으면 pool.size만큼)
+
+    Args:
+        cards : [{'card_name', 'set_name', 'card_number'}, ...] 또는 (name, set, number) 튜플
+        pool  : DriverPool. 없고 Selenium이 필요하면 임시 풀을 만들어 사용 후 종료
+
+    Yields:
+        {'card_name', 'set_name', 'card_number', 'result': get_cheapest_psa10과 같은 dict 또는 None,
+         'grades': 등급별 요약 (PSA 10이 없어 result가 None이어도 다른 등급이 있으면 채워짐)}
+    """
+    import queue
+    from concurrent.futures import ThreadPoolExecutor
+
+    if engine not in ('auto', 'http', 'selenium'):
+        raise ValueError(f"Unknown engine: {engine}")
+
+    unique = {}
+    for card in cards:
+        card = _as_card(card)
+        unique.setdefault(resolution_key(card['card_name'], card['set_name'], card['card_number']), card)
+    if not unique:
+        return
+
+    own_pool = None
+    if pool is None and engine != 'http':
+        from snkrdunk_driver_pool import DriverPool
+        pool = own_pool = DriverPool(size=max_workers, headless=headless)
+    workers = max_workers or (pool.size if pool else 4)
+
+    results = queue.Queue()
+
+    ready = []
+    groups = {}
+    known_misses = 0
+    for card in unique.values():
+        lookup = _Lookup(card['card_name'], card['set_name'], card['card_number'],
+                         extract_pokemon_name(card['card_name']))
+        if use_cache and get_card_miss(lookup.card_name, lookup.set_name, lookup.card_number):
+            results.put((lookup, None))
+            known_misses += 1
+        elif use_cache and _apply_cached_resolution(lookup):
+            ready.append(lookup)
+        else:
+            groups.setdefault(lookup.pokemon_name, []).append(lookup)
+
+    print(f"📦 배치 조회: {len(unique)}장 (캐시 적중 {len(ready)}, 음성 캐시 {known_misses}, "
+          f"검색 그룹 {len(groups)}개)")
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='snkrdunk-batch')
+
+    def fail(lookup: _Lookup, e: Exception):
+        # 어떤 경우에도 카드마다 결과 하나는 나가야 아래 results.get()이 끝남
+        results.put((lookup, {'error': str(e), 'debug_info': {}}))
+
+    def visit(lookup: _Lookup):
+        try:
+            result = _execute_lookup(lookup, engine, None, pool, headless, use_cache)
+        except Exception as e:
+            return fail(lookup, e)
+        results.put((lookup, result))
+
+    def route(lookup: _Lookup, candidates: list[dict]):
+        match = None
+        if candidates:
+            match = _match_candidates(candidates, lookup.card_name, lookup.set_name,
+                                      lookup.card_number, lookup.pokemon_name)
+        if match:
+            lookup.match = match
+            lookup.card_url = match['href']
+        elif candidates and engine == 'http':
+            # HTTP 전용이면 같은 검색을 반복해도 결과가 같음
+            if use_cache:
+                lookup.record_miss('not_found', candidates)
+                save_card_miss(lookup)
+            results.put((lookup, None))
+            return
+        # 매칭 실패한 카드는 단건 경로(검색부터, Selenium fallback 포함)로 재시도
+        executor.submit(visit, lookup)
+
+    def search_group(pokemon_name: str, lookups: list):
+        done = 0
+        try:
+            try:
+                candidates = _search_candidates(pokemon_name, engine, pool, headless)
+            except Exception as e:
+                print(f"⚠️ 그룹 검색 실패 ({pokemon_name}): {e}")
+                candidates = []
+            print(f"🔎 {pokemon_name}: 후보 {len(candidates)}개로 {len(lookups)}장 매칭")
+
+            for lookup in lookups:
+                try:
+                    route(lookup, candidates)
+                except Exception as e:
+                    fail(lookup, e)
+                done += 1
+        except Exception as e:
+            for lookup in lookups[done:]:
+                fail(lookup, e)
+
+    try:
+        for lookup in ready:
+            executor.submit(visit, lookup)
+        for pokemon_name, lookups in groups.items():
+            executor.submit(search_group, pokemon_name, lookups)
+
+        for _ in range(len(unique)):
+            lookup, result = results.get()
+            yield {
+                'card_name':   lookup.card_name,
+                'set_name':    lookup.set_name,
+                'card_number': lookup.card_number,
+                'result':      result,
+                'grades':      lookup.grades,
+            }
     finally:
-        driver.quit()
-        print("👋 브라우저 종료")
+        # 중간에 닫힌 generator: 아직 시작 안 한 방문은 취소, 진행 중인 것만 끝까지 기다림
+        executor.shutdown(wait=True, cancel_futures=True)
+        if own_pool is not None:
+            own_pool.close()
 
 
 # ──────────────────────────────────────────────────────────────
@@ -704,51 +1333,104 @@ if __name__ == '__main__':
 # ──────────────────────────────────────────────────────────────
 
 def init_db():
-    """Initialize SQLite database"""
-    import sqlite3
-    
-    conn = sqlite3.connect('snkrdunk.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS card_prices (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        card_name TEXT NOT NULL,
-        psa10_latest_price REAL,
-        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        url TEXT,
-        item_count INTEGER
+    """Initialize SQLite database (applies pending schema migrations)"""
+    get_storage().migrate()
+
+def save_result_to_db(card_name, price, url, item_count, set_name="", card_number="",
+                      all_prices=None, grades=None):
+    """
+    Save scraping result to database (all_prices also goes into the price history).
+    grades: per-grade summaries from the same listing page, saved together.
+    """
+    get_storage().save_price(card_name, price, url, item_count,
+                             set_name=set_name, card_number=card_number,
+                             all_prices=all_prices, grades=grades)
+
+def run_scraper_and_save(card_name, set_name="", card_number="", pool=None,
+                         ignore_miss_reasons=()):
+    """
+    Run scraper and save result to database.
+    Concurrent calls for the same (card name, set, number) - in this process or
+    another one sharing snkrdunk.db - share a single scrape and its outcome.
+    ignore_miss_reasons: negative-cache reasons that must not skip the scrape,
+    e.g. ('no_psa10',) when refreshing other grades of a card without PSA 10 listings.
+    """
+    key = scrape_key(card_name, set_name, card_number)
+    if ignore_miss_reasons:
+        # 음성 캐시에 막힐 수 있는 일반 조회와 결과를 공유하지 않도록 키를 분리
+        key += '|ignore:' + ','.join(sorted(ignore_miss_reasons))
+    return get_single_flight().do(
+        key,
+        lambda: _scrape_and_save(card_name, set_name, card_number, pool, ignore_miss_reasons),
     )
-    ''')
-    
-    conn.commit()
-    conn.close()
 
-def save_result_to_db(card_name, price, url, item_count):
-    """Save scraping result to database"""
-    import sqlite3
-    
-    conn = sqlite3.connect('snkrdunk.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    INSERT INTO card_prices (card_name, psa10_latest_price, url, item_count)
-    VALUES (?, ?, ?, ?)
-    ''', (card_name, price, url, item_count))
-    
-    conn.commit()
-    conn.close()
+def _scrape_and_save(card_name, set_name, card_number, pool, ignore_miss_reasons=()):
+    lookup, result = _lookup_card(card_name, set_name, card_number, True, None, pool,
+                                  DEFAULT_ENGINE, True, ignore_miss_reasons)
+    if result and 'error' in result:
+        # 브라우저 오류는 실패로 전달 (single-flight 대기자 / 작업 큐 재시도)
+        raise RuntimeError(result['error'])
 
-def run_scraper_and_save(card_name, set_name="", card_number=""):
-    """Run scraper and save result to database"""
-    result = get_cheapest_psa10(card_name, set_name, card_number, headless=True)
-    
     if result:
         save_result_to_db(
             card_name=result['card_name'],
             price=result['price'],
             url=result['url'],
-            item_count=result['count']
+            item_count=result['count'],
+            set_name=set_name,
+            card_number=card_number,
+            all_prices=result.get('all_prices'),
+            grades=result.get('grades'),
         )
         return True
-    return False
\ No newline at end of file
+    if lookup is not None and lookup.grades:
+        # PSA 10은 없지만 다른 등급 리스팅은 있음 → 등급별 캐시만 저장 (PSA 10 가격은 NULL)
+        save_result_to_db(card_name, None, lookup.miss_url, 0, set_name=set_name,
+                          card_number=card_number, grades=lookup.grades)
+    return False
+
+
+# ──────────────────────────────────────────────────────────────
+# 카드 URL 캐시 (card_name, set_name, card_number) → /en/trading-cards/{id}
+# ──────────────────────────────────────────────────────────────
+
+def get_card_resolution(card_name, set_name, card_number):
+    """캐시된 카드 URL 조회 (없으면 None)"""
+    return get_storage().get_resolution(card_name, set_name, card_number)
+
+def save_card_resolution(card_name, set_name, card_number, card_url, match_score, match_text):
+    """매칭 결과 저장 (같은 키가 있으면 덮어씀)"""
+    get_storage().save_resolution(card_name, set_name, card_number, card_url, match_score, match_text)
+
+def touch_card_resolution(card_name, set_name, card_number):
+    """캐시된 URL이 여전히 유효함을 확인한 시각 갱신"""
+    get_storage().touch_resolution(card_name, set_name, card_number)
+
+def invalidate_card_resolution(card_name, set_name, card_number):
+    """리스팅 페이지가 404이거나 다른 카드일 때 캐시 삭제"""
+    get_storage().invalidate_resolution(card_name, set_name, card_number)
+
+
+# ──────────────────────────────────────────────────────────────
+# 음성 캐시: SNKRDUNK에 없는 카드 / PSA 10 리스팅이 없는 카드
+# ──────────────────────────────────────────────────────────────
+
+# 이유별 TTL(초). 없는 카드는 잘 바뀌지 않고, 리스팅은 금방 새로 올라옴.
+MISS_TTLS = {
+    'not_found': int(os.environ.get('SNKRDUNK_MISS_TTL_NOT_FOUND', str(7 * 24 * 3600))),
+    'no_psa10':  int(os.environ.get('SNKRDUNK_MISS_TTL_NO_PSA10', str(12 * 3600))),
+}
+
+def get_card_miss(card_name, set_name, card_number):
+    """만료되지 않은 음성 캐시 조회 (없으면 None)"""
+    return get_storage().get_miss(card_name, set_name, card_number)
+
+def save_card_miss(lookup):
+    """조회 결과가 없었던 이유와 검토한 후보를 TTL과 함께 저장"""
+    get_storage().save_miss(lookup.card_name, lookup.set_name, lookup.card_number,
+                            lookup.miss_reason, lookup.miss_candidates, lookup.miss_url,
+                            MISS_TTLS[lookup.miss_reason])
+
+def clear_card_miss(card_name, set_name, card_number):
+    """가격을 찾았을 때 이전 음성 캐시 삭제"""
+    get_storage().clear_miss(card_name, set_name, card_number)
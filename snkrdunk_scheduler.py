@@ -0,0 +1,222 @@
+"""
+SNKRDUNK 가격 갱신 스케줄러
+=====================================
+사용자가 캐시를 놓칠 때까지 기다리지 않고, 많이 조회되는 카드를 미리 갱신.
+
+  우선순위 = staleness × log(1 + demand)
+    staleness : 마지막 스크래핑(또는 갱신 시도) 이후 경과 시간 / 카드의 fresh TTL (최대 MAX_STALENESS)
+    demand    : lookup_price가 기록하는 요청 수 (반감기 SNKRDUNK_DEMAND_HALF_LIFE로 감쇠)
+                계획 시점 기준으로 감쇠 — 요청이 끊긴 카드는 MIN_DEMAND 아래로 떨어지면 갱신 중단
+
+  - staleness가 REFRESH_AT 이상인 카드만 후보 → fresh TTL이 끝나기 직전에 갱신
+  - 전체 요청 속도는 토큰 버킷(분당 rate)으로 제한 → 사용자 트래픽과 무관하게 고르게 분산
+  - 동시 스크래핑은 concurrency개 (드라이버 풀 크기와 같게 두면 브라우저 수 고정)
+  - 상태(요청 빈도, 마지막 갱신, 실패/재시도 시각)는 refresh_schedule 테이블에 저장
+    → 재시작해도 대기열이 그대로 복원됨
+  - 음성 캐시에 있는 카드는 건너뜀, 실패하면 지수 백오프
+
+실행:
+  python snkrdunk_scheduler.py --rate 6 --concurrency 1
+  python snkrdunk_worker.py --scheduler        # 워커의 드라이버 풀 공유
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from query_snkrdunk_db import DEMAND_HALF_LIFE, FRESH_TTL
+from snkrdunk_db import get_storage, resolution_key
+from snkrdunk_psa10_scraper import run_scraper_and_save
+
+
+DEFAULT_RATE_PER_MIN = float(os.environ.get('SNKRDUNK_REFRESH_RATE', '6'))
+DEFAULT_CONCURRENCY = int(os.environ.get('SNKRDUNK_REFRESH_CONCURRENCY', '1'))
+
+# fresh TTL의 몇 배가 지나면 갱신 후보가 되는지
+REFRESH_AT = float(os.environ.get('SNKRDUNK_REFRESH_AT', '0.8'))
+# staleness 상한 (한 번도 스크래핑되지 않은 카드도 이 값). 오래 방치된 카드가
+# 요청이 많은 카드를 staleness만으로 앞지르지 못하게 함.
+MAX_STALENESS = 10.0
+# 감쇠된 demand가 이보다 작은 카드는 갱신하지 않음 (반감기 7일이면 요청 1회는 약 23일 뒤 제외)
+MIN_DEMAND = float(os.environ.get('SNKRDUNK_REFRESH_MIN_DEMAND', '0.1'))
+# 실패 시 재시도 간격: 60초 × 2^실패횟수, 최대 6시간
+RETRY_BASE = 60
+RETRY_MAX = 6 * 3600
+# 대기열 확인 주기(초)
+TICK_SECONDS = 5.0
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (최대 capacity개)"""
+
+    def __init__(self, rate_per_sec: float, capacity: float = 1.0):
+        self.rate = rate_per_sec
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def wait_time(self) -> float:
+        """다음 토큰까지 남은 시간(초)"""
+        with self._lock:
+            self._refill()
+            return max(0.0, (1 - self.tokens) / self.rate) if self.rate > 0 else TICK_SECONDS
+
+
+class RefreshScheduler:
+    """
+    refresh_schedule 테이블을 주기적으로 읽어 우선순위가 높은 카드부터 갱신.
+    start()로 백그라운드 스레드 실행, stop()으로 종료.
+    """
+
+    def __init__(self,
+                 pool=None,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 rate_per_min: float = DEFAULT_RATE_PER_MIN,
+                 storage=None):
+        self.pool = pool
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate_per_min / 60.0)
+        self.storage = storage or get_storage()
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                           thread_name_prefix='snkrdunk-schedule')
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.refreshed = 0
+        self.failed = 0
+
+    # ── 대기열 ──
+
+    def plan(self, limit: int = 10) -> list[dict]:
+        """지금 갱신할 만한 카드를 우선순위 순으로 최대 limit개 (계산과 정렬은 SQL에서)"""
+        with self._lock:
+            inflight = set(self._inflight)
+
+        # 실행 중인 카드를 건너뛰어도 limit개가 남도록 그만큼 더 가져옴
+        planned = []
+        for card in self.storage.refresh_plan(limit + len(inflight), FRESH_TTL, REFRESH_AT,
+                                              MAX_STALENESS, DEMAND_HALF_LIFE, MIN_DEMAND):
+            key = resolution_key(card['card_name'], card['set_name'], card['card_number'])
+            if key in inflight:
+                continue
+            planned.append(dict(card, priority=round(card['priority'], 3),
+                                staleness=round(card['staleness'], 3)))
+            if len(planned) >= limit:
+                break
+        return planned
+
+    def _refresh(self, card: dict, key: str):
+        name, set_name, number = card['card_name'], card['set_name'], card['card_number']
+        try:
+            run_scraper_and_save(name, set_name, number, pool=self.pool)
+            self.storage.mark_refreshed(name, set_name, number)
+            self.refreshed += 1
+        except Exception as e:
+            retry_in = min(RETRY_MAX, RETRY_BASE * 2 ** card['failures'])
+            print(f"⚠️ 스케줄 갱신 실패 ({name}): {e} — {retry_in}초 후 재시도")
+            self.storage.mark_refresh_failed(name, set_name, number, retry_in=retry_in)
+            self.failed += 1
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def run_once(self) -> int:
+        """빈 슬롯과 토큰이 있는 만큼 갱신 시작. 시작한 개수 반환."""
+        with self._lock:
+            free = self.concurrency - len(self._inflight)
+        if free <= 0:
+            return 0
+
+        started = 0
+        for card in self.plan(limit=free):
+            if not self.bucket.try_acquire():
+                break
+            key = resolution_key(card['card_name'], card['set_name'], card['card_number'])
+            with self._lock:
+                self._inflight.add(key)
+            print(f"🔄 스케줄 갱신: {card['card_name']} "
+                  f"(우선순위 {card['priority']}, staleness {card['staleness']})")
+            self.executor.submit(self._refresh, card, key)
+            started += 1
+        return started
+
+    # ── 실행 ──
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ 스케줄러 오류: {e}")
+            self._stop.wait(min(TICK_SECONDS, max(0.5, self.bucket.wait_time())))
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name='snkrdunk-scheduler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=TICK_SECONDS + 1)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            inflight = len(self._inflight)
+        return {
+            'inflight':     inflight,
+            'concurrency':  self.concurrency,
+            'rate_per_min': self.bucket.rate * 60,
+            'refreshed':    self.refreshed,
+            'failed':       self.failed,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SNKRDUNK background price refresh scheduler')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_PER_MIN,
+                        help='Max refresh scrapes per minute')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Browsers used for refreshes')
+    parser.add_argument('--plan', action='store_true', help='Print the current queue and exit')
+    args = parser.parse_args()
+
+    if args.plan:
+        scheduler = RefreshScheduler(concurrency=args.concurrency, rate_per_min=args.rate)
+        for card in scheduler.plan(limit=50):
+            print(f"{card['priority']:>10}  {card['staleness']:>8}  {card['demand']:>7.2f}  "
+                  f"{card['card_name']} / {card['set_name']} / {card['card_number']}")
+        return
+
+    from snkrdunk_driver_pool import DriverPool
+    pool = DriverPool(size=args.concurrency)
+    scheduler = RefreshScheduler(pool=pool, concurrency=args.concurrency, rate_per_min=args.rate)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
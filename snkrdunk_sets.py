@@ -0,0 +1,175 @@
+"""
+세트 이름 해석 (PriceCharting → SNKRDUNK)
+=====================================
+data/set_catalog.json(영문/일본어 세트, 별칭, 세트 코드, PriceCharting 표기)을 로드 시 한 번
+Aho-Corasick 오토마톤으로 컴파일하고, 입력 길이에 비례하는 한 번의 스캔으로 가장 긴 별칭을 찾음.
+
+  "Pokemon Expedition Base Set"  → en-exp  (짧은 'base set'이 가리지 않음)
+  "Pokemon Japanese Neo 4"       → ja-darkness-and-to-light → SNKRDUNK 표기 'destiny'
+  "Pokemon Japanese Wild Force"  → ja-sv5k (세트 코드 'SV5K'로도 인식)
+
+  - 별칭은 단어 경계에서만 매칭 (일본어처럼 띄어쓰기가 없는 문자는 예외)
+  - 입력에 'japanese'가 있으면 일본판, 없으면 영문판 별칭 중에서 먼저 고름 (없으면 다른 언어)
+  - 세트별 매칭 토큰(SNKRDUNK 표기 + 세트 코드)은 미리 계산해 둠
+
+카탈로그 교체: SNKRDUNK_SET_CATALOG=/path/to/set_catalog.json
+"""
+
+import json
+import os
+import re
+import sys
+from collections import deque
+from functools import lru_cache
+
+from snkrdunk_names import _fold, _is_ascii_alnum
+
+
+SET_CATALOG_FILE = os.environ.get(
+    'SNKRDUNK_SET_CATALOG',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'set_catalog.json'),
+)
+
+# 세트 이름에서 의미 없는 토큰
+GENERIC_SET_TOKENS = {'pokemon', 'japanese', 'english', 'card', 'cards', 'tcg', 'the', 'neo'}
+
+
+class AhoCorasick:
+    """문자 단위 Aho-Corasick. iter_matches는 (start, end, value)를 end 순서로 내놓음."""
+
+    def __init__(self, patterns: dict[str, object]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, value in self._out[node]:
+                yield i - length + 1, i + 1, value
+
+
+def _has_digit(text: str) -> bool:
+    return any(ch.isdigit() for ch in text)
+
+
+def _match_tokens(snkrdunk_name: str, code: str | None) -> frozenset:
+    """
+    SNKRDUNK 표기 토큰 + 세트 코드.
+    후보 텍스트에 부분 문자열로 검사되므로 숫자 없는 짧은 코드(FO, TR, EVO...)는 제외.
+    """
+    tokens = {t for t in _fold(snkrdunk_name).split() if t not in GENERIC_SET_TOKENS and len(t) > 1}
+    if code and _has_digit(code) and len(code) >= 3:
+        tokens.add(code.lower())
+    return frozenset(tokens)
+
+
+class SetCatalog:
+    """세트 카탈로그 + 별칭 매처 (로드 시 한 번 컴파일)"""
+
+    def __init__(self, sets: list[dict]):
+        self.sets = {}
+        aliases = {}
+        for entry in sets:
+            entry = dict(entry, tokens=_match_tokens(entry['snkrdunk'], entry.get('code')))
+            self.sets[entry['id']] = entry
+            names = [entry['name'], *entry.get('aliases', ())]
+            code = entry.get('code')
+            # 숫자가 없는 코드(EVS, MEW, PAL...)는 일반 단어와 겹치므로 별칭으로 쓰지 않음
+            if code and _has_digit(code):
+                names.append(code)
+            for name in names:
+                key = _fold(name)
+                if key and entry['id'] not in aliases.setdefault(key, []):
+                    aliases[key].append(entry['id'])
+        self._matcher = AhoCorasick(aliases)
+
+    def resolve(self, set_name: str) -> dict | None:
+        """가장 긴 별칭에 해당하는 세트 (id, name, lang, code, snkrdunk, tokens). 없으면 None."""
+        text = _fold(set_name)
+        n = len(text)
+        lang = 'ja' if 'japanese' in text.split() else 'en'
+
+        best, best_rank = None, None
+        for start, end, ids in self._matcher.iter_matches(text):
+            if start and _is_ascii_alnum(text[start]) and _is_ascii_alnum(text[start - 1]):
+                continue
+            if end < n and _is_ascii_alnum(text[end - 1]) and _is_ascii_alnum(text[end]):
+                continue
+            for rank_in_alias, set_id in enumerate(ids):
+                entry = self.sets[set_id]
+                rank = (entry['lang'] == lang, end - start, -start, -rank_in_alias)
+                if best_rank is None or rank > best_rank:
+                    best, best_rank = entry, rank
+        return best
+
+
+def load_catalog(path: str = SET_CATALOG_FILE) -> list[dict]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 세트 카탈로그 로드 실패 ({path}): {e}", file=sys.stderr)
+        return []
+
+
+_catalog: SetCatalog | None = None
+
+
+def get_catalog() -> SetCatalog:
+    global _catalog
+    if _catalog is None:
+        _catalog = SetCatalog(load_catalog())
+    return _catalog
+
+
+@lru_cache(maxsize=4096)
+def resolve_set(set_name: str) -> dict | None:
+    return get_catalog().resolve(set_name)
+
+
+def map_set_name(set_name: str) -> str:
+    """
+    세트 이름을 SNKRDUNK 검색에 유리하게 변환.
+    예: "Pokemon Japanese Neo 4" -> "destiny" (Neo 4 is Neo Destiny)
+    카탈로그에 없으면 원래 이름 그대로.
+    """
+    entry = resolve_set(set_name)
+    return entry['snkrdunk'] if entry else set_name
+
+
+@lru_cache(maxsize=4096)
+def set_tokens(set_name: str) -> frozenset:
+    """원본 세트명 토큰 + 카탈로그 세트의 매칭 토큰(SNKRDUNK 표기, 세트 코드)"""
+    raw = re.sub(r'\s+', ' ', set_name).strip().lower()
+    tokens = {t for t in raw.split() if t not in GENERIC_SET_TOKENS and len(t) > 1}
+    entry = resolve_set(set_name)
+    if entry:
+        tokens |= entry['tokens']
+    return frozenset(tokens)
@@ -0,0 +1,153 @@
+"""
+SNKRDUNK 스크래핑 single-flight
+=====================================
+같은 카드에 대한 동시 스크래핑 요청을 하나로 합침.
+첫 요청만 실제로 스크래핑하고, 그동안 들어온 요청은 같은 결과(또는 같은 에러)를 받음.
+
+  - 프로세스 안 : 키별 Future 하나를 모든 스레드가 공유
+  - 프로세스 간 : snkrdunk.db의 scrape_leases 행을 임대(lease)로 사용
+                  소유자가 끝나면 결과를 JSON으로 남기고, 다른 프로세스는 그 결과를 읽음
+                  실행 중에는 heartbeat로 expires_at을 연장하고,
+                  소유자가 죽으면 expires_at 이후 다음 대기자가 임대를 넘겨받음
+
+사용 예시:
+  from snkrdunk_singleflight import get_single_flight, scrape_key
+  get_single_flight().do(scrape_key(name, set_name, number), lambda: scrape(...))
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+from snkrdunk_db import get_storage, resolution_key
+
+
+# 임대 시간(초). 실행 중에는 heartbeat가 LEASE_TTL / 3마다 연장하므로,
+# 이 시간 동안 연장되지 않은 임대는 소유자가 죽은 것으로 간주.
+LEASE_TTL = float(os.environ.get('SNKRDUNK_LEASE_TTL', '180'))
+# 다른 프로세스의 임대를 기다릴 때 확인 간격(초)
+POLL_INTERVAL = 0.5
+
+
+class FlightFailed(Exception):
+    """다른 프로세스에서 실행된 스크래핑이 실패함 (원래 에러 메시지를 그대로 전달)"""
+
+
+def scrape_key(card_name, set_name, card_number) -> str:
+    """
+    single-flight 키: 정규화된 (카드명, 세트명, 카드번호) — resolution_key와 같음.
+    포켓몬 이름만 쓰면 "Charizard ex"와 "Charizard V"처럼 다른 카드가 한 번의 스크래핑으로 합쳐짐.
+    """
+    return resolution_key(card_name, set_name, card_number)
+
+
+class SingleFlight:
+    """
+    키별로 fn을 한 번만 실행하고, 동시에 들어온 호출자 모두에게 같은 결과를 돌려줌.
+    fn의 반환값은 JSON 직렬화 가능해야 함 (다른 프로세스로 전달).
+    """
+
+    def __init__(self, storage=None, lease_ttl: float = LEASE_TTL,
+                 poll_interval: float = POLL_INTERVAL):
+        self.storage = storage or get_storage()
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self.owner_prefix = f'{socket.gethostname()}:{os.getpid()}'
+        self._flights: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(self._run_leased(key, fn))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+        return future.result()
+
+    def inflight(self) -> list[str]:
+        with self._lock:
+            return list(self._flights)
+
+    def _run_leased(self, key: str, fn):
+        """프로세스 간 임대를 가져와 fn 실행. 다른 프로세스가 실행 중이면 끝날 때까지 대기."""
+        owner = f'{self.owner_prefix}:{uuid.uuid4().hex[:8]}'
+        while True:
+            if self.storage.acquire_lease(key, owner, self.lease_ttl):
+                return self._run_owned(key, owner, fn)
+
+            # 임대 획득에 실패했으므로 그 뒤에 끝난 실행이 곧 우리가 기다리던 실행
+            while True:
+                lease = self.storage.get_lease(key)
+                if lease is None or lease['expires_at'] < time.time():
+                    break
+                if lease['status'] != 'running':
+                    if lease['outcome'] is None:
+                        # 소유자가 결과 없이 중단됨 → 다시 임대 시도
+                        break
+                    return self._shared_outcome(lease)
+                time.sleep(self.poll_interval)
+
+    def _heartbeat(self, key: str, owner: str, stop: threading.Event):
+        while not stop.wait(self.lease_ttl / 3):
+            try:
+                if not self.storage.renew_lease(key, owner, self.lease_ttl):
+                    print(f"⚠️ 임대를 잃음 ({key}) — 다른 프로세스가 넘겨받음")
+                    return
+            except Exception as e:
+                print(f"⚠️ 임대 heartbeat 실패 ({key}): {e}")
+
+    def _run_owned(self, key: str, owner: str, fn):
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(key, owner, stop),
+                                     name='snkrdunk-lease-heartbeat', daemon=True)
+        heartbeat.start()
+        try:
+            value = fn()
+        except Exception as e:
+            self.storage.release_lease(key, owner, 'failed',
+                                       json.dumps({'error': f'{type(e).__name__}: {e}'}))
+            raise
+        except BaseException:
+            # KeyboardInterrupt 등: 결과 없이 풀어서 다음 대기자가 바로 넘겨받게 함
+            self.storage.release_lease(key, owner, 'failed', None)
+            raise
+        finally:
+            stop.set()
+            heartbeat.join()
+        self.storage.release_lease(key, owner, 'done', json.dumps({'value': value}))
+        return value
+
+    @staticmethod
+    def _shared_outcome(lease: dict):
+        outcome = json.loads(lease['outcome'])
+        if lease['status'] == 'done':
+            return outcome.get('value')
+        raise FlightFailed(outcome.get('error'))
+
+
+_single_flight: SingleFlight | None = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """프로세스 전역 SingleFlight (기본 snkrdunk.db 임대 사용)"""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
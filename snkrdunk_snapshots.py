@@ -0,0 +1,336 @@
+"""
+SNKRDUNK 페이지 스냅샷 아카이브 / 오프라인 재추출
+=====================================
+스크래핑 때 받은 검색 결과 / 리스팅 페이지 HTML을 gzip으로 보관하고(opt-in: SNKRDUNK_SNAPSHOTS=1),
+나중에 브라우저 없이 같은 파서(snkrdunk_http_engine의 lxml 파서 + _match_candidates /
+_grade_summaries)로 다시 추출. 마크업이 바뀌어 파서를 고쳤을 때 라이브 재스크래핑 없이 검증/백필.
+
+  - 본문: SNAPSHOT_DIR/ab/<sha256>.html.gz (내용 주소 → 같은 페이지는 한 번만 저장, 원자적 rename)
+  - 색인: snkrdunk.db page_snapshots (kind, digest, url, engine, 포켓몬/카드, captured_at)
+  - 저장 시점: 엔진 공통 — HTTP(받은 HTML), Selenium(page_source), CDP(outerHTML)
+                검색 페이지는 후보 수집 직전, 리스팅 페이지는 스크롤이 끝난 뒤
+  - 저장 실패는 경고만 출력 (스크래핑 결과에는 영향 없음)
+
+재추출 (replay):
+  listing: 리스팅 스냅샷마다 parse_listings → 등급별 요약 / PSA 10 최저가
+           --save면 captured_at 시각으로 가격/이력 저장 (같은 시각 행이 있으면 건너뜀 → 반복 실행 안전)
+  search : 검색 스냅샷마다 parse_search_candidates → 카드 매칭, 현재 카드 URL 캐시와 비교(changed)
+           매칭할 카드는 --cards 파일, 없으면 같은 포켓몬의 리스팅 스냅샷에 나온 카드
+  프로세스 풀로 분산, 같은 digest는 워커마다 한 번만 파싱
+
+실행:
+  SNKRDUNK_SNAPSHOTS=1 python snkrdunk_batch.py cards.csv --save      # 스크래핑하면서 보관
+  python snkrdunk_snapshots.py replay listing --since 2026-01-01 --save
+  python snkrdunk_snapshots.py replay search --cards cards.jsonl --latest
+  python snkrdunk_snapshots.py stats
+  python snkrdunk_snapshots.py purge --days 90
+"""
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from snkrdunk_db import get_storage, resolution_key
+
+
+SNAPSHOTS_ENABLED = os.environ.get('SNKRDUNK_SNAPSHOTS', '0').lower() not in ('', '0', 'false', 'no')
+SNAPSHOT_DIR = os.environ.get(
+    'SNKRDUNK_SNAPSHOT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'),
+)
+COMPRESS_LEVEL = 6
+# replay: 워커 프로세스 하나에 한 번에 넘기는 스냅샷 수 / 파싱 결과 캐시 크기 (digest 단위)
+REPLAY_CHUNK = 64
+PARSE_CACHE_SIZE = 1024
+# replay --save 시 한 번에 모아서 저장할 행 수
+SAVE_BATCH_SIZE = 200
+
+KINDS = ('search', 'listing')
+
+
+# ──────────────────────────────────────────────────────────────
+# 본문 저장소 (내용 주소)
+# ──────────────────────────────────────────────────────────────
+
+def _blob_path(digest: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, digest[:2], f'{digest}.html.gz')
+
+
+def store_page(page_html: str) -> tuple[str, int]:
+    """HTML 저장 (이미 있으면 건너뜀). 반환: (sha256, 원본 바이트 수)"""
+    data = page_html.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    path = _blob_path(digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 다른 프로세스가 같은 페이지를 동시에 쓰더라도 완성된 파일만 보이도록 임시 파일 → rename
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=COMPRESS_LEVEL, mtime=0))
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+    return digest, len(data)
+
+
+def load_page(digest: str) -> str:
+    with open(_blob_path(digest), 'rb') as f:
+        return gzip.decompress(f.read()).decode('utf-8', errors='replace')
+
+
+def capture(kind: str, url: str, page_html: str | None, engine: str,
+            pokemon_name: str = '', lookup=None) -> dict | None:
+    """
+    페이지 1건 보관 (SNKRDUNK_SNAPSHOTS가 꺼져 있으면 아무것도 안 함).
+    kind: 'search' | 'listing', lookup: 리스팅 페이지의 카드 (_Lookup)
+    반환: {'snapshot_id', 'captured_at', 'digest'} 또는 None
+    """
+    if not SNAPSHOTS_ENABLED or not page_html:
+        return None
+    try:
+        digest, size = store_page(page_html)
+        card = ({'card_name': lookup.card_name, 'set_name': lookup.set_name,
+                 'card_number': lookup.card_number} if lookup is not None else {})
+        if lookup is not None:
+            pokemon_name = pokemon_name or lookup.pokemon_name
+        saved = get_storage().record_snapshot(kind, digest, url, size, engine,
+                                              pokemon_name=pokemon_name, **card)
+        return dict(saved, digest=digest)
+    except Exception as e:
+        print(f"⚠️ 스냅샷 저장 실패 ({kind} {url}): {e}")
+        return None
+
+
+# ──────────────────────────────────────────────────────────────
+# 재추출 (브라우저 없음)
+# ──────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _listing_grades(digest: str) -> dict:
+    from snkrdunk_http_engine import parse_listings
+    from snkrdunk_psa10_scraper import _grade_summaries
+    return _grade_summaries(parse_listings(load_page(digest)))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _search_candidates(digest: str) -> list[dict]:
+    from snkrdunk_http_engine import parse_search_candidates
+    return parse_search_candidates(load_page(digest))
+
+
+def _replay_listing(snapshot: dict) -> list[dict]:
+    from snkrdunk_db import PSA10_GRADE
+    grades = _listing_grades(snapshot['digest'])
+    psa10 = grades.get(PSA10_GRADE)
+    return [{
+        'snapshot_id': snapshot['snapshot_id'],
+        'captured_at': snapshot['captured_at'],
+        'card_name':   snapshot['card_name'],
+        'set_name':    snapshot['set_name'],
+        'card_number': snapshot['card_number'],
+        'url':         snapshot['url'],
+        'result':      ({'price': psa10['price'], 'all_prices': psa10['all_prices'],
+                         'count': psa10['count']} if psa10 else None),
+        'grades':      grades,
+    }]
+
+
+def _replay_search(snapshot: dict) -> list[dict]:
+    from snkrdunk_psa10_scraper import _match_candidates
+    candidates = _search_candidates(snapshot['digest'])
+    items = []
+    for card in snapshot['cards']:
+        match = _match_candidates(candidates, card['card_name'], card['set_name'],
+                                  card['card_number'], snapshot['pokemon_name'])
+        href = match['href'] if match else None
+        items.append({
+            'snapshot_id':  snapshot['snapshot_id'],
+            'captured_at':  snapshot['captured_at'],
+            'pokemon_name': snapshot['pokemon_name'],
+            'card_name':    card['card_name'],
+            'set_name':     card['set_name'],
+            'card_number':  card['card_number'],
+            'candidates':   len(candidates),
+            'match':        ({'href': href, 'score': match['score'], 'text': match['text']}
+                             if match else None),
+            'cached_url':   card.get('cached_url'),
+            'changed':      _url_path(href) != _url_path(card.get('cached_url')),
+        })
+    return items
+
+
+def _url_path(url: str | None) -> str | None:
+    """호스트는 SNKRDUNK_BASE_URL에 따라 달라지므로 경로만 비교"""
+    return urlsplit(url).path.rstrip('/') if url else None
+
+
+_REPLAYERS = {'listing': _replay_listing, 'search': _replay_search}
+
+
+def _replay_chunk(kind: str, snapshots: list[dict]) -> list[dict]:
+    """워커 프로세스: 스냅샷 묶음 재추출 (파서 print는 버림)"""
+    replay_one = _REPLAYERS[kind]
+    items = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for snapshot in snapshots:
+            try:
+                items.extend(replay_one(snapshot))
+            except Exception as e:
+                items.append({'snapshot_id': snapshot['snapshot_id'], 'error': str(e)})
+    return items
+
+
+def _latest_only(snapshots: list[dict], kind: str) -> list[dict]:
+    """키(리스팅은 카드, 검색은 포켓몬 이름)마다 가장 최근 스냅샷 하나"""
+    latest = {}
+    for snapshot in snapshots:
+        if kind == 'listing':
+            key = resolution_key(snapshot['card_name'], snapshot['set_name'], snapshot['card_number'])
+        else:
+            key = snapshot['pokemon_name'].lower()
+        latest[key] = snapshot
+    return sorted(latest.values(), key=lambda s: s['snapshot_id'])
+
+
+def _attach_cards(db, snapshots: list[dict], cards: list[dict] | None) -> list[dict]:
+    """검색 스냅샷마다 매칭해 볼 카드 목록 + 현재 카드 URL 캐시"""
+    from snkrdunk_names import extract_pokemon_name
+
+    by_pokemon = {}
+    if cards is None:
+        cards = db.snapshots('listing')
+    for card in cards:
+        card = {field: card.get(field) or '' for field in ('card_name', 'set_name', 'card_number')}
+        pokemon = extract_pokemon_name(card['card_name']).lower()
+        by_pokemon.setdefault(pokemon, {})[resolution_key(**card)] = card
+
+    for group in by_pokemon.values():
+        for card in group.values():
+            cached = db.get_resolution(card['card_name'], card['set_name'], card['card_number'])
+            card['cached_url'] = cached['card_url'] if cached else None
+
+    return [dict(snapshot, cards=list(by_pokemon.get(snapshot['pokemon_name'].lower(), {}).values()))
+            for snapshot in snapshots]
+
+
+def replay(kind: str, since: str = '', until: str = '', latest: bool = False,
+           cards: list[dict] | None = None, workers: int | None = None):
+    """
+    보관된 kind 페이지들을 다시 추출해 결과를 yield (스냅샷 순서, 청크 단위로 모아서).
+    workers: 프로세스 수 (기본 CPU 수, 1이면 현재 프로세스에서)
+    """
+    if kind not in _REPLAYERS:
+        raise ValueError(f"Unknown snapshot kind: {kind}")
+    db = get_storage()
+    snapshots = db.snapshots(kind, since, until)
+    if latest:
+        snapshots = _latest_only(snapshots, kind)
+    if kind == 'search':
+        snapshots = _attach_cards(db, snapshots, cards)
+    print(f"🗂️ {kind} 스냅샷 {len(snapshots)}건 재추출", file=sys.stderr)
+
+    chunks = [snapshots[i:i + REPLAY_CHUNK] for i in range(0, len(snapshots), REPLAY_CHUNK)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _replay_chunk(kind, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for items in executor.map(_replay_chunk, [kind] * len(chunks), chunks):
+            yield from items
+
+
+def _save_row(item: dict) -> dict | None:
+    """리스팅 재추출 결과 → Storage.save_prices 행 (PSA 10이 없으면 등급별 요약만)"""
+    if 'error' in item or not (item['result'] or item['grades']):
+        return None
+    result = item['result'] or {'price': None, 'all_prices': None, 'count': 0}
+    return {
+        'card_name':   item['card_name'],
+        'set_name':    item['set_name'],
+        'card_number': item['card_number'],
+        'price':       result['price'],
+        'url':         item['url'],
+        'item_count':  result['count'],
+        'all_prices':  result['all_prices'],
+        'grades':      item['grades'],
+        'scraped_at':  item['captured_at'],
+    }
+
+
+def purge(days: float) -> tuple[int, int]:
+    """days일보다 오래된 스냅샷 삭제. 반환: (색인 행 수, 삭제한 본문 파일 수)"""
+    deleted, orphans = get_storage().purge_snapshots(days)
+    removed = 0
+    for digest in orphans:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(_blob_path(digest))
+            removed += 1
+    return deleted, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SNKRDUNK page snapshot archive and offline replay')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rep = sub.add_parser('replay', help='Re-run extraction over archived pages (JSON lines on stdout)')
+    rep.add_argument('kind', choices=KINDS)
+    rep.add_argument('--since', default='', help="Captured at or after ('YYYY-MM-DD[ HH:MM:SS]', UTC)")
+    rep.add_argument('--until', default='', help='Captured before')
+    rep.add_argument('--latest', action='store_true',
+                     help='Only the newest snapshot per card (listing) / pokemon (search)')
+    rep.add_argument('--cards', help='search: cards to match (CSV/JSONL, see snkrdunk_batch)')
+    rep.add_argument('--workers', type=int, default=None, help='Processes (default: CPU count)')
+    rep.add_argument('--save', action='store_true',
+                     help='listing: save prices/history to snkrdunk.db as of the capture time')
+
+    sub.add_parser('stats', help='Snapshot counts and sizes by kind')
+    prune = sub.add_parser('purge', help='Delete old snapshots and unreferenced pages')
+    prune.add_argument('--days', type=float, default=90)
+
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        print(json.dumps(get_storage().snapshot_stats()))
+    elif args.command == 'purge':
+        deleted, removed = purge(args.days)
+        print(f"🧹 스냅샷 {deleted}건 삭제 (본문 파일 {removed}개)")
+    elif args.command == 'replay':
+        if args.save and args.kind != 'listing':
+            parser.error('--save only applies to listing replay')
+        cards = None
+        if args.cards:
+            from snkrdunk_batch import read_cards
+            with open(args.cards, 'r', encoding='utf-8') as f:
+                cards = read_cards(f)
+
+        count = errors = 0
+        pending = []
+        for item in replay(args.kind, args.since, args.until, args.latest, cards, args.workers):
+            count += 1
+            errors += 'error' in item
+            sys.stdout.write(json.dumps(item, ensure_ascii=False) + '\n')
+            row = _save_row(item) if args.save else None
+            if row:
+                pending.append(row)
+                if len(pending) >= SAVE_BATCH_SIZE:
+                    get_storage().save_prices(pending)
+                    pending = []
+        if pending:
+            get_storage().save_prices(pending)
+        print(f"✅ {count}건 재추출 (오류 {errors})", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+SNKRDUNK 대기(wait) 레이어
+=====================================
+고정 time.sleep 대신 DOM 상태가 준비되는 즉시 다음 단계로 진행.
+
+  - wait_for_ready_state : document.readyState 확인
+  - wait_for_dom_quiet   : MutationObserver로 일정 시간 DOM 변경이 없을 때까지
+  - wait_for_stable_count: 셀렉터 매칭 개수가 일정 시간 변하지 않을 때까지
+  - scroll_until_stable  : lazy-load 페이지를 스크롤하며 개수가 안정될 때까지
+  - wait_for_url_change  : 클릭 후 페이지 이동 완료까지
+
+모든 함수는 STEP_TIMEOUTS의 단계별 상한을 넘기지 않음 (상한 도달 시 그냥 진행).
+폴링은 페이지 안(execute_async_script)에서 돌기 때문에 WebDriver 왕복은 호출당 1회.
+"""
+
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+# 단계별 최대 대기 시간(초). 조건이 먼저 만족되면 그 즉시 종료.
+STEP_TIMEOUTS = {
+    'search':         10.0,   # 검색 결과 첫 렌더링
+    'search_scroll':   6.0,   # 검색 결과 lazy-load 스크롤
+    'detail':          8.0,   # 카드 상세 페이지 See More 링크
+    'navigate':        8.0,   # See More 클릭 후 이동
+    'listing_scroll':  8.0,   # 리스팅 페이지 lazy-load 스크롤
+}
+
+# DOM이 '조용하다'고 판단하는 기준(ms)
+QUIET_MS = 400
+
+# WebDriver 기본 스크립트 타임아웃(초). 대기 스크립트는 자체 상한으로 먼저 끝나므로 이 값이면 충분.
+DEFAULT_SCRIPT_TIMEOUT = 30.0
+
+
+def _timeout(step: str, timeout: float | None) -> float:
+    return timeout if timeout is not None else STEP_TIMEOUTS[step]
+
+
+def _ensure_script_timeout(driver, seconds: float):
+    """
+    스크립트 타임아웃은 드라이버당 필요할 때만 설정 (마지막 값을 드라이버에 기억).
+    WebDriver 기본값보다 낮추지 않으므로 풀에서 같은 드라이버를 쓰는 다른 코드에 영향 없음.
+    """
+    if getattr(driver, '_snkrdunk_script_timeout', 0) >= seconds:
+        return
+    seconds = max(seconds, DEFAULT_SCRIPT_TIMEOUT)
+    driver.set_script_timeout(seconds)
+    driver._snkrdunk_script_timeout = seconds
+
+
+def _run_async(driver, script: str, timeout: float, *args):
+    """execute_async_script를 상한 시간 + 여유분으로 실행. 실패 시 None."""
+    _ensure_script_timeout(driver, timeout + 2)
+    try:
+        return driver.execute_async_script(script, *args)
+    except (TimeoutException, WebDriverException):
+        return None
+
+
+_JS_READY_STATE = """
+const [timeoutMs, done] = [arguments[0], arguments[arguments.length - 1]];
+const start = Date.now();
+(function tick() {
+    if (document.readyState === 'complete') return done(true);
+    if (Date.now() - start >= timeoutMs) return done(false);
+    setTimeout(tick, 50);
+})();
+"""
+
+_JS_DOM_QUIET = """
+const [quietMs, timeoutMs, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+let quietTimer = null;
+let finished = false;
+const finish = (quiet) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done(quiet);
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+quietTimer = setTimeout(() => finish(true), quietMs);
+const hardTimer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+_JS_STABLE_COUNT = """
+const [sel, quietMs, timeoutMs, minCount, done] =
+    [arguments[0], arguments[1], arguments[2], arguments[3], arguments[arguments.length - 1]];
+const start = Date.now();
+let last = -1, since = start;
+(function tick() {
+    const n = document.querySelectorAll(sel).length;
+    const now = Date.now();
+    if (n !== last) { last = n; since = now; }
+    if (n >= minCount && now - since >= quietMs) return done({count: n, stable: true});
+    if (now - start >= timeoutMs) return done({count: n, stable: false});
+    setTimeout(tick, 50);
+})();
+"""
+
+_JS_SCROLL_UNTIL_STABLE = """
+const [sel, stepPx, quietMs, timeoutMs, maxScrolls, done] =
+    [arguments[0], arguments[1], arguments[2], arguments[3], arguments[4], arguments[arguments.length - 1]];
+const start = Date.now();
+let scrolls = 0, last = -1, since = start;
+const finish = (stable, n) => { window.scrollTo(0, 0); done({count: n, scrolls: scrolls, stable: stable}); };
+(function tick() {
+    const n = document.querySelectorAll(sel).length;
+    const now = Date.now();
+    if (n !== last) { last = n; since = now; }
+    const root = document.scrollingElement || document.documentElement;
+    const atBottom = window.innerHeight + window.scrollY >= root.scrollHeight - 2;
+    if ((atBottom || scrolls >= maxScrolls) && now - since >= quietMs) return finish(true, n);
+    if (now - start >= timeoutMs) return finish(false, n);
+    // 새 항목이 잠시 멈췄을 때만 다음 구간으로 스크롤
+    if (!atBottom && scrolls < maxScrolls && now - since >= Math.min(quietMs, 150)) {
+        window.scrollBy(0, stepPx);
+        scrolls += 1;
+    }
+    setTimeout(tick, 50);
+})();
+"""
+
+
+def wait_for_ready_state(driver, step: str = 'navigate', timeout: float | None = None) -> bool:
+    timeout = _timeout(step, timeout)
+    return bool(_run_async(driver, _JS_READY_STATE, timeout, int(timeout * 1000)))
+
+
+def wait_for_dom_quiet(driver,
+                       step: str = 'navigate',
+                       quiet_ms: int = QUIET_MS,
+                       timeout: float | None = None) -> bool:
+    """quiet_ms 동안 DOM 변경이 없으면 True, 상한 도달 시 False"""
+    timeout = _timeout(step, timeout)
+    return bool(_run_async(driver, _JS_DOM_QUIET, timeout, quiet_ms, int(timeout * 1000)))
+
+
+def wait_for_stable_count(driver,
+                          css_selector: str,
+                          step: str,
+                          quiet_ms: int = QUIET_MS,
+                          min_count: int = 1,
+                          timeout: float | None = None) -> int:
+    """셀렉터 매칭 개수가 quiet_ms 동안 변하지 않을 때까지 대기. 최종 개수 반환."""
+    timeout = _timeout(step, timeout)
+    result = _run_async(driver, _JS_STABLE_COUNT, timeout,
+                        css_selector, quiet_ms, int(timeout * 1000), min_count)
+    return (result or {}).get('count', 0)
+
+
+def scroll_until_stable(driver,
+                        css_selector: str,
+                        step: str,
+                        step_px: int = 800,
+                        max_scrolls: int = 20,
+                        quiet_ms: int = QUIET_MS,
+                        timeout: float | None = None) -> dict:
+    """
+    페이지를 step_px씩 스크롤하며 lazy-load 항목을 불러옴.
+    맨 아래(또는 max_scrolls)에 도달하고 개수가 quiet_ms 동안 안정되면 종료 후 맨 위로 복귀.
+    반환: {'count', 'scrolls', 'stable'}
+    """
+    timeout = _timeout(step, timeout)
+    result = _run_async(driver, _JS_SCROLL_UNTIL_STABLE, timeout,
+                        css_selector, step_px, quiet_ms, int(timeout * 1000), max_scrolls)
+    return result or {'count': 0, 'scrolls': 0, 'stable': False}
+
+
+def wait_for_url_change(driver,
+                        old_url: str,
+                        step: str = 'navigate',
+                        timeout: float | None = None) -> bool:
+    """현재 URL이 old_url에서 바뀔 때까지 대기"""
+    deadline = time.monotonic() + _timeout(step, timeout)
+    while time.monotonic() < deadline:
+        try:
+            if driver.current_url != old_url:
+                return True
+        except WebDriverException:
+            pass
+        time.sleep(0.1)
+    return False
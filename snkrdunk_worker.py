@@ -0,0 +1,228 @@
+"""
+SNKRDUNK 상주 워커 프로세스
+=====================================
+요청마다 python 프로세스를 띄우는 대신, 한 번 띄워두고 JSON-lines로 요청을 처리.
+import, SQLite 커넥션, Chrome 드라이버 풀이 프로세스 수명 동안 유지됨.
+
+프로토콜 (한 줄 = 하나의 JSON):
+  요청: {"id": 1, "op": "search", "name": "Gengar", "set": "Fossil", "number": "94", "grade": "PSA 9"}
+  응답: {"id": 1, "result": {...lookup_price 결과...}}
+        {"id": 1, "error": "..."}          (요청 자체가 잘못된 경우)
+
+  op 종류:
+    search : 가격 조회 (lookup_price, "grade" 생략 시 PSA 10)
+    metrics: Prometheus 텍스트 {"text"} (+ "traces": N 이면 최근 트레이스 N건)
+    history: 일별 가격 이력 {"op": "history", "name", "set", "number", "days": 90, "grade"}
+    ping   : 생존 확인 → {"pong": true}
+    stats  : 드라이버 풀 상태 + 진행 중인 스크래핑 키 (+ 스케줄러 상태, 작업 큐 status별 수)
+
+실행:
+  python snkrdunk_worker.py                      # stdin/stdout
+  python snkrdunk_worker.py --socket /tmp/snkrdunk.sock
+  python snkrdunk_worker.py --scheduler          # 인기 카드 백그라운드 갱신 포함
+  python snkrdunk_worker.py --prewarm            # 기동 시 드라이버 풀을 미리 채움
+
+stdout은 프로토콜 전용이므로 스크래퍼의 print 출력은 모두 stderr로 보냄.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from snkrdunk_driver_pool import DriverPool
+from query_snkrdunk_db import USE_JOB_QUEUE, BackgroundRefresher, enqueue_refresh, lookup_price
+import snkrdunk_metrics as metrics
+from snkrdunk_db import PSA10_GRADE, get_storage, grade_label
+from snkrdunk_singleflight import get_single_flight
+
+
+DEFAULT_CONCURRENCY = int(os.environ.get('SNKRDUNK_WORKER_CONCURRENCY', '8'))
+
+
+class Worker:
+    """요청 하나를 처리하고 결과 dict를 돌려주는 핸들러 (전송 방식과 무관)"""
+
+    def __init__(self, pool: DriverPool, concurrency: int, scheduler=None):
+        self.pool = pool
+        # 인기 카드 선제 갱신 (--scheduler)
+        self.scheduler = scheduler
+        # stale 캐시 응답 후 백그라운드 갱신 (같은 카드 중복 갱신 방지)
+        # SNKRDUNK_JOB_QUEUE=1이면 스크래핑은 snkrdunk_jobs fleet이 맡고 여기서는 큐에 넣기만 함
+        self.refresher = BackgroundRefresher(pool=pool)
+        self.refresh = enqueue_refresh if USE_JOB_QUEUE else self.refresher
+        self.executor = ThreadPoolExecutor(max_workers=concurrency,
+                                           thread_name_prefix='snkrdunk')
+
+    def handle(self, request: dict) -> dict:
+        req_id = request.get('id')
+        op = request.get('op', 'search')
+
+        if op == 'ping':
+            return {'id': req_id, 'result': {'pong': True, 'pid': os.getpid()}}
+
+        if op == 'stats':
+            stats = {**self.pool.stats(), 'inflight_scrapes': get_single_flight().inflight()}
+            if self.scheduler is not None:
+                stats['scheduler'] = self.scheduler.stats()
+            if USE_JOB_QUEUE:
+                stats['jobs'] = get_storage().job_stats()
+            return {'id': req_id, 'result': stats}
+
+        if op == 'metrics':
+            return {'id': req_id, 'result': {
+                'text': metrics.render(),
+                'traces': metrics.recent_traces(int(request.get('traces') or 0)) if request.get('traces') else [],
+            }}
+
+        if op == 'history':
+            name = (request.get('name') or '').strip()
+            if not name:
+                return {'id': req_id, 'error': 'No keyword provided'}
+            history = get_storage().price_history(name,
+                                                  request.get('set') or '',
+                                                  request.get('number') or '',
+                                                  grade=grade_label(request.get('grade')) or PSA10_GRADE,
+                                                  days=int(request.get('days') or 90))
+            return {'id': req_id, 'result': {'success': True, 'history': history}}
+
+        if op == 'search':
+            name = (request.get('name') or '').strip()
+            if not name:
+                return {'id': req_id, 'error': 'No keyword provided'}
+            result = lookup_price(name,
+                                  request.get('set') or '',
+                                  request.get('number') or '',
+                                  pool=self.pool,
+                                  quiet=False,
+                                  refresher=self.refresh,
+                                  grade=request.get('grade') or PSA10_GRADE)
+            return {'id': req_id, 'result': result}
+
+        return {'id': req_id, 'error': f'Unknown op: {op}'}
+
+    def submit(self, line: str, reply):
+        """한 줄을 파싱해 스레드 풀에서 처리하고 reply(dict)로 응답"""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            reply({'id': None, 'error': f'Invalid JSON: {e}'})
+            return
+
+        def run():
+            try:
+                response = self.handle(request)
+            except Exception as e:
+                response = {'id': request.get('id'), 'error': str(e)}
+            reply(response)
+
+        self.executor.submit(run)
+
+    def close(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        self.executor.shutdown(wait=True)
+        self.refresher.close()
+        self.pool.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# 전송 방식: stdin/stdout
+# ──────────────────────────────────────────────────────────────
+
+def serve_stdio(worker: Worker):
+    out = sys.stdout
+    # 스크래퍼 print가 프로토콜 스트림을 오염시키지 않도록 stderr로 우회
+    sys.stdout = sys.stderr
+    write_lock = threading.Lock()
+
+    def reply(response: dict):
+        data = json.dumps(response, ensure_ascii=False)
+        with write_lock:
+            out.write(data + '\n')
+            out.flush()
+
+    reply({'id': None, 'event': 'ready', 'pid': os.getpid()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if line:
+            worker.submit(line, reply)
+
+
+# ──────────────────────────────────────────────────────────────
+# 전송 방식: Unix 소켓
+# ──────────────────────────────────────────────────────────────
+
+def serve_socket(worker: Worker, path: str):
+    sys.stdout = sys.stderr
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            write_lock = threading.Lock()
+
+            def reply(response: dict):
+                data = (json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8')
+                with write_lock:
+                    try:
+                        self.wfile.write(data)
+                        self.wfile.flush()
+                    except OSError:
+                        pass
+
+            for raw in self.rfile:
+                line = raw.decode('utf-8').strip()
+                if line:
+                    worker.submit(line, reply)
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        print(f"🔌 SNKRDUNK worker listening on {path}")
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SNKRDUNK long-running scraper worker')
+    parser.add_argument('--socket', help='Unix socket path (default: stdin/stdout)')
+    parser.add_argument('--pool-size', type=int, default=None, help='Chrome drivers to keep warm')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Requests handled in parallel')
+    parser.add_argument('--prewarm', action='store_true',
+                        default=os.environ.get('SNKRDUNK_POOL_PREWARM', '0') not in ('', '0'),
+                        help='Start the pool\'s browsers at boot instead of on the first request')
+    parser.add_argument('--scheduler', action='store_true',
+                        help='Refresh popular cards in the background (shares the driver pool)')
+    args = parser.parse_args()
+
+    pool = DriverPool(size=args.pool_size)
+    if args.prewarm:
+        # ready 이벤트는 바로 보내고 예열은 백그라운드로 (요청은 준비된 드라이버를 기다림)
+        threading.Thread(target=pool.prewarm, name='snkrdunk-prewarm', daemon=True).start()
+    scheduler = None
+    if args.scheduler:
+        from snkrdunk_scheduler import RefreshScheduler
+        scheduler = RefreshScheduler(pool=pool).start()
+
+    worker = Worker(pool, args.concurrency, scheduler=scheduler)
+    try:
+        if args.socket:
+            serve_socket(worker, args.socket)
+        else:
+            serve_stdio(worker)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.close()
+
+
+if __name__ == '__main__':
+    main()
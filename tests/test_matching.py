@@ -0,0 +1,151 @@
+"""_score_candidate / _match_candidates: 세트 토큰, 카드 번호, 후보 가림(shadowing)"""
+
+import pytest
+
+from snkrdunk_psa10_scraper import _match_candidates, _score_candidate
+
+
+def alt(text, href):
+    return {'text': text, 'href': href, 'source': 'alt'}
+
+
+def name(text, href):
+    return {'text': text, 'href': href, 'source': 'name'}
+
+
+# ── _score_candidate ──
+
+def test_score_requires_pokemon_name():
+    assert _score_candidate('Pikachu 058/102 Base Set', 'alt', 'gengar', 'gengar',
+                            {'fossil'}, '94') is None
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Gengar-Holo 094/062 Fossil', (6, True, True, True)),
+    ('Gengar 094/062 Fossil', (5, True, True, False)),
+    ('Gengar Fossil', (3, True, False, False)),
+    ('Gengar 094/062', (2, False, True, False)),
+    ('Gengar', (0, False, False, False)),
+])
+def test_score_weights(text, expected):
+    assert _score_candidate(text, 'alt', 'gengar-holo', 'gengar', {'fossil'}, '94') == expected
+
+
+def test_score_set_tokens_any_token_matches():
+    tokens = {'climax', 's8b', 'vmax'}
+    assert _score_candidate('Charizard V [S8b 001/184]', 'alt', 'charizard v', 'charizard',
+                            tokens, '')[1] is True
+    assert _score_candidate('Charizard V [S12a 001/172]', 'alt', 'charizard v', 'charizard',
+                            tokens, '')[1] is False
+
+
+def test_score_no_set_tokens_never_has_set():
+    assert _score_candidate('Gengar Fossil', 'alt', 'gengar', 'gengar', frozenset(), '')[1] is False
+
+
+@pytest.mark.parametrize('text, num, has_number', [
+    ('Gengar 094/062', '94', True),      # 0 채움 번호
+    ('Gengar 94/62', '94', True),
+    ('Gengar 020/189', '20', True),
+    ('Gengar 031/062', '94', False),
+    ('Gengar #94', '94', True),          # XX/YY 형식이 아니면 직접 매칭
+])
+def test_score_alt_number(text, num, has_number):
+    assert _score_candidate(text, 'alt', 'gengar', 'gengar', set(), num)[2] is has_number
+
+
+def test_score_name_source_number_is_substring_only():
+    assert _score_candidate('Gengar 094/062', 'name', 'gengar', 'gengar', set(), '94')[2] is True
+    assert _score_candidate('Gengar 031/062', 'name', 'gengar', 'gengar', set(), '94')[2] is False
+
+
+# ── _match_candidates ──
+
+def test_match_prefers_set_over_number_and_name():
+    candidates = [
+        alt('Gengar-Holo 094/102', '/en/trading-cards/1'),       # 번호 + 카드명 = 3
+        alt('Gengar Fossil', '/en/trading-cards/2'),             # 세트 = 3 (동점 → 먼저 온 쪽)
+        alt('Gengar Fossil 094/062', '/en/trading-cards/3'),     # 세트 + 번호 = 5
+    ]
+    best = _match_candidates(candidates, 'GENGAR-HOLO', 'Pokemon Japanese Fossil', '94', 'Gengar')
+    assert best['href'].endswith('/en/trading-cards/3')
+    assert (best['score'], best['has_set'], best['has_number']) == (5, True, True)
+
+
+def test_match_number_breaks_tie_between_same_set():
+    candidates = [
+        alt('Pikachu Base Set 060/102', '/en/trading-cards/60'),
+        alt('Pikachu Base Set 058/102', '/en/trading-cards/58'),
+    ]
+    best = _match_candidates(candidates, 'Pikachu', 'Pokemon Base Set', '58', 'Pikachu')
+    assert best['href'].endswith('/en/trading-cards/58')
+
+
+def test_match_equal_scores_keep_first_candidate():
+    candidates = [
+        alt('Gengar Fossil 094/062', '/en/trading-cards/first'),
+        alt('Gengar Fossil 094/062', '/en/trading-cards/second'),
+    ]
+    best = _match_candidates(candidates, 'GENGAR-HOLO', 'Pokemon Japanese Fossil', '94', 'Gengar')
+    assert best['href'].endswith('/first')
+
+
+def test_match_alt_shadows_name_candidates():
+    # alt 단계에서 점수 > 0인 후보가 있으면 더 높은 점수의 상품명 후보는 보지 않음
+    candidates = [
+        name('Gengar Fossil 094/062', '/en/trading-cards/name'),
+        alt('Gengar 094/062', '/en/trading-cards/alt'),
+    ]
+    best = _match_candidates(candidates, 'GENGAR-HOLO', 'Pokemon Japanese Fossil', '94', 'Gengar')
+    assert best['source'] == 'alt'
+    assert best['href'].endswith('/alt')
+
+
+def test_match_alt_without_href_falls_back_to_name():
+    candidates = [
+        alt('Gengar Fossil 094/062', None),
+        name('Gengar Fossil', '/en/trading-cards/name'),
+    ]
+    best = _match_candidates(candidates, 'GENGAR-HOLO', 'Pokemon Japanese Fossil', '94', 'Gengar')
+    assert best['source'] == 'name'
+    assert best['href'].endswith('/en/trading-cards/name')
+
+
+def test_match_zero_score_alt_does_not_shadow_name():
+    candidates = [
+        alt('Gengar', '/en/trading-cards/alt'),
+        name('Gengar 94', '/en/trading-cards/name'),
+    ]
+    best = _match_candidates(candidates, 'GENGAR-HOLO', 'Pokemon Japanese Fossil', '94', 'Gengar')
+    assert best['href'].endswith('/en/trading-cards/name')
+
+
+def test_match_name_stage_takes_first_positive_not_best():
+    candidates = [
+        name('Gengar 094', '/en/trading-cards/first'),
+        name('Gengar Fossil 094', '/en/trading-cards/better'),
+    ]
+    best = _match_candidates(candidates, 'GENGAR-HOLO', 'Pokemon Japanese Fossil', '94', 'Gengar')
+    assert best['href'].endswith('/first')
+
+
+def test_match_other_pokemon_never_matches():
+    candidates = [
+        alt('Haunter Fossil 094/062', '/en/trading-cards/1'),
+        name('Gastly Fossil 094/062', '/en/trading-cards/2'),
+    ]
+    assert _match_candidates(candidates, 'GENGAR-HOLO', 'Pokemon Japanese Fossil', '94',
+                             'Gengar') is None
+
+
+def test_match_empty_and_textless_candidates():
+    assert _match_candidates([], 'Pikachu', 'Pokemon Base Set', '58', 'Pikachu') is None
+    assert _match_candidates([alt('', '/en/trading-cards/1'), name(None, '/en/trading-cards/2')],
+                             'Pikachu', 'Pokemon Base Set', '58', 'Pikachu') is None
+
+
+def test_match_returns_absolute_url():
+    best = _match_candidates([alt('Pikachu Base Set 058/102', '/en/trading-cards/58')],
+                             'Pikachu', 'Pokemon Base Set', '58', 'Pikachu')
+    assert best['href'].startswith('http')
+    assert best['href'].endswith('/en/trading-cards/58')